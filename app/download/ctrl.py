@@ -24,7 +24,7 @@ from tkinter import END, filedialog
 from eco import eco_puds
 from eco import eco_pccp
 from eco.pcandrive import pcanbasic
-from srecord import Srecord
+from srecord import load_srecord, srecord_cache
 
 from .model import DownloadModel
 from .view import DownloadView
@@ -159,6 +159,7 @@ class DownloadCtrl(object):
                 conf.set(protocol, 'uds_opened_seed2key_filepath', '')
                 conf.set(protocol, 'uds_is_show_map_detail', 'False')
                 conf.set(protocol, 'uds_is_show_msg_detail', 'False')
+                conf.set(protocol, 'uds_is_delta_download', 'False')
                 # ccp
                 protocol = 'ccp'
                 conf.add_section(protocol)
@@ -172,8 +173,21 @@ class DownloadCtrl(object):
                 conf.set(protocol, 'ccp_is_show_msg_detail', 'False')
                 conf.set(protocol, 'ccp_is_intel_format', 'True')
                 conf.set(protocol, 'ccp_response_timeout_ms', '10000')
+                conf.set(protocol, 'ccp_is_delta_download', 'False')
+                # 缓存
+                conf.add_section('cache')
+                conf.set('cache', 'srecord_cache_dir', 'srecord_cache')
                 with open(self.__cfg_download_path, 'w', encoding='utf-8') as f:
                     conf.write(f)
+            else:
+                # 补充已有配置文件中缺少的缓存配置
+                conf = configparser.ConfigParser()
+                conf.read(self.__cfg_download_path, encoding='utf-8')
+                if not conf.has_section('cache'):
+                    conf.add_section('cache')
+                    conf.set('cache', 'srecord_cache_dir', 'srecord_cache')
+                    with open(self.__cfg_download_path, 'w', encoding='utf-8') as f:
+                        conf.write(f)
         except Exception as e:
             self.text_log(f'发生异常 {e}', 'error')
             self.text_log(f"{traceback.format_exc()}", 'error')
@@ -205,6 +219,8 @@ class DownloadCtrl(object):
                     for option in conf.options(section):
                         if hasattr(self.model, option):
                             setattr(self.model, option, conf.get(section, option))
+                # 程序文件解析结果的磁盘缓存目录，为空时不使用磁盘缓存
+                srecord_cache.sidecar_dir = self.model.srecord_cache_dir.strip() or None
             else:
                 msg = f'当前协议为{protocol}，必须为{self.model.PROTOCAOL}'
                 raise ValueError(msg)
@@ -324,7 +340,7 @@ class DownloadCtrl(object):
                              dir=os.path.dirname(self.model.opened_pgm_filepath))
             # 打开程序文件
             if self.model.opened_pgm_filepath:
-                obj_srecord = Srecord(self.model.opened_pgm_filepath)
+                obj_srecord = load_srecord(self.model.opened_pgm_filepath)
                 # 获取程序信息
                 msg_pgm = (f"程序信息 -> {obj_srecord.describe_info}"
                            f"\n\t文件路径 -> {self.model.opened_pgm_filepath}")
@@ -360,6 +376,7 @@ class DownloadCtrl(object):
             if self.model.opened_pgm_filepath:
                 if self.model.mode_protocol == self.model.PROTOCAOL[0]:
                     # uds
+                    is_delta = conf.getboolean('uds', 'uds_is_delta_download', fallback=False)
                     obj_download = eco_puds.DownloadThread(request_can_id=self.model.uds_request_id,
                                                            response_can_id=self.model.uds_response_id,
                                                            function_can_id=self.model.uds_function_id,
@@ -367,13 +384,15 @@ class DownloadCtrl(object):
                                                            device_baudrate=self.model.uds_baudrate,
                                                            download_filepath=self.model.opened_pgm_filepath,
                                                            seed2key_filepath=self.model.uds_opened_seed2key_filepath,
-                                                           obj_srecord=Srecord(
-                                                               self.model.opened_pgm_filepath)
+                                                           obj_srecord=load_srecord(
+                                                               self.model.opened_pgm_filepath),
+                                                           is_delta=is_delta
                                                            )
                 else:
                     # ccp
                     is_intel_format = conf.getboolean('ccp', 'ccp_is_intel_format')
                     timeout = conf.getint('ccp', 'ccp_response_timeout_ms')
+                    is_delta = conf.getboolean('ccp', 'ccp_is_delta_download', fallback=False)
                     obj_download = eco_pccp.DownloadThread(request_can_id=self.model.ccp_request_id,
                                                            response_can_id=self.model.ccp_response_id,
                                                            ecu_addr=self.model.ccp_ecu_addr,
@@ -383,8 +402,9 @@ class DownloadCtrl(object):
                                                            device_baudrate=self.model.ccp_baudrate,
                                                            download_filepath=self.model.opened_pgm_filepath,
                                                            seed2key_filepath=self.model.ccp_opened_seed2key_filepath,
-                                                           obj_srecord=Srecord(
-                                                               self.model.opened_pgm_filepath)
+                                                           obj_srecord=load_srecord(
+                                                               self.model.opened_pgm_filepath),
+                                                           is_delta=is_delta
                                                            )
                 obj_download.name = 'task_download'
                 obj_download.start()
@@ -59,6 +59,9 @@ class DownloadModel(object):
         self.opened_pgm_filepath = ''
         self.opened_seed2key_filepath = ''
 
+        # 程序文件解析结果的磁盘缓存(旁路文件)目录，为空时不使用磁盘缓存
+        self.srecord_cache_dir = 'srecord_cache'
+
     # mode
     @property
     def mode_protocol(self) -> str:
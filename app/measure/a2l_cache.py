@@ -0,0 +1,451 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Author  : ZYD
+# @Time    : 2026/10/16 下午5:10
+# @version : V1.0.0
+# @function: A2L工程缓存，
+#   将xba2l解析并提炼后的工程数据(测量、标定对象及其名称索引、转换方法、内存段等)以pickle保存到缓存目录，
+#   缓存文件以A2L文件内容的SHA-256命名，再次打开同一A2L文件时直接加载，跳过解析；
+#   缓存文件分为两部分：打开时即需要的数据，以及仅在标定时使用的数据(标定对象、内存布局、轴点)，后者在首次访问时加载；
+#   数组类型的测量对象只保存一份，各元素'名称_BLK(索引)'在访问时由基地址及数据类型大小计算得到
+
+
+##############################
+# Module imports
+##############################
+from collections.abc import Iterator, Mapping
+import copy  # 拷贝可变类型
+import hashlib
+import os
+import pickle
+import struct
+from typing import Any, Callable
+
+from xba2l.a2l_base import Options as OptionsParseA2l  # 解析a2l文件
+from xba2l.a2l_lib import Measurement, Characteristic, MemorySegment, CompuMethod, CompuVtab, RecordLayout, AxisPts
+from xba2l.a2l_util import parse_a2l  # 解析a2l文件
+
+from .model import ASAP2EnumDataType
+
+
+##############################
+# Constant definitions
+##############################
+A2L_CACHE_VERSION = 2  # 缓存格式版本，提炼的内容变化时须递增
+A2L_CACHE_SUFFIX = '.a2lc'  # 缓存文件后缀
+A2L_CACHE_MAX_FILES = 8  # 缓存目录中保留的缓存文件数上限，超出时删除最久未使用的文件
+_HEADER_SIZE = struct.Struct('<Q')  # 缓存文件开头记录第一部分长度的字段
+ARRAY_ELEMENT_SUFFIX = '_BLK('  # 数组元素名称的后缀，'名称_BLK(索引)'
+
+# 第二部分(仅在标定时使用)包含的字典
+LAZY_SECTION_KEYS = ('calibration_dict', 'record_layout_dict', 'axis_pts_dict')
+
+
+##############################
+# Type definitions
+##############################
+
+class _LazySection(object):
+    """
+    缓存文件的第二部分，首次访问时从缓存文件加载；缓存文件不可读时由重新解析a2l文件得到
+
+    :param cache_path: 缓存文件路径
+    :type cache_path: str
+    :param offset: 第二部分在缓存文件中的偏移
+    :type offset: int
+    :param fallback: 缓存文件不可读时获取第二部分的函数
+    :type fallback: Callable[[], dict[str, dict]]
+    """
+
+    def __init__(self, cache_path: str, offset: int, fallback: Callable[[], dict[str, dict]]) -> None:
+        """
+        构造函数
+        """
+        self.__cache_path = cache_path
+        self.__offset = offset
+        self.__fallback = fallback
+        self.__data: dict[str, dict] | None = None
+
+    def get(self, key: str) -> dict:
+        """
+        获取第二部分中的字典
+
+        :param key: 字典名称，LAZY_SECTION_KEYS之一
+        :type key: str
+        :return: 字典
+        :rtype: dict
+        """
+        if self.__data is None:
+            try:
+                with open(self.__cache_path, 'rb') as f:
+                    f.seek(self.__offset)
+                    self.__data = pickle.load(f)
+            except Exception:
+                self.__data = self.__fallback()
+        return self.__data[key]
+
+
+class LazyDict(Mapping):
+    """
+    延迟加载的只读字典，键在构造时已知，遍历、求长度及判断键是否存在均不触发加载，取值时加载整个第二部分
+
+    :param section: 缓存文件的第二部分
+    :type section: _LazySection
+    :param key: 字典名称
+    :type key: str
+    :param names: 字典的键，按原字典顺序
+    :type names: list[str]
+    """
+
+    def __init__(self, section: _LazySection, key: str, names: list[str]) -> None:
+        """
+        构造函数
+        """
+        self.__section = section
+        self.__key = key
+        self.__names = names
+        self.__name_set = frozenset(names)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.__section.get(self.__key)[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.__name_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__names)
+
+    def __len__(self) -> int:
+        return len(self.__names)
+
+
+class A2lMeasurementDict(Mapping):
+    """
+    测量对象的只读字典，数组类型的测量对象只保存一份，按'名称_BLK(索引)'提供各元素；
+    元素对象在取值时由数组对象浅拷贝得到，地址为基地址 + 索引 * 数据类型大小，
+    因此内存占用及构造耗时只与声明的测量对象个数有关，与数组元素个数无关
+
+    :param measurements: 测量对象，按名称顺序
+    :type measurements: list[Measurement]
+    """
+
+    def __init__(self, measurements: list[Measurement]) -> None:
+        """
+        构造函数
+        """
+        self.__items: dict[str, Measurement] = {}  # 值类型的测量对象，{名称: 测量对象}
+        self.__arrays: dict[str, Measurement] = {}  # 数组类型的测量对象，{名称: 测量对象}
+        self.__order: list[Measurement] = []  # 所有测量对象，按名称顺序
+        self.__length = 0  # 展开数组后的数据项个数
+        for item in measurements:
+            if item.array_size and item.array_size > 1:
+                self.__arrays[item.name] = item
+                self.__length += item.array_size
+            else:
+                self.__items[item.name] = item
+                self.__length += 1
+            self.__order.append(item)
+
+    def __getitem__(self, name: str) -> Measurement:
+        item = self.__items.get(name)
+        if item is not None:
+            return item
+        base_name, idx = self.__split(name)
+        if base_name is None:
+            raise KeyError(name)
+        return self.__get_element(self.__arrays[base_name], idx)
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        return name in self.__items or self.__split(name)[0] is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for item in self.__order:
+            if item.array_size and item.array_size > 1:
+                for idx in range(item.array_size):
+                    yield item.name + f"{ARRAY_ELEMENT_SUFFIX}{idx})"
+            else:
+                yield item.name
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def __split(self, name: str) -> tuple[str | None, int]:
+        """
+        将数组元素名称拆分为数组名称及索引
+
+        :param name: 数组元素名称，'名称_BLK(索引)'
+        :type name: str
+        :return: (数组名称, 索引)，不是有效的数组元素名称时数组名称为None
+        :rtype: tuple[str | None, int]
+        """
+        pos = name.rfind(ARRAY_ELEMENT_SUFFIX)
+        if pos < 0 or not name.endswith(')'):
+            return None, 0
+        base_name = name[:pos]
+        index_text = name[pos + len(ARRAY_ELEMENT_SUFFIX):-1]
+        item = self.__arrays.get(base_name)
+        if item is None or not index_text.isdigit():
+            return None, 0
+        idx = int(index_text)
+        if idx >= item.array_size or str(idx) != index_text:
+            return None, 0
+        return base_name, idx
+
+    @staticmethod
+    def __get_element(item: Measurement, idx: int) -> Measurement:
+        """
+        由数组类型的测量对象得到其元素
+
+        :param item: 数组类型的测量对象
+        :type item: Measurement
+        :param idx: 元素索引
+        :type idx: int
+        :return: 元素对应的测量对象，名称为'名称_BLK(索引)'，不是数组
+        :rtype: Measurement
+        """
+        element = copy.copy(item)
+        element.name = item.name + f"{ARRAY_ELEMENT_SUFFIX}{idx})"
+        element.array_size = None
+        element.ecu_address = item.ecu_address + idx * ASAP2EnumDataType.get_size(item.data_type)
+        return element
+
+
+class A2lProject(object):
+    """
+    a2l文件提炼后的工程数据
+
+    :param project_name: 项目名称
+    :type project_name: str
+    :param version: a2l版本，例如：'1.61'
+    :type version: str
+    :param epk: epk
+    :type epk: str
+    :param memory_segments: 内存段，{名称: MemorySegment}
+    :type memory_segments: dict[str, MemorySegment]
+    :param measurement_dict: 测量对象，按名称排序，数组按'名称_BLK(索引)'提供各元素
+    :type measurement_dict: Mapping[str, Measurement]
+    :param conversion_dict: 转换方法
+    :type conversion_dict: dict[str, CompuMethod]
+    :param compu_vtab_dict: 转换表
+    :type compu_vtab_dict: dict[str, CompuVtab]
+    :param calibration_dict: 标定对象，按名称排序
+    :type calibration_dict: Mapping[str, Characteristic]
+    :param record_layout_dict: 标定变量内存布局
+    :type record_layout_dict: Mapping[str, RecordLayout]
+    :param axis_pts_dict: 标定变量的轴类型参考
+    :type axis_pts_dict: Mapping[str, AxisPts]
+    :param module: a2l模块对象，仅在解析a2l文件得到时有效，从缓存加载时为None
+    :type module: Any
+    """
+
+    def __init__(self,
+                 project_name: str,
+                 version: str,
+                 epk: str,
+                 memory_segments: dict[str, MemorySegment],
+                 measurement_dict: Mapping[str, Measurement],
+                 conversion_dict: dict[str, CompuMethod],
+                 compu_vtab_dict: dict[str, CompuVtab],
+                 calibration_dict: Mapping[str, Characteristic],
+                 record_layout_dict: Mapping[str, RecordLayout],
+                 axis_pts_dict: Mapping[str, AxisPts],
+                 module: Any = None) -> None:
+        """
+        构造函数
+        """
+        self.project_name = project_name
+        self.version = version
+        self.epk = epk
+        self.memory_segments = memory_segments
+        self.measurement_dict = measurement_dict
+        self.conversion_dict = conversion_dict
+        self.compu_vtab_dict = compu_vtab_dict
+        self.calibration_dict = calibration_dict
+        self.record_layout_dict = record_layout_dict
+        self.axis_pts_dict = axis_pts_dict
+        self.module = module
+
+    def get_eager_section(self) -> dict[str, Any]:
+        """
+        缓存文件第一部分的内容
+
+        :return: 第一部分，包含第二部分各字典的键
+        :rtype: dict[str, Any]
+        """
+        return {'project_name': self.project_name,
+                'version': self.version,
+                'epk': self.epk,
+                'memory_segments': self.memory_segments,
+                'measurement_dict': self.measurement_dict,
+                'conversion_dict': self.conversion_dict,
+                'compu_vtab_dict': self.compu_vtab_dict,
+                'lazy_names': {key: list(getattr(self, key)) for key in LAZY_SECTION_KEYS}}
+
+    def get_lazy_section(self) -> dict[str, dict]:
+        """
+        缓存文件第二部分的内容
+
+        :return: 第二部分
+        :rtype: dict[str, dict]
+        """
+        return {key: dict(getattr(self, key)) for key in LAZY_SECTION_KEYS}
+
+
+##############################
+# A2L cache API function declarations
+##############################
+
+def parse_a2l_project(a2l_string: bytes) -> A2lProject:
+    """
+    解析a2l文件并提炼工程数据
+
+    :param a2l_string: a2l文件内容
+    :type a2l_string: bytes
+    :return: 工程数据
+    :rtype: A2lProject
+    :raises Exception: 解析a2l文件失败
+    """
+    option = OptionsParseA2l()
+    option.calculate_memory_size = True
+    option.ignore_measurements = False
+    option.read_instance = True
+    err, asap2, module = parse_a2l(a2l_string, encoding='utf-8', options=option)
+    if err:
+        raise err
+
+    # 筛选指定数据项，数组类型在访问时展开为各元素
+    measurements = sorted(filter(lambda item: item.data_type != "FLOAT64_IEEE", module.measurements),
+                          key=lambda item: item.name)
+    measurement_dict = A2lMeasurementDict(measurements)
+
+    return A2lProject(project_name=asap2.project.name,
+                      version=str(asap2.asap2_version.version_no) + '.' + str(asap2.asap2_version.upgrade_no),
+                      epk=module.mod_par.epk,
+                      memory_segments={segment.name: segment for segment in module.mod_par.memory_segments},
+                      measurement_dict=measurement_dict,
+                      conversion_dict=dict(module.compu_method_dict),
+                      compu_vtab_dict=dict(module.compu_vtab_dict),
+                      calibration_dict={item.name: item for item in sorted(module.characteristics,
+                                                                           key=lambda item: item.name)},
+                      record_layout_dict=dict(module.record_layout_dict),
+                      axis_pts_dict=dict(module.axis_pts_dict),
+                      module=module)
+
+
+def get_a2l_cache_path(a2l_string: bytes, cache_dir: str) -> str:
+    """
+    获取a2l文件内容对应的缓存文件路径
+
+    :param a2l_string: a2l文件内容
+    :type a2l_string: bytes
+    :param cache_dir: 缓存目录
+    :type cache_dir: str
+    :return: 缓存文件路径
+    :rtype: str
+    """
+    digest = hashlib.sha256(a2l_string).hexdigest()
+    return os.path.join(cache_dir, f'{digest}{A2L_CACHE_SUFFIX}')
+
+
+def save_a2l_cache(project: A2lProject, cache_path: str) -> None:
+    """
+    保存工程数据到缓存文件，先写入临时文件再替换，并清理多余的缓存文件
+
+    :param project: 工程数据
+    :type project: A2lProject
+    :param cache_path: 缓存文件路径
+    :type cache_path: str
+    """
+    eager = pickle.dumps({'cache_version': A2L_CACHE_VERSION, 'project': project.get_eager_section()},
+                         protocol=pickle.HIGHEST_PROTOCOL)
+    lazy = pickle.dumps(project.get_lazy_section(), protocol=pickle.HIGHEST_PROTOCOL)
+    cache_dir = os.path.dirname(cache_path)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER_SIZE.pack(len(eager)))
+        f.write(eager)
+        f.write(lazy)
+    os.replace(tmp_path, cache_path)
+
+    # 清理最久未使用的缓存文件
+    cache_files = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir or '.')
+                   if name.endswith(A2L_CACHE_SUFFIX)]
+    cache_files.sort(key=os.path.getmtime, reverse=True)
+    for path in cache_files[A2L_CACHE_MAX_FILES:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def load_a2l_cache(cache_path: str, fallback: Callable[[], dict[str, dict]]) -> A2lProject | None:
+    """
+    从缓存文件加载工程数据的第一部分，第二部分在首次访问时加载
+
+    :param cache_path: 缓存文件路径
+    :type cache_path: str
+    :param fallback: 缓存文件的第二部分不可读时获取第二部分的函数
+    :type fallback: Callable[[], dict[str, dict]]
+    :return: 工程数据，缓存文件不存在、不可读或格式版本不一致时返回None
+    :rtype: A2lProject | None
+    """
+    try:
+        with open(cache_path, 'rb') as f:
+            eager_size, = _HEADER_SIZE.unpack(f.read(_HEADER_SIZE.size))
+            header = pickle.loads(f.read(eager_size))
+    except Exception:
+        return None
+    if header.get('cache_version') != A2L_CACHE_VERSION:
+        return None
+    # 更新访问时间，用于清理最久未使用的缓存文件
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass
+
+    eager = header['project']
+    section = _LazySection(cache_path, _HEADER_SIZE.size + eager_size, fallback)
+    lazy_dicts = {key: LazyDict(section, key, names) for key, names in eager['lazy_names'].items()}
+    return A2lProject(project_name=eager['project_name'],
+                      version=eager['version'],
+                      epk=eager['epk'],
+                      memory_segments=eager['memory_segments'],
+                      measurement_dict=eager['measurement_dict'],
+                      conversion_dict=eager['conversion_dict'],
+                      compu_vtab_dict=eager['compu_vtab_dict'],
+                      **lazy_dicts)
+
+
+def load_a2l_project(a2l_filepath: str, cache_dir: str) -> tuple[A2lProject, bool]:
+    """
+    加载a2l文件的工程数据，存在缓存时从缓存加载，否则解析a2l文件并保存缓存
+
+    :param a2l_filepath: a2l文件路径
+    :type a2l_filepath: str
+    :param cache_dir: 缓存目录，为空时不使用缓存
+    :type cache_dir: str
+    :return: (工程数据, 是否从缓存加载)
+    :rtype: tuple[A2lProject, bool]
+    :raises Exception: 解析a2l文件失败
+    """
+    with open(a2l_filepath, 'rb') as f:
+        a2l_string = f.read()
+    if not cache_dir:
+        return parse_a2l_project(a2l_string), False
+
+    cache_path = get_a2l_cache_path(a2l_string, cache_dir)
+    project = load_a2l_cache(cache_path, fallback=lambda: parse_a2l_project(a2l_string).get_lazy_section())
+    if project is not None:
+        return project, True
+
+    project = parse_a2l_project(a2l_string)
+    try:
+        save_a2l_cache(project, cache_path)
+    except Exception:
+        # 无法缓存(例如缓存目录不可写)时仍使用解析结果
+        pass
+    return project, False
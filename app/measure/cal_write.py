@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Author  : ZYD
+# @Time    : 2026/10/16 下午7:15
+# @version : V1.0.0
+# @function: RAM标定数据批量写入，
+#   修改的标定值先加入待写入队列，由线程池中的单个任务统一写入，写入期间新增的修改在下一轮一并写入；
+#   每轮将待写入的数据按地址合并为连续的内存段(地址重叠时后修改的值覆盖先修改的值)，
+#   每段只设置一次MTA0，之后以DNLOAD_6/DNLOAD连续下载，由ECU自动递增MTA0
+
+
+##############################
+# Module imports
+##############################
+from bisect import bisect_right
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+from typing import Callable
+
+
+##############################
+# Cal write API function declarations
+##############################
+
+def merge_cal_writes(writes: list[tuple[int, bytes]]) -> list[tuple[int, bytes]]:
+    """
+    将待写入的数据按地址合并为连续的内存段，地址重叠时列表中靠后的数据覆盖靠前的数据
+
+    :param writes: 待写入的数据，[(地址, 数据), ...]，按修改顺序排列
+    :type writes: list[tuple[int, bytes]]
+    :return: 连续的内存段，[(起始地址, 数据), ...]，按地址递增排列
+    :rtype: list[tuple[int, bytes]]
+    """
+    memory: dict[int, int] = {}  # {地址: 字节}
+    for addr, data in writes:
+        for offset, byte in enumerate(data):
+            memory[addr + offset] = byte
+
+    runs: list[tuple[int, bytes]] = []
+    start = 0
+    buffer = bytearray()
+    for addr in sorted(memory):
+        if buffer and addr != start + len(buffer):
+            runs.append((start, bytes(buffer)))
+            buffer.clear()
+        if not buffer:
+            start = addr
+        buffer.append(memory[addr])
+    if buffer:
+        runs.append((start, bytes(buffer)))
+    return runs
+
+
+class CalWriteBatcher(object):
+    """
+    RAM标定数据写入批处理器；
+    submit将修改加入待写入队列，无写入任务时向线程池提交一个写入任务，
+    写入任务循环取走队列中所有修改，合并为连续的内存段后逐段写入，直至队列为空；
+    每个修改对应一个Future，所在内存段写入完成后得到该段的写入结果
+
+    :param pool: 执行写入任务的线程池
+    :type pool: ThreadPoolExecutor
+    :param write_block: 写入一段连续数据的函数，参数为(起始地址, 数据)，成功时返回True
+    :type write_block: Callable[[int, bytes], bool | None]
+    """
+
+    def __init__(self, pool: ThreadPoolExecutor, write_block: Callable[[int, bytes], bool | None]) -> None:
+        """
+        构造函数
+        """
+        self.pool = pool  # 执行写入任务的线程池
+        self.write_block = write_block  # 写入一段连续数据的函数
+        self.__lock = threading.Lock()
+        self.__pending: list[tuple[int, bytes, Future]] = []  # 待写入的修改，[(地址, 数据, Future), ...]
+        self.__is_flushing = False  # 是否已有写入任务
+
+    def submit(self, addr: int, data: bytes) -> Future:
+        """
+        加入一个待写入的修改
+
+        :param addr: 标定地址
+        :type addr: int
+        :param data: 标定数据
+        :type data: bytes
+        :return: 修改的写入结果，所在内存段写入成功时为True
+        :rtype: Future
+        """
+        future = Future()
+        if not data:
+            future.set_result(True)
+            return future
+        with self.__lock:
+            self.__pending.append((addr, bytes(data), future))
+            if self.__is_flushing:
+                return future
+            self.__is_flushing = True
+        try:
+            self.pool.submit(self.__flush)
+        except Exception as e:
+            with self.__lock:
+                self.__is_flushing = False
+                pending, self.__pending = self.__pending, []
+            for _, _, pending_future in pending:
+                pending_future.set_exception(e)
+        return future
+
+    def __flush(self) -> None:
+        """
+        写入任务，循环取走待写入的修改并按内存段写入，直至队列为空
+
+        """
+        while True:
+            with self.__lock:
+                pending, self.__pending = self.__pending, []
+                if not pending:
+                    self.__is_flushing = False
+                    return
+            runs = merge_cal_writes([(addr, data) for addr, data, _ in pending])
+            starts = [start for start, _ in runs]
+            results: list[bool | None] = []
+            errors: list[Exception | None] = []
+            for start, data in runs:
+                try:
+                    results.append(self.write_block(start, data))
+                    errors.append(None)
+                except Exception as e:
+                    results.append(None)
+                    errors.append(e)
+            for addr, _, future in pending:
+                idx = bisect_right(starts, addr) - 1  # 修改所在的内存段
+                if errors[idx] is not None:
+                    future.set_exception(errors[idx])
+                else:
+                    future.set_result(results[idx])
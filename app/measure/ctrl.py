@@ -16,19 +16,19 @@ import copy  # 拷贝可变类型
 from itertools import groupby  # 分组
 import os
 import pickle
+import time
 from pprint import pprint
 from struct import unpack, pack  # 数值转换
 from tkinter import filedialog
 import traceback  # 用于获取异常详细信息
 from typing import Union
 
-from apscheduler.schedulers.background import BackgroundScheduler
-from xba2l.a2l_base import Options as OptionsParseA2l  # 解析a2l文件
 from xba2l.a2l_lib import AxisPts
-from xba2l.a2l_util import parse_a2l  # 解析a2l文件
 
 from eco import eco_pccp
-from srecord import Srecord
+from eco.eco_daq import DTO_PAYLOAD_SIZE
+from eco.eco_daq_record import DaqRecorder
+from srecord import ChecksumAlgorithm, load_srecord
 from utils import pad_hex
 
 from .model import MeasureModel, \
@@ -36,7 +36,14 @@ from .model import MeasureModel, \
     ASAP2Calibrate, ASAP2Measure, ASAP2RecordLayout, ASAP2CompuMethod, ASAP2AxisDescr, \
     ASAP2FncValues, ASAP2AxisPtsXYZ45, ASAP2CompuVtab, ASAP2AxisPts, \
     ASAP2EnumCalibrateType, ASAP2EnumDataType, ASAP2EnumConversionType, ASAP2EnumByteOrder, \
-    ASAP2EnumIndexMode, ASAP2EnumAddrType, ASAP2EnumIndexOrder, ASAP2EnumAxisType
+    ASAP2EnumIndexMode, ASAP2EnumAddrType, ASAP2EnumIndexOrder, ASAP2EnumAxisType, DaqRate
+from .a2l_cache import load_a2l_project
+from .cal_write import CalWriteBatcher
+from .daq_alloc import allocate_daqs, bind_daq_rates
+from .daq_batch import HAS_NUMPY, BATCH_DECODE_MIN_FRAMES, DaqBatchDecoder
+from .daq_decode import build_decode_plan, decode_odt, get_record_layout
+from .search import NameSearchIndex
+from .display import DisplayBuffer, TableValueRenderer, RefreshPacer
 from .view import tk, ttk, MsrCalView, MeasureView, CalibrateView, TkTreeView, \
     SubPropertyView, SubCalibrateBlockView, SubCalibrateCurveView, SubCalibrateValueView, SubCalibrateMapView
 from ..download.model import DownloadModel
@@ -86,9 +93,15 @@ class MeasureCtrl(object):
 
         # 创建一个线程池，最大线程数为1，用于执行窗口事件
         self.__pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='task_mc_')
+        # RAM标定数据写入批处理器，在线程池中合并连续地址的修改后写入
+        self.__cal_writer = CalWriteBatcher(pool=self.__pool,
+                                            write_block=lambda addr, data:
+                                            self.model.obj_measure.write_ram_cal_block(addr, data))
         # 创建一个线程池，最大线程数为1，用于执行接收daq_dto数据
         self.__pool_recv = ThreadPoolExecutor(max_workers=1, thread_name_prefix='task_recv_')
         self.__after_id = None  # 窗口定时器id
+        self.__value_renderer: TableValueRenderer | None = None  # 测量表格数值渲染器，测量期间有效
+        self.__refresh_pacer: RefreshPacer | None = None  # 测量表格刷新周期调节器，测量期间有效
 
         self.__msr_view = None  # 测量界面
         self.__cal_view = None  # 标定界面
@@ -117,17 +130,47 @@ class MeasureCtrl(object):
 
     def ini_config(self) -> None:
         """
-        初始化配置文件，若配置文件不存在，则新建配置
+        初始化配置文件，若配置文件不存在，则新建配置；
+        若配置文件已存在，则补充其中缺少的配置节和配置项(已有的配置保持不变)
 
         """
         try:
+            default_conf = configparser.ConfigParser()
+            section = 'user'
+            default_conf.add_section(section)
+            default_conf.set(section, 'opened_pgm_filepath', '')
+            default_conf.set(section, 'opened_a2l_filepath', '')
+            default_conf.set(section, 'refresh_operate_measure_time_ms', '100')
+            default_conf.set(section, 'record_measure', 'False')
+            default_conf.set(section, 'record_dir', 'records')
+            default_conf.set(section, 'a2l_cache_dir', 'a2l_cache')
+            default_conf.set(section, 'upload_verify_algorithm', '')
+            # 速率表，速率名称 = 事件通道, 预分频系数[, 优先使用的daq列表序号]
+            section = 'daq_rate'
+            default_conf.add_section(section)
+            for rate in self.model.daq_rates:
+                default_conf.set(section, rate.name, self.__format_daq_rate(rate))
+
             if not os.path.isfile(self.__cfg_a2l_path):
+                conf = default_conf
+                is_changed = True
+            else:
                 conf = configparser.ConfigParser()
-                section = 'user'
-                conf.add_section(section)
-                conf.set(section, 'opened_pgm_filepath', '')
-                conf.set(section, 'opened_a2l_filepath', '')
-                conf.set(section, 'refresh_operate_measure_time_ms', '100')
+                conf.read(self.__cfg_a2l_path, encoding='utf-8')
+                is_changed = False
+                for section in default_conf.sections():
+                    if not conf.has_section(section):
+                        conf.add_section(section)
+                        for option in default_conf.options(section):
+                            conf.set(section, option, default_conf.get(section, option))
+                        is_changed = True
+                    elif section != 'daq_rate':
+                        # 速率表的各项由用户自定义，已存在时不补充
+                        for option in default_conf.options(section):
+                            if not conf.has_option(section, option):
+                                conf.set(section, option, default_conf.get(section, option))
+                                is_changed = True
+            if is_changed:
                 with open(self.__cfg_a2l_path, 'w', encoding='utf-8') as f:
                     # noinspection PyTypeChecker
                     conf.write(f)
@@ -149,10 +192,51 @@ class MeasureCtrl(object):
                 for option in conf.options(section):
                     if hasattr(self.model, option):
                         setattr(self.model, option, conf.get(section, option))
+            # 读取速率表
+            if conf.has_section('daq_rate') and conf.options('daq_rate'):
+                self.model.daq_rates = [self.__parse_daq_rate(name, conf.get('daq_rate', name))
+                                        for name in conf.options('daq_rate')]
         except Exception as e:
             self.text_log(f'发生异常 {e}', 'error')
             self.text_log(f"{traceback.format_exc()}", 'error')
 
+    @staticmethod
+    def __format_daq_rate(rate: DaqRate) -> str:
+        """
+        速率转换为配置文件中的文本，'事件通道, 预分频系数[, 优先使用的daq列表序号]'
+
+        :param rate: 速率
+        :type rate: DaqRate
+        :return: 配置文本，例如：'1, 0x01, 1'
+        :rtype: str
+        """
+        text = f'{rate.event_channel}, {pad_hex(hex(rate.prescaler), 1)}'
+        if rate.daq_number is not None:
+            text += f', {rate.daq_number}'
+        return text
+
+    @staticmethod
+    def __parse_daq_rate(name: str, text: str) -> DaqRate:
+        """
+        解析配置文件中的速率文本
+
+        :param name: 速率名称
+        :type name: str
+        :param text: 配置文本，'事件通道, 预分频系数[, 优先使用的daq列表序号]'，例如：'1, 0x01, 1'
+        :type text: str
+        :return: 速率
+        :rtype: DaqRate
+        :raises ValueError: 配置文本格式错误
+        """
+        fields = [int(field, 0) for field in text.split(',')]
+        if len(fields) not in (2, 3) or not 0 < fields[1] <= 0xFFFF:
+            msg = f"速率{name}的配置'{text}'无效，应为'事件通道, 预分频系数[, daq列表序号]'"
+            raise ValueError(msg)
+        return DaqRate(name=name,
+                       event_channel=fields[0],
+                       prescaler=fields[1],
+                       daq_number=fields[2] if len(fields) == 3 else None)
+
     def save_config(self) -> None:
         """
         保存配置到配置文件
@@ -197,80 +281,52 @@ class MeasureCtrl(object):
                     msg = f"不存在A2L文件 -> {self.model.opened_a2l_filepath}"
                     self.text_log(msg, 'warning')
                     return
-                # 读取a2l文件
-                with open(self.model.opened_a2l_filepath, 'rb') as f:
-                    a2l_string = f.read()
-
-                # 解析a2l文件
-                option = OptionsParseA2l()
-                option.calculate_memory_size = True
-                option.ignore_measurements = False
-                option.read_instance = True
-                err, asap2, module = parse_a2l(a2l_string, encoding='utf-8', options=option)
-                if err:
-                    raise err
+                # 加载a2l工程数据，同一a2l文件再次打开时从缓存加载
+                start_time = time.perf_counter()
+                project, from_cache = load_a2l_project(self.model.opened_a2l_filepath, self.model.a2l_cache_dir)
+                self.text_log(f"{'从缓存加载' if from_cache else '解析'}A2L文件耗时"
+                              f"{(time.perf_counter() - start_time) * 1000:.0f}ms")
 
                 # 获取a2l模块，保存到视图数据模型中
-                self.model.a2l_module = module
+                self.model.a2l_module = project.module
 
                 # 获取a2l项目名称和版本号
-                project_name = asap2.project.name
-                version = str(asap2.asap2_version.version_no) + '.' + str(asap2.asap2_version.upgrade_no)
+                project_name = project.project_name
+                version = project.version
 
                 # 获取a2l文件的epk信息
-                self.model.a2l_epk = module.mod_par.epk
+                self.model.a2l_epk = project.epk
                 # 获取a2l文件的内存段信息
-                for memory_segment in module.mod_par.memory_segments:
-                    self.model.a2l_memory_code = memory_segment.name == '_CODE' and memory_segment or \
-                                                 self.model.a2l_memory_code
-                    self.model.a2l_memory_epk_data = memory_segment.name == '_epk_data' and memory_segment or \
-                                                     self.model.a2l_memory_epk_data
-                    self.model.a2l_memory_ram_cal = memory_segment.name == '_RAMCAL' and memory_segment or \
-                                                    self.model.a2l_memory_ram_cal
-                    self.model.a2l_memory_rom_cal = memory_segment.name == '_ROMCAL' and memory_segment or \
-                                                    self.model.a2l_memory_rom_cal
+                memory_segments = project.memory_segments
+                self.model.a2l_memory_code = memory_segments.get('_CODE', self.model.a2l_memory_code)
+                self.model.a2l_memory_epk_data = memory_segments.get('_epk_data', self.model.a2l_memory_epk_data)
+                self.model.a2l_memory_ram_cal = memory_segments.get('_RAMCAL', self.model.a2l_memory_ram_cal)
+                self.model.a2l_memory_rom_cal = memory_segments.get('_ROMCAL', self.model.a2l_memory_rom_cal)
                 # 获取a2l标定变量存储结构，保存到视图数据模型中
-                self.model.a2l_record_layout_dict = copy.deepcopy(module.record_layout_dict)
+                self.model.a2l_record_layout_dict = project.record_layout_dict
                 # 获取a2l转换方法，保存到视图数据模型中
-                self.model.a2l_conversion_dict = copy.deepcopy(module.compu_method_dict)
+                self.model.a2l_conversion_dict = project.conversion_dict
                 # 获取a2l转换表
-                self.model.a2l_compu_vtab_dict = copy.deepcopy(module.compu_vtab_dict)
+                self.model.a2l_compu_vtab_dict = project.compu_vtab_dict
                 # 获取a2l轴类型参考
-                self.model.a2l_axis_pts_dict = copy.deepcopy(module.axis_pts_dict)
+                self.model.a2l_axis_pts_dict = project.axis_pts_dict
 
                 # 获取a2l测量对象，保存到视图数据模型中
-                # 筛选指定数据项，filter返回的是浅拷贝的迭代器，每次迭代的元素内容指向module.measurements列表中的元素内容
-                measurements = filter(lambda item: item.data_type != "FLOAT64_IEEE",
-                                      module.measurements)
-                measurements = sorted(list(measurements), key=lambda item: item.name)
-                self.model.a2l_measurement_dict.clear()
-                for item in measurements:
-                    if item.array_size and item.array_size > 1: # 处理数组类型
-                        for idx in range(item.array_size):
-                            item_tmp = copy.deepcopy(item)
-                            item_tmp.name = item_tmp.name+f"_BLK({idx})"
-                            item_tmp.array_size = None
-                            item_tmp.ecu_address = (item_tmp.ecu_address +
-                                                    idx * ASAP2EnumDataType.get_size(item_tmp.data_type))
-                            self.model.a2l_measurement_dict[item_tmp.name] = item_tmp
-                    else: # 处理值类型
-                        self.model.a2l_measurement_dict[item.name] = item
+                self.model.a2l_measurement_dict = project.measurement_dict
                 # 获取a2l标定对象，保存到视图数据模型中
-                calibrations = module.characteristics
-                calibrations = sorted(calibrations, key=lambda item: item.name)
-                self.model.a2l_calibration_dict.clear()
-                for item in calibrations:
-                    self.model.a2l_calibration_dict[item.name] = item
+                self.model.a2l_calibration_dict = project.calibration_dict
 
                 # 初始化测量选择表格数据项内容，保存到视图数据模型
+                # 数组类型的测量对象在遍历时展开为各元素名称，只遍历一次
+                measure_names = list(self.model.a2l_measurement_dict)
                 self.model.table_select_measure_raw_items.clear()
-                for name in self.model.a2l_measurement_dict:
+                for name in measure_names:
                     table_item = SelectMeasureItem(is_selected='',
                                                    name=name,
-                                                   is_selected_20ms='□',
-                                                   is_selected_100ms='□')
+                                                   rate='')
                     self.model.table_select_measure_raw_items.append(table_item)
                 self.model.table_select_measure_filter_items = self.model.table_select_measure_raw_items
+                self.model.search_index_measure = NameSearchIndex(measure_names)
                 # 初始化标定选择表格数据项内容，保存到视图数据模型
                 self.model.table_select_calibrate_raw_items.clear()
                 for name in self.model.a2l_calibration_dict:
@@ -279,6 +335,7 @@ class MeasureCtrl(object):
                                                      is_selected_check='□')
                     self.model.table_select_calibrate_raw_items.append(table_item)
                 self.model.table_select_calibrate_filter_items = self.model.table_select_calibrate_raw_items
+                self.model.search_index_calibrate = NameSearchIndex(list(self.model.a2l_calibration_dict))
                 msg_a2l = (f"a2l信息 -> {project_name}, V{version}"
                            f"\n\ta2l_epk -> {self.model.a2l_epk} "
                            f"\n\t文件路径 -> {self.model.opened_a2l_filepath}")
@@ -293,11 +350,11 @@ class MeasureCtrl(object):
                     self.text_log(msg, 'warning')
                     return
                 # 获取程序文件处理对象
-                self.model.obj_srecord = Srecord(self.model.opened_pgm_filepath)
+                self.model.obj_srecord = load_srecord(self.model.opened_pgm_filepath)
                 # 获取程序文件epk信息
                 epk_data = self.model.obj_srecord.get_epk(self.model.a2l_memory_epk_data.address)
                 if epk_data:
-                    self.model.pgm_epk = bytes.fromhex(epk_data).decode(encoding='utf-8').rstrip('\x00')
+                    self.model.pgm_epk = bytes(epk_data).decode(encoding='utf-8').rstrip('\x00')
                 # 获取程序信息
                 msg_pgm = (f"程序信息 -> {self.model.obj_srecord.describe_info}"
                            f"\n\tpgm_epk -> {self.model.pgm_epk}"
@@ -453,18 +510,20 @@ class MeasureCtrl(object):
         """
         try:
             if target == 'all' or target == 'measure':
-                # 筛选数据项，filter返回的是浅拷贝的迭代器，每次迭代的元素内容指向对应原始数据项的内容
-                self.model.table_select_measure_filter_items = (
-                    filter(lambda item: self.model.entry_search_measure_item.get().strip().lower() in item.name.lower(),
-                           self.model.table_select_measure_raw_items))
+                # 由搜索索引筛选数据项，元素内容指向对应原始数据项的内容
+                raw_items = self.model.table_select_measure_raw_items
+                self.model.table_select_measure_filter_items = [
+                    raw_items[idx] for idx in
+                    self.model.search_index_measure.search(self.model.entry_search_measure_item.get())]
                 # 刷新
                 self.__flush_table_select(target='measure')
                 self.__flush_label_select_number(target='measure')
             if target == 'all' or target == 'calibrate':
-                # 筛选数据项，filter返回的是浅拷贝的迭代器，每次迭代的元素内容指向对应原始数据项的内容
-                self.model.table_select_calibrate_filter_items = (
-                    filter(lambda item: self.model.entry_search_calibrate_item.get().strip().lower() in item.name.lower(),
-                           self.model.table_select_calibrate_raw_items))
+                # 由搜索索引筛选数据项，元素内容指向对应原始数据项的内容
+                raw_items = self.model.table_select_calibrate_raw_items
+                self.model.table_select_calibrate_filter_items = [
+                    raw_items[idx] for idx in
+                    self.model.search_index_calibrate.search(self.model.entry_search_calibrate_item.get())]
                 # 刷新
                 self.__flush_table_select(target='calibrate')
                 self.__flush_label_select_number(target='calibrate')
@@ -499,32 +558,28 @@ class MeasureCtrl(object):
                 if not selected_item_id:
                     return
 
-                # 若鼠标点击数据项时的位置非通道选择框所处的列，则直接返回
-                if not (column_names[selected_column_index] == "20ms" or column_names[selected_column_index] == "100ms"):
+                # 若鼠标点击数据项时的位置非速率选择框所处的列，则直接返回
+                rate_names = [rate.name for rate in self.model.daq_rates]  # 速率选择框所处的列
+                selected_column_name = column_names[selected_column_index]
+                if selected_column_name not in rate_names:
                     return
 
-                # 获取选中数据项的值
-                item_values = self.view.table_select_measure.item(selected_item_id, "values")
-                # 设置速率通道选中标识
-                if column_names[selected_column_index] == "20ms":
-                    self.view.table_select_measure.set(selected_item_id, column_names.index('100ms'), '□')
-                    set_value = item_values[column_names.index('20ms')] == '□' and '√' or '□'
-                    self.view.table_select_measure.set(selected_item_id, selected_column_index, set_value)
-                if column_names[selected_column_index] == "100ms":
-                    self.view.table_select_measure.set(selected_item_id, column_names.index('20ms'), '□')
-                    set_value = item_values[column_names.index('100ms')] == '□' and '√' or '□'
-                    self.view.table_select_measure.set(selected_item_id, selected_column_index, set_value)
-                # 获取最新选中数据项的值
-                item_values = self.view.table_select_measure.item(selected_item_id, "values")
-                set_value = (item_values[column_names.index('20ms')] == '√' or
-                             item_values[column_names.index('100ms')] == '√') and '☆' or ''
-                self.view.table_select_measure.set(selected_item_id, column_names.index('is_selected'), set_value)
+                # 设置速率选中标识，各速率互斥，再次点击已选速率则取消选择
+                is_checked = self.view.table_select_measure.set(selected_item_id, selected_column_name) == '□'
+                for rate_name in rate_names:
+                    set_value = (is_checked and rate_name == selected_column_name) and '√' or '□'
+                    self.view.table_select_measure.set(selected_item_id, rate_name, set_value)
+                set_value = is_checked and '☆' or ''
+                self.view.table_select_measure.set(selected_item_id, 'is_selected', set_value)
 
                 # 存储原始数据项列表的内容到数据模型
                 idx, table_item = self.__iid2idx_in_select_table(iid=selected_item_id,
                                                                  table_widget=self.view.table_select_measure,
-                                                                 raw_items=self.model.table_select_measure_raw_items)
+                                                                 raw_items=self.model.table_select_measure_raw_items,
+                                                                 search_index=self.model.search_index_measure)
                 self.model.table_select_measure_raw_items[idx] = table_item
+                # 同步更新表格显示的数据项(筛选后的数据项)
+                self.view.table_select_measure.update_row(selected_item_id, table_item)
 
                 # 刷新
                 self.__flush_label_select_number(target='measure')
@@ -563,8 +618,11 @@ class MeasureCtrl(object):
                 # 存储原始数据项列表的内容到数据模型
                 idx, table_item = self.__iid2idx_in_select_table(iid=selected_item_id,
                                                                  table_widget=self.view.table_select_calibrate,
-                                                                 raw_items=self.model.table_select_calibrate_raw_items)
+                                                                 raw_items=self.model.table_select_calibrate_raw_items,
+                                                                 search_index=self.model.search_index_calibrate)
                 self.model.table_select_calibrate_raw_items[idx] = table_item
+                # 同步更新表格显示的数据项(筛选后的数据项)
+                self.view.table_select_calibrate.update_row(selected_item_id, table_item)
 
                 # 刷新
                 self.__flush_label_select_number(target='calibrate')
@@ -648,16 +706,14 @@ class MeasureCtrl(object):
                 # 清除所有原始数据项的选中状态
                 for msr_item in self.model.table_select_measure_raw_items:
                     msr_item.is_selected = ''
-                    msr_item.is_selected_20ms = '□'
-                    msr_item.is_selected_100ms = '□'
+                    msr_item.rate = ''
                 # 获取所有原始数据项的名字
                 measure_raw_item_names = [item.name for item in self.model.table_select_measure_raw_items]
                 # 将测量表格数据项状态写入到原始数据项的状态
                 for k, v in self.model.table_measure_dict.items():
                     table_item = SelectMeasureItem(is_selected='★',
                                                    name=k,
-                                                   is_selected_20ms=v.rate == '20ms' and '√' or '□',
-                                                   is_selected_100ms=v.rate == '100ms' and '√' or '□', )
+                                                   rate=v.rate)
                     # 获取测量数据项名字在原始数据项列表中索引
                     idx = measure_raw_item_names.index(k)
                     # 更新原始数据项内容
@@ -832,19 +888,28 @@ class MeasureCtrl(object):
 
             """
             try:
-                # daq列表信息
+                # 获取ECU中所有可用的daq列表信息
                 # 例如{1: {'first_pid': 0x3c, 'odts_size': 0x20},
                 #     2: {'first_pid': 0x78, 'odts_size': 0x30}}
-                daqs_cfg: dict[int, dict[str, int]] = {}
-
-                # 获取daq的信息
-                daq_cfg_list = [self.model.obj_measure.get_daq_cfg(daq_number=1),
-                                self.model.obj_measure.get_daq_cfg(daq_number=2)]
-                for daq_cfg in daq_cfg_list:
-                    daq_number = daq_cfg[0]  # daq列表序号
-                    first_pid = daq_cfg[1]  # daq中首个odt的pid
-                    odts_size = daq_cfg[2]  # daq中odt列表的的大小
-                    daqs_cfg[daq_number] = {'first_pid': int(first_pid, 16), 'odts_size': int(odts_size, 16)}
+                ecu_daqs_cfg = self.model.obj_measure.get_daq_cfgs()
+                if not ecu_daqs_cfg:
+                    raise Exception('未获取到ECU中可用的daq列表')
+                self.text_log(f"ECU中可用的daq列表: " +
+                              ', '.join(f"daq{n}(odt {cfg['odts_size']})" for n, cfg in ecu_daqs_cfg.items()))
+
+                # 为测量数据项所用的速率绑定daq列表
+                rate_dict = {rate.name: rate for rate in self.model.daq_rates}  # 速率表
+                used_rate_names = {item.rate for item in self.model.table_measure_dict.values()}
+                unknown_rate_names = used_rate_names - rate_dict.keys()
+                if unknown_rate_names:
+                    raise Exception(f"速率{sorted(unknown_rate_names)}不在速率表中，请重新选择测量数据项")
+                used_rates = [rate for rate in self.model.daq_rates if rate.name in used_rate_names]
+                daq_rate_numbers, daqs_cfg = bind_daq_rates(rates=used_rates, daqs_cfg=ecu_daqs_cfg)
+                for rate in used_rates:
+                    cfg = daqs_cfg[daq_rate_numbers[rate.name]]
+                    self.text_log(f"速率{rate.name} -> daq{daq_rate_numbers[rate.name]},"
+                                  f"事件通道{cfg['event_channel']},预分频{cfg['prescaler']}")
+                self.model.daq_rate_numbers = daq_rate_numbers
                 # 保存daq列表信息到数据模型
                 self.model.daqs_cfg = copy.deepcopy(daqs_cfg)
                 return True
@@ -882,7 +947,13 @@ class MeasureCtrl(object):
                     raise Exception(future.exception())
                 if future.result():
                     self.model.daqs = copy.deepcopy(future.result())  # 保存daq列表到数据模型
-                    self.__pool.submit(self.model.obj_measure.start_measure, self.model.daqs).add_done_callback(
+                    # 预编译各pid的解码计划
+                    self.model.daq_decode_plans = build_decode_plan(self.model.daqs, self.model.daqs_cfg)
+                    for plan in self.model.daq_decode_plans.values():
+                        for element in plan.failed:
+                            self.text_log(element.error, 'error')
+                    self.__pool.submit(self.model.obj_measure.start_measure,
+                                       self.model.daqs, self.model.daqs_cfg).add_done_callback(
                         _recv_daq_dto)
                 return True
             except Exception as e:
@@ -914,8 +985,12 @@ class MeasureCtrl(object):
                     # 清空can接收消息缓冲区
                     self.model.obj_measure.clear_recv_queue()
                     # 启动测量后，开始接收daq_dto数据，并刷新显示数据
+                    self.model.display_buffer = DisplayBuffer()  # 每次测量使用新的交接缓冲区
                     self.__pool_recv.submit(self.__recv_daq_dto).add_done_callback(_done)
-                    self.__after_id = self.__msr_view.after(ms=int(self.model.refresh_operate_measure_time_ms),
+                    # 创建测量表格数值渲染器及刷新周期调节器，启动刷新显示
+                    self.__value_renderer = TableValueRenderer(self.__msr_view.table_measure)
+                    self.__refresh_pacer = RefreshPacer(int(self.model.refresh_operate_measure_time_ms))
+                    self.__after_id = self.__msr_view.after(ms=self.__refresh_pacer.schedule(),
                                                             func=self.__display_monitor_value)
             except Exception as e:
                 self.text_log(f'发生异常 {e}', 'error')
@@ -1386,7 +1461,7 @@ class MeasureCtrl(object):
                 if item.data == data:
                     self.text_log(f'标定值未变化，无需修改', 'warning')
                     return
-                (self.__pool.submit(self.model.obj_measure.write_ram_cal, addr, data).
+                (self.__cal_writer.submit(addr, data).
                  add_done_callback(lambda f: _callback(f,
                                                        item=item,
                                                        value=val,
@@ -1460,6 +1535,23 @@ class MeasureCtrl(object):
 
         """
 
+        def _progress(done: int, total: int, rate: float) -> None:
+            """
+            上传进度回调函数，在上传按钮上显示进度及速率
+
+            :param done: 已上传的字节数
+            :type done: int
+            :param total: 总字节数
+            :type total: int
+            :param rate: 平均速率，单位：字节/秒
+            :type rate: float
+            """
+            try:
+                percent = done * 100 // total if total else 100
+                self.__cal_view.btn_upload_from_ram.config(text=f'{percent}% {rate / 1024:.1f}KB/s')
+            except Exception:
+                pass
+
         def _callback(future):
             """
             线程执行结束的回调函数
@@ -1467,12 +1559,18 @@ class MeasureCtrl(object):
             :param future: 线程执行结束返回的future对象
             """
             try:
+                self.__cal_view.btn_upload_from_ram.config(text='从RAM上传')
                 # 若线程执行中存在异常，则抛出此异常信息
                 if future.exception():
                     self.text_log(f'上传失败', 'error')
                     raise Exception(future.exception())
                 if future.result():
-                    upd_data: bytes = future.result()
+                    upd_data, verified = future.result()
+                    if verified is False:
+                        self.text_log('上传数据与ECU校验不一致', 'error')
+                        self.view.show_warning('上传数据与ECU校验不一致', self.__cal_view)
+                    elif verified is None and verify_algorithm is not None:
+                        self.text_log('ECU不支持上传数据校验，已跳过校验', 'warning')
                     if upd_data.hex().upper().endswith('1122334455667788'):
                         msg = (f"上传成功"
                                f"\n\t长度 -> {hex(len(upd_data))},"
@@ -1519,7 +1617,18 @@ class MeasureCtrl(object):
             self.text_log(f'======从RAM上传标定数据======', 'done')
             addr = self.model.a2l_memory_ram_cal.address
             _, length, _ = self.model.obj_srecord.get_cal_data()
-            self.__pool.submit(self.model.obj_measure.read_ram_cal, addr, length).add_done_callback(_callback)
+            # 上传时显示进度，若配置了校验算法，上传后按块校验
+            verify_algorithm = None
+            if self.model.upload_verify_algorithm.strip():
+                try:
+                    verify_algorithm = ChecksumAlgorithm(self.model.upload_verify_algorithm.strip())
+                except ValueError:
+                    self.text_log(f'不支持的上传校验算法{self.model.upload_verify_algorithm}，不校验上传数据', 'warning')
+            self.__pool.submit(self.model.obj_measure.read_ram_cal,
+                               addr,
+                               length,
+                               _progress,
+                               verify_algorithm).add_done_callback(_callback)
             self.text_log(f'上传中 . . .', 'done')
             self.__cal_view.btn_upload_from_ram.config(state='disabled')
         except Exception as e:
@@ -1660,30 +1769,21 @@ class MeasureCtrl(object):
         :type target: str
         """
         if target == 'all' or target == 'measure':
-            # 清空所有数据项
-            self.view.table_select_measure.delete(*self.view.table_select_measure.get_children())
-            # 刷新选择表格数据项
-            for table_item in self.model.table_select_measure_filter_items:
-                values = (table_item.is_selected,
-                          table_item.name,
-                          table_item.is_selected_20ms,
-                          table_item.is_selected_100ms)
-                self.view.table_select_measure.insert(parent="",
-                                                      index="end",
-                                                      text="",
-                                                      values=values)
+            # 刷新选择表格数据项，表格只显示可见范围内的数据项
+            rate_names = [rate.name for rate in self.model.daq_rates]
+            self.view.table_select_measure.set_rows(
+                rows=self.model.table_select_measure_filter_items,
+                values_of=lambda table_item: (table_item.is_selected,
+                                              table_item.name,
+                                              *(table_item.rate == rate_name and '√' or '□'
+                                                for rate_name in rate_names)))
         if target == 'all' or target == 'calibrate':
-            # 清空所有数据项
-            self.view.table_select_calibrate.delete(*self.view.table_select_calibrate.get_children())
-            # 刷新选择表格数据项
-            for table_item in self.model.table_select_calibrate_filter_items:
-                values = (table_item.is_selected,
-                          table_item.name,
-                          table_item.is_selected_check)
-                self.view.table_select_calibrate.insert(parent="",
-                                                        index="end",
-                                                        text="",
-                                                        values=values)
+            # 刷新选择表格数据项，表格只显示可见范围内的数据项
+            self.view.table_select_calibrate.set_rows(
+                rows=self.model.table_select_calibrate_filter_items,
+                values_of=lambda table_item: (table_item.is_selected,
+                                              table_item.name,
+                                              table_item.is_selected_check))
 
     def __flush_table_operate(self, target:str) -> None:
         """
@@ -1704,6 +1804,9 @@ class MeasureCtrl(object):
                               v.conversion.unit)
                     self.__msr_view.table_measure.insert(
                         parent="", index="end", text="", values=values)
+                # 表格数据项已重建，重新缓存iid
+                if self.__value_renderer is not None and self.__value_renderer.table is self.__msr_view.table_measure:
+                    self.__value_renderer.reset()
         if target == 'all' or target == 'calibrate':
             if self.__cal_view and self.__cal_view.table_calibrate:
                 # 清空所有数据项
@@ -1762,12 +1865,12 @@ class MeasureCtrl(object):
         """
         if target == 'all' or target == 'measure':
             measure_selected_num = len([item for item in self.model.table_select_measure_raw_items if item.is_selected])
-            measure_filter_num = len(self.view.table_select_measure.get_children())  # 不能根据数据模型中filter_items计算，因为其为迭代器，可能已被遍历过
+            measure_filter_num = len(self.model.table_select_measure_filter_items)
             text = str(measure_selected_num) + '/' + str(measure_filter_num)
             self.view.label_select_measure_number.config(text=text)
         if target == 'all' or target == 'calibrate':
             calibrate_selected_num = len([item for item in self.model.table_select_calibrate_raw_items if item.is_selected])
-            calibrate_filter_num = len(self.view.table_select_calibrate.get_children())  # 不能根据数据模型中filter_items计算，因为其为迭代器，可能已被遍历过
+            calibrate_filter_num = len(self.model.table_select_calibrate_filter_items)
             text = str(calibrate_selected_num) + '/' + str(calibrate_filter_num)
             self.view.label_select_calibrate_number.config(text=text)
 
@@ -1960,126 +2063,45 @@ class MeasureCtrl(object):
         :raises Exception: 数据项的转换系数不被支持；分配daq超过odt列表允许的最大范围；
         """
 
-        def _write_odts(group_of_daq: list[ASAP2Measure]) -> dict[int, list[ASAP2Measure]]:
-            """
-            将指定daq的测量数据项分配到各odt中
-
-            :param group_of_daq: 指定daq的测量数据项列表
-            :type group_of_daq: list[ASAP2Measure]
-            :return: odts，指定daq的odt列表，例如{0: [item0, item1], 1: [item2, item3, item4]}，
-                键0是本daq的odt列表序号为0的odt，值[item0, item1]为该odt中包含的测量数据项列表
-            :rtype: dict[int, list[ASAP2Measure]]
-            :raises ValueError: 数据项的元素大小属性值不是1,2,4中的一个
-            """
-
-            def _get_free_memory_of_odt(odt: list[ASAP2Measure]) -> int:
-                """
-                获取odt空闲容量
-
-                :param odt: 元素为ASAP2Measure对象的列表，元素大小总和不超过7字节
-                :type odt: list[ASAP2Measure]
-                :return: 空闲容量，单位字节
-                :rtype: int
-                """
-                res = 0
-                for element in odt:
-                    res += element.element_size
-                return 7 - res
-
-            # 声明变量
-            odts: dict[int, list[ASAP2Measure]] = {}  # odt列表
-            ptr_4byte = 0  # 4字节odt指针，大小为4字节的元素所在odt的列表索引
-            ptr_2byte = 0  # 2字节odt指针，大小为2字节的元素所在odt的列表索引
-            ptr_1byte = 0  # 1字节odt指针，大小为1字节的元素所在odt的列表索引
-
-            # 处理每项数据
-            for item in group_of_daq:
-                if item.element_size == 4:
-                    # 若odts中不存在key为ptr_4byte的odt，则新建key为ptr_4byte的odt，并存入数据项
-                    # 若key为ptr_4byte的odt空闲容量大于4，则存入数据项
-                    # 否则ptr_4byte指向下一odt，重复上述步骤
-                    while True:
-                        if ptr_4byte not in odts:
-                            odts[ptr_4byte] = [item]
-                            break
-                        elif _get_free_memory_of_odt(odts[ptr_4byte]) >= 4:
-                            odts[ptr_4byte].append(item)
-                            break
-                        else:
-                            ptr_4byte += 1
-                elif item.element_size == 2:
-                    # 若odts中不存在key为ptr_2byte的odt，则新建key为ptr_2byte的odt，并存入数据项
-                    # 若key为ptr_2byte的odt空闲容量大于2，则存入数据项
-                    # 否则ptr_2byte指向下一odt，重复上述步骤
-                    while True:
-                        if ptr_2byte not in odts:
-                            odts[ptr_2byte] = [item]
-                            break
-                        elif _get_free_memory_of_odt(odts[ptr_2byte]) >= 2:
-                            odts[ptr_2byte].append(item)
-                            break
-                        else:
-                            ptr_2byte += 1
-                elif item.element_size == 1:
-                    # 若odts中不存在key为ptr_1byte的odt，则新建key为ptr_1byte的odt，并存入数据项
-                    # 若key为ptr_1byte的odt空闲容量大于1，则存入数据项
-                    # 否则ptr_1byte指向下一odt，重复上述步骤
-                    while True:
-                        if ptr_1byte not in odts:
-                            odts[ptr_1byte] = [item]
-                            break
-                        elif _get_free_memory_of_odt(odts[ptr_1byte]) >= 1:
-                            odts[ptr_1byte].append(item)
-                            break
-                        else:
-                            ptr_1byte += 1
-                else:
-                    msg = f'数据项{item.name}的element_size不在1、2、4中'
-                    raise ValueError(msg)
-            return odts  # 返回odt列表
-
         self.text_log('------分配daq------')
 
-        # 根据速率对测量数据项分组
+        # 根据速率对测量数据项分组，分组依据为所选速率绑定的daq列表(上次分配时转入其他daq列表的数据项也回到原列表)
+        _daq_rate_numbers = self.model.daq_rate_numbers  # 各速率使用的daq列表
         group_by_daq: dict[int, list[ASAP2Measure]] = {}  # 根据daq对测量数据项分组的结果
-        for key, group in groupby(sorted(self.model.table_measure_dict.values(), key=lambda x: x.daq_number),
-                                  key=lambda x: x.daq_number):
+        for key, group in groupby(sorted(self.model.table_measure_dict.values(),
+                                         key=lambda x: _daq_rate_numbers[x.rate]),
+                                  key=lambda x: _daq_rate_numbers[x.rate]):
             group_by_daq[key] = list(group)
 
-        # 写入daq列表
-        daqs: dict[int, dict[int, list[ASAP2Measure]]] = {}  # daq列表
-        for daq_number in group_by_daq.keys():
-            daqs[daq_number] = _write_odts(group_of_daq=group_by_daq[daq_number])
-
-        # 判断转换系数是否被支持，以及odt列表是否超出允许的长度
+        # 判断转换系数是否被支持
         msg_exception_coeffs = ''
-        msg_exception_outrange = ''
-        for daq_number, odts in daqs.items():
-            # 若odt列表中存在转换系数不被支持的数据项，则抛出异常
-            for _, odt in odts.items():
-                for item in odt:
-                    # 普通数值转换类型
-                    # raw_value = f(physical_value)
-                    # f(x) = (A*x^2 + B*x + C) / (D*x^2 + E*x + F)
-                    if item.conversion.conversion_type == ASAP2EnumConversionType.RAT_FUNC:
-                        A, B, C, D, E, F = item.conversion.coeffs
-                        if (A > 1e-6) or (D > 1e-6) or (E > 1e-6) or (F - 1.0 > 1e-6):
-                            msg_exception_coeffs += f"{item.name}的转换系数{item.conversion.coeffs}不支持\n"
-            if msg_exception_coeffs:
-                continue
-            # 若odt列表超出允许的长度，则抛出异常
-            if len(odts) > daqs_cfg[daq_number]['odts_size']:
-                msg_exception_outrange = f"daq{daq_number}中odt至多为{daqs_cfg[daq_number]['odts_size']},无法容纳以下对象:\n"
-                for idx in range(daqs_cfg[daq_number]['odts_size'], len(odts)):
-                    for item in odts[idx]:
-                        msg_exception_outrange += f"   {item.name}\n"
+        for item in self.model.table_measure_dict.values():
+            # 普通数值转换类型
+            # raw_value = f(physical_value)
+            # f(x) = (A*x^2 + B*x + C) / (D*x^2 + E*x + F)
+            if item.conversion.conversion_type == ASAP2EnumConversionType.RAT_FUNC:
+                A, B, C, D, E, F = item.conversion.coeffs
+                if (A > 1e-6) or (D > 1e-6) or (E > 1e-6) or (F - 1.0 > 1e-6):
+                    msg_exception_coeffs += f"{item.name}的转换系数{item.conversion.coeffs}不支持\n"
         if msg_exception_coeffs:
             raise Exception(msg_exception_coeffs)
-        if msg_exception_outrange:
+
+        # 写入daq列表，odt不足时转入其他daq列表，若仍无法容纳，则抛出异常
+        allocation = allocate_daqs(groups=group_by_daq, daqs_cfg=daqs_cfg)
+        if allocation.unplaced:
+            msg_exception_outrange = f"daq列表中odt数量不足,无法容纳以下对象:\n"
+            for item in allocation.unplaced:
+                msg_exception_outrange += f"   {item.name}\n"
             raise Exception(msg_exception_outrange)
+        for item, from_number, to_number in allocation.spilled:
+            self.text_log(f"daq{from_number}的odt不足,{item.name}转入daq{to_number}", 'warning')
+        daqs = allocation.daqs  # daq列表
 
         # 获取测量数据项的属性，打印odt列表
         self.text_log('分配完成')
+        for daq_number, odts in daqs.items():
+            self.text_log(f"daq{daq_number}: odt {len(odts)}/{daqs_cfg[daq_number]['odts_size']},"
+                          f"填充率{allocation.efficiency(daq_number):.1%}")
         for daq_number, odts in daqs.items():
             for odt_number, odt in odts.items():
                 for element_number in range(len(odt)):
@@ -2095,137 +2117,128 @@ class MeasureCtrl(object):
 
     def __recv_daq_dto(self) -> None:
         """
-        解析daq_dto数据为显示格式的数据，将其压入队列
+        消费DAQ采集引擎环形缓冲区中的daq_dto数据，解析为显示格式的数据，按刷新周期交给显示方；
+        若启用录制，则同时将原始dto录制到磁盘
         """
-
-        def _put_to_queue(data):
-            """
-            将数据放入队列
-
-            :param data: 待放入队列的数据
-            """
-            try:
-                _q.put_nowait(copy.deepcopy(data))
-            except:
-                pass
-
         self.text_log("接收数据中 . . .", 'done')
 
-        # 待显示的值{在测量表中的索引:int，(名称:str, 物理值:str)}
-        display_values: dict[int, tuple[str, str]] = {}
-        # 创建后台执行的 schedulers
-        scheduler_recv = BackgroundScheduler()
-        # 添加调度任务
-        scheduler_recv.add_job(func=_put_to_queue,
-                               trigger='interval',
-                               seconds=int(self.model.refresh_operate_measure_time_ms) / 1000,
-                               id='job_id_recv',
-                               max_instances=1,
-                               args=(display_values,))
-        # 启动调度任务
-        if not scheduler_recv.state:
-            scheduler_recv.start()
-            pass
-
+        _recorder = None
+        try:
+            # 若启用录制，则创建录制器，录制目录以启动时间命名
+            if self.model.record_measure == 'True':
+                record_dir = os.path.join(self.model.record_dir, time.strftime('%Y%m%d_%H%M%S'))
+                _recorder = DaqRecorder(record_dir=record_dir,
+                                        layout=get_record_layout(self.model.daq_decode_plans))
+                _recorder.start()
+                self.text_log(f"录制测量数据到{os.path.abspath(record_dir)}", 'done')
+            self.__consume_daq_dto(self.model.display_buffer,
+                                   int(self.model.refresh_operate_measure_time_ms) / 1000,
+                                   _recorder)
+        finally:
+            if _recorder is not None:
+                _recorder.stop()
+                self.text_log(f"录制结束 -> 写入{_recorder.frames}帧({_recorder.chunks}块),"
+                              f"丢弃{_recorder.dropped}帧", 'done')
+
+    def __consume_daq_dto(self,
+                          display_buffer: DisplayBuffer,
+                          publish_period_s: float,
+                          recorder: DaqRecorder | None) -> None:
+        """
+        循环消费DAQ采集引擎环形缓冲区中的daq_dto数据，直至停止测量；
+        以单调时钟判断刷新周期，周期到达时交出待显示的值
+
+        :param display_buffer: 待显示值的交接缓冲区，解码结果写入display_buffer.back
+        :type display_buffer: DisplayBuffer
+        :param publish_period_s: 交出待显示值的周期，单位：秒
+        :type publish_period_s: float
+        :param recorder: 录制器，为None时不录制
+        :type recorder: DaqRecorder | None
+        """
         # 建立局部变量，加快访问速度
-        _q = self.model.q  # 队列
-        _DAQS_CFG = self.model.daqs_cfg  # daq列表信息
-        _DAQS = self.model.daqs  # daq列表
         _obj_measure = self.model.obj_measure  # 测量对象
-        _read_dto_msg = self.model.obj_measure.read_dto_msg  # 读取dto消息方法
-
-        # 各通道可能的pid集合初始值
-        AVAILABLE_PIDS_BY_DAQ: dict[int, set[int]] = {}
-        for daq_number in _DAQS_CFG.keys():
-            first_pid = _DAQS_CFG[daq_number]['first_pid']
-            last_pid = first_pid + _DAQS_CFG[daq_number]['odts_size'] - 1
-            AVAILABLE_PIDS_BY_DAQ[daq_number] = set([x for x in range(first_pid, last_pid + 1)])
-
-        # 清空队列
-        while not _q.empty():
-            _q.get()
+        _daq_acquisition = self.model.obj_measure.daq_acquisition  # DAQ采集引擎
+        _ring = _daq_acquisition.ring  # DAQ采集引擎的环形缓冲区
+        _pids = _ring.pids  # 各槽位pid
+        _payloads = _ring.payloads  # 各槽位负载
+        _mask = _ring.mask  # 槽位掩码
+        _DECODE_PLANS = self.model.daq_decode_plans  # 各pid的解码计划
+        # 批量解码器，安装了NumPy时积压帧数较多则按列批量解码
+        _batch_decoder = DaqBatchDecoder(_DECODE_PLANS) if HAS_NUMPY else None
+        _monotonic = time.monotonic
+        next_publish_time = _monotonic() + publish_period_s  # 下次交出待显示值的时刻
 
         while True:
             # 若停止测量，将线程池的最大线程由3变为1，并退出，后续提交的任务将是排队等待有序执行
             if not _obj_measure.has_measured:  # 点击停止按钮后若成功停止，则在停止任务中会复位此标识
-                if scheduler_recv.state:
-                    scheduler_recv.shutdown(wait=False)  # 关闭定时任务
                 break
 
-            msg_data = _read_dto_msg()  # 读取dto消息数据
-            # 若消息数据为空，则跳过
-            if not msg_data:
-                # print('无数据')
+            # 刷新周期到达，交出待显示的值(只交换缓冲区引用)
+            now = _monotonic()
+            if now >= next_publish_time:
+                display_buffer.publish()
+                next_publish_time += publish_period_s
+                # 若落后超过一个周期，则从当前时刻重新计时，不补发
+                if next_publish_time <= now:
+                    next_publish_time = now + publish_period_s
+
+            # 等待接收线程写入数据，最长等到下次交出待显示值的时刻
+            if not _daq_acquisition.wait(timeout=min(0.1, max(next_publish_time - now, 0.001))):
                 continue
 
-            is_exist_in_pids = False  # 是否存在pid
-            pid = msg_data[0]  # dto的pid
-            odt_data = msg_data[1:]  # odt数据
-
-            for daq_number in _DAQS_CFG.keys():
-                # 若pid不在daq支持的pid范围内，则跳过
-                if pid not in AVAILABLE_PIDS_BY_DAQ[daq_number]:
-                    continue
-                is_exist_in_pids = True
-                break  # 若pid在某个daq的pid范围内，则跳出for循环
-
-            # 若pid不存在，则跳过
-            if not is_exist_in_pids:
+            # 待显示的值{在测量表中的索引:int，(名称:str, 物理值:str)}
+            display_values = display_buffer.back
+            # 批量消费环形缓冲区中的dto消息
+            first_seq, count = _ring.acquire(max_count=_ring.capacity)
+            if recorder is not None:
+                recorder.append_ring(_ring, first_seq, count)
+            if _batch_decoder is not None and count >= BATCH_DECODE_MIN_FRAMES:
+                _batch_decoder.update_display(_batch_decoder.decode_ring(_ring, first_seq, count), display_values)
+                _ring.release(count)
                 continue
-
-            # 添加到显示数据集合
-            element_number = 0  # odt元素索引
-            element_offset = 0  # odt元素偏移量
-            for item in _DAQS[daq_number][pid - _DAQS_CFG[daq_number]['first_pid']]:
-                element_size = item.element_size  # odt元素大小，占用字节数
-                element_data = odt_data[element_offset:element_offset + element_size]  # odt元素数据
-                element_offset += element_size  # 更新odt元素偏移量
-                element_number += 1  # 更新odt元素索引
-
-                # 获取物理值
-                physical_value = self.__get_physical_value(item=item,
-                                                           raw_data=element_data)
-                display_values[item.idx_in_table] = (item.name, physical_value)
+            for seq in range(first_seq, first_seq + count):
+                slot = seq & _mask  # dto所在槽位
+                plan = _DECODE_PLANS.get(_pids[slot])  # dto的pid所对应的解码计划
+                # 若pid不存在，则跳过
+                if plan is None:
+                    continue
+                # 解析odt数据，添加到显示数据集合
+                decode_odt(plan, _payloads, slot * DTO_PAYLOAD_SIZE, display_values)
+            _ring.release(count)
 
     def __display_monitor_value(self) -> None:
         """
-        显示value值到测量表格
+        显示value值到测量表格，只刷新值发生变化的单元格，刷新周期随Tk事件循环的负载调整
         """
-
-        def _disp(iid, value):
-            """
-            显示value值到测量表格数据项
-            """
-            _table_measure.set(iid, _column_names.index('Value'), value)
+        tick_start = time.perf_counter()
 
         # 建立局部变量，加快访问速度
-        _q = self.model.q  # 显示值队列
+        _display_buffer = self.model.display_buffer  # 待显示值的交接缓冲区
         _obj_measure = self.model.obj_measure  # 是否已测量
-        _table_measure = self.__msr_view.table_measure  # 测量表格
-        _table_measure_dict = self.model.table_measure_dict # 测量表格数据项
-        # 获取测量表格中所有的item_id列表
-        _table_measure_iids = _table_measure.get_children()
-        # 获取测量表格列名组成的元组
-        _column_names = tuple(_table_measure["columns"])
+        _table_measure_dict = self.model.table_measure_dict  # 测量表格数据项
+        _pacer = self.__refresh_pacer  # 刷新周期调节器
 
         if not _obj_measure.has_measured:  # 点击停止按钮后若成功停止，则在停止任务中会复位此标识
             self.__msr_view.after_cancel(self.__after_id)
             return
         try:
-            display_values = _q.get_nowait()
-            for idx, (name, value) in display_values.items():
-                item_id = _table_measure_iids[idx]
-                _disp(item_id, value)
-                _table_measure_dict[name].value = value
-        except:
-            pass
-        self.__after_id = self.__msr_view.after(ms=int(self.model.refresh_operate_measure_time_ms),
+            # 取走自上次刷新以来变化的值
+            display_values = _display_buffer.take()
+            if display_values:
+                for name, value in self.__value_renderer.render(display_values).items():
+                    _table_measure_dict[name].value = value
+        except Exception as e:
+            self.text_log(f'发生异常 {e}', 'error')
+            self.text_log(f"{traceback.format_exc()}", 'error')
+        _pacer.update(tick_start)
+        self.__after_id = self.__msr_view.after(ms=_pacer.schedule(),
                                                 func=self.__display_monitor_value)
 
     @staticmethod
     def __iid2idx_in_select_table(iid: str,
                                   table_widget: TkTreeView | ttk.Treeview,
                                   raw_items: list[SelectMeasureItem | SelectCalibrateItem],
+                                  search_index: NameSearchIndex,
                                   ) -> tuple[int, SelectMeasureItem | SelectCalibrateItem]:
         """
         根据选择表格数据项iid查询Name列的值，根据Name追溯填充此表格数据项列表的相应索引及其数据
@@ -2236,6 +2249,8 @@ class MeasureCtrl(object):
         :type table_widget: TkTreeView | ttk.Treeview
         :param raw_items: 填充表格数据项的列表
         :type raw_items: list[SelectMeasureItem | SelectCalibrateItem]
+        :param search_index: 与raw_items对应的名称搜索索引，用于按名称查找索引
+        :type search_index: NameSearchIndex
         :return: (index,数据项对象)
         :rtype: tuple[int, SelectMeasureItem | SelectCalibrateItem]
         :raises TypeError: 不支持raw_items元素的类型
@@ -2243,12 +2258,15 @@ class MeasureCtrl(object):
 
         # 查找更改数据项在原始数据项列表中的索引
         name = table_widget.set(iid, 'Name')
-        idx = [item.name for item in raw_items].index(name)
+        idx = search_index.index(name)
         # 获取最新选中数据项的值
         item_values = table_widget.item(iid, "values")
         # 获取数据项
         if isinstance(raw_items[0], SelectMeasureItem):
-            table_item = SelectMeasureItem(*item_values)
+            # 'is_selected'、'Name'列之后每个速率一列，所选速率列为'√'
+            column_names = tuple(table_widget["columns"])
+            rate = next((column_names[i] for i in range(2, len(column_names)) if item_values[i] == '√'), '')
+            table_item = SelectMeasureItem(is_selected=item_values[0], name=item_values[1], rate=rate)
         elif isinstance(raw_items[0], SelectCalibrateItem):
             table_item = SelectCalibrateItem(*item_values)
         else:
@@ -2359,15 +2377,15 @@ class MeasureCtrl(object):
             msr_item.data = None
 
             # 速率
-            msr_item.rate = selected_item_dict[msr_item.name].is_selected_20ms == '√' and '20ms' or '100ms'
+            msr_item.rate = selected_item_dict[msr_item.name].rate
 
             # odt元素大小
             msr_item.element_size = ASAP2EnumDataType.get_size(msr_item.data_type.name)
             # odt元素地址
             msr_item.element_addr = hex(msr_item.address)
 
-            # daq列表序号,1:20ms;2:100ms
-            msr_item.daq_number = msr_item.rate == '20ms' and 1 or 2
+            # daq列表序号,启动测量时按速率表分配
+            msr_item.daq_number = None
             # odt列表序号
             msr_item.odt_number = None
             # odt元素序号
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Author  : ZYD
+# @Time    : 2026/10/16 下午2:05
+# @version : V1.0.0
+# @function: DAQ列表分配，
+#   按速率表为各速率绑定ECU中可用的daq列表(事件通道+预分频系数)；
+#   以首次适应递减(FFD)算法将测量数据项装入7字节的odt，各odt的空闲容量按堆索引，时间复杂度O(n log n)；
+#   某daq列表的odt不足时，溢出的数据项转入其他仍有空间的daq列表
+
+
+##############################
+# Module imports
+##############################
+import heapq
+from typing import NamedTuple
+
+from .model import ASAP2Measure, DaqRate
+
+
+##############################
+# Constant definitions
+##############################
+ODT_SIZE = 7  # 每个odt可容纳的字节数
+
+
+##############################
+# Type definitions
+##############################
+
+class DaqAllocation(NamedTuple):
+    """
+    daq列表分配结果
+
+    :param daqs: daq列表，{daq_number: {odt_number: [item, ...]}}
+    :type daqs: dict[int, dict[int, list[ASAP2Measure]]]
+    :param spilled: 转入其他daq列表的数据项，[(数据项, 原daq列表序号, 转入的daq列表序号), ...]
+    :type spilled: list[tuple[ASAP2Measure, int, int]]
+    :param unplaced: 所有daq列表均无法容纳的数据项
+    :type unplaced: list[ASAP2Measure]
+    """
+    daqs: dict[int, dict[int, list[ASAP2Measure]]]
+    spilled: list[tuple[ASAP2Measure, int, int]]
+    unplaced: list[ASAP2Measure]
+
+    def efficiency(self, daq_number: int) -> float:
+        """
+        daq列表的填充率，即已用字节数 / (odt数 * 7)
+
+        :param daq_number: daq列表序号
+        :type daq_number: int
+        :return: 填充率，无odt时为0
+        :rtype: float
+        """
+        odts = self.daqs.get(daq_number, {})
+        if not odts:
+            return 0.0
+        used = sum(item.element_size for odt in odts.values() for item in odt)
+        return used / (len(odts) * ODT_SIZE)
+
+
+##############################
+# Allocator API function declarations
+##############################
+
+class OdtPacker(object):
+    """
+    单个daq列表的odt装箱器，首次适应：放入序号最小的、空闲容量足够的odt，均无法放入时新建odt；
+    按空闲容量(1~7)分别以最小堆保存odt序号，每次查找只需比较至多7个堆顶
+
+    :param max_odts: odt数上限
+    :type max_odts: int
+    """
+
+    def __init__(self, max_odts: int) -> None:
+        """
+        构造函数
+        """
+        self.max_odts = max_odts  # odt数上限
+        self.odts: list[list[ASAP2Measure]] = []  # odt列表
+        self.__free_heaps: list[list[int]] = [[] for _ in range(ODT_SIZE + 1)]  # 各空闲容量的odt序号
+
+    def add(self, item: ASAP2Measure) -> bool:
+        """
+        放入一个数据项
+
+        :param item: 测量数据项
+        :type item: ASAP2Measure
+        :return: odt数已达上限且无法放入时返回False
+        :rtype: bool
+        """
+        size = item.element_size
+        heaps = self.__free_heaps
+        best_free = 0
+        for free in range(size, ODT_SIZE + 1):
+            if heaps[free] and (not best_free or heaps[free][0] < heaps[best_free][0]):
+                best_free = free
+        if best_free:
+            odt_number = heapq.heappop(heaps[best_free])
+            free = best_free - size
+        elif len(self.odts) < self.max_odts:
+            odt_number = len(self.odts)
+            self.odts.append([])
+            free = ODT_SIZE - size
+        else:
+            return False
+        self.odts[odt_number].append(item)
+        if free:
+            heapq.heappush(heaps[free], odt_number)
+        return True
+
+
+def bind_daq_rates(rates: list[DaqRate],
+                   daqs_cfg: dict[int, dict[str, int]]) -> tuple[dict[str, int], dict[int, dict[str, int]]]:
+    """
+    为各速率绑定daq列表：优先使用速率指定的daq列表，其余速率按速率表顺序依次使用序号最小的空闲daq列表
+
+    :param rates: 需要使用的速率
+    :type rates: list[DaqRate]
+    :param daqs_cfg: ECU中可用的daq列表配置，{daq_number: {first_pid: int, odts_size: int}}
+    :type daqs_cfg: dict[int, dict[str, int]]
+    :return: (各速率使用的daq列表{速率名称: daq_number},
+        已绑定的daq列表配置{daq_number: {first_pid: int, odts_size: int, event_channel: int, prescaler: int}})
+    :rtype: tuple[dict[str, int], dict[int, dict[str, int]]]
+    :raises ValueError: 可用的daq列表少于速率数
+    """
+    free = sorted(daqs_cfg)
+    rate_numbers: dict[str, int] = {}
+    for rate in rates:
+        if rate.daq_number in free:
+            rate_numbers[rate.name] = rate.daq_number
+            free.remove(rate.daq_number)
+    for rate in rates:
+        if rate.name in rate_numbers:
+            continue
+        if not free:
+            msg = f"ECU中可用的daq列表{sorted(daqs_cfg)}少于所需的速率数{len(rates)}"
+            raise ValueError(msg)
+        rate_numbers[rate.name] = free.pop(0)
+
+    bound_cfg: dict[int, dict[str, int]] = {}
+    for rate in rates:
+        daq_number = rate_numbers[rate.name]
+        bound_cfg[daq_number] = dict(daqs_cfg[daq_number],
+                                     event_channel=rate.event_channel,
+                                     prescaler=rate.prescaler)
+    return rate_numbers, bound_cfg
+
+
+def allocate_daqs(groups: dict[int, list[ASAP2Measure]],
+                  daqs_cfg: dict[int, dict[str, int]]) -> DaqAllocation:
+    """
+    将按daq列表分组的测量数据项分配到各odt；
+    各组按元素大小递减依次装箱，超出odt列表大小的数据项按daq列表序号顺序转入其他仍有空间的daq列表
+
+    :param groups: 按daq列表分组的测量数据项，{daq_number: [item, ...]}
+    :type groups: dict[int, list[ASAP2Measure]]
+    :param daqs_cfg: daq配置，{daq_number: {first_pid: int, odts_size: int}}
+    :type daqs_cfg: dict[int, dict[str, int]]
+    :return: 分配结果
+    :rtype: DaqAllocation
+    :raises ValueError: 数据项的元素大小属性值不是1,2,4中的一个；daq列表不存在
+    """
+    for daq_number, group in groups.items():
+        if daq_number not in daqs_cfg:
+            msg = f'daq列表{daq_number}不存在'
+            raise ValueError(msg)
+        for item in group:
+            if item.element_size not in (1, 2, 4):
+                msg = f'数据项{item.name}的element_size不在1、2、4中'
+                raise ValueError(msg)
+
+    packers = {daq_number: OdtPacker(cfg['odts_size']) for daq_number, cfg in sorted(daqs_cfg.items())}
+    overflow: list[tuple[ASAP2Measure, int]] = []
+    for daq_number, group in sorted(groups.items()):
+        packer = packers[daq_number]
+        for item in sorted(group, key=lambda x: x.element_size, reverse=True):
+            if not packer.add(item):
+                overflow.append((item, daq_number))
+
+    overflow.sort(key=lambda x: x[0].element_size, reverse=True)
+    spilled: list[tuple[ASAP2Measure, int, int]] = []
+    unplaced: list[ASAP2Measure] = []
+    for item, daq_number in overflow:
+        for other_number, packer in packers.items():
+            if other_number != daq_number and packer.add(item):
+                spilled.append((item, daq_number, other_number))
+                break
+        else:
+            unplaced.append(item)
+
+    daqs = {daq_number: dict(enumerate(packer.odts)) for daq_number, packer in packers.items() if packer.odts}
+    return DaqAllocation(daqs=daqs, spilled=spilled, unplaced=unplaced)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Author  : ZYD
+# @Time    : 2026/10/16 上午10:40
+# @version : V1.0.0
+# @function: DAQ批量解码(可选，依赖NumPy)，
+#   按odt布局生成大端结构化dtype，将同一pid的多帧dto一次性解释为结构化数组，
+#   线性转换按列整体计算，用于高速率长时间采集及离线重新解码录制的原始数据
+
+
+##############################
+# Module imports
+##############################
+from typing import NamedTuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy为可选依赖，未安装时不启用批量解码
+    np = None
+
+from eco.eco_daq import DTO_PAYLOAD_SIZE, NUMPY_FORMATS, DaqRingBuffer
+
+from .daq_decode import OdtDecodePlan, PARSE_ERROR
+
+
+##############################
+# Constant definitions
+##############################
+HAS_NUMPY = np is not None  # 是否可使用批量解码
+BATCH_DECODE_MIN_FRAMES = 64  # 待解码帧数不少于此值时才使用批量解码
+
+
+##############################
+# Type definitions
+##############################
+
+class DaqBatch(NamedTuple):
+    """
+    同一pid的一批dto解码结果
+
+    :param timestamps: 各帧的接收时间戳
+    :type timestamps: np.ndarray
+    :param values: 各元素的值，{名称: 列}，线性转换类型为物理值(float64)，映射类型为原始值
+    :type values: dict[str, np.ndarray]
+    """
+    timestamps: 'np.ndarray'
+    values: dict[str, 'np.ndarray']
+
+
+##############################
+# Batch decode API function declarations
+##############################
+
+class DaqBatchDecoder(object):
+    """
+    DAQ批量解码器，由各pid的解码计划生成对应的结构化dtype
+
+    :param plans: 各pid的解码计划，{pid: OdtDecodePlan}
+    :type plans: dict[int, OdtDecodePlan]
+    :raises RuntimeError: 未安装NumPy
+    """
+
+    def __init__(self, plans: dict[int, OdtDecodePlan]) -> None:
+        """
+        构造函数
+        """
+        if not HAS_NUMPY:
+            msg = '批量解码需要安装NumPy'
+            raise RuntimeError(msg)
+        self.plans = plans  # 各pid的解码计划
+        # 各pid对应的结构化dtype，每条记录为一帧dto的负载
+        self.dtypes: dict[int, np.dtype] = {pid: self.get_dtype(plan) for pid, plan in plans.items()}
+
+    @staticmethod
+    def get_dtype(plan: OdtDecodePlan) -> 'np.dtype':
+        """
+        由odt的解码计划生成结构化dtype，无法解析的元素不生成字段
+
+        :param plan: odt的解码计划
+        :type plan: OdtDecodePlan
+        :return: 结构化dtype，记录长度为dto负载长度
+        :rtype: np.dtype
+        """
+        return np.dtype({'names': [element.name for element in plan.elements],
+                         'formats': [NUMPY_FORMATS[element.fmt] for element in plan.elements],
+                         'offsets': [element.position for element in plan.elements],
+                         'itemsize': DTO_PAYLOAD_SIZE})
+
+    def decode_frames(self,
+                      pids: bytes | bytearray | memoryview,
+                      payloads: bytes | bytearray | memoryview,
+                      timestamps: bytes | bytearray | memoryview | None = None) -> dict[int, DaqBatch]:
+        """
+        批量解码连续存放的多帧dto，各帧按pid分组
+
+        :param pids: 各帧的pid，N字节
+        :type pids: bytes | bytearray | memoryview
+        :param payloads: 各帧的负载，N * 7字节
+        :type payloads: bytes | bytearray | memoryview
+        :param timestamps: 各帧的接收时间戳，N个double，为None时时间戳为空
+        :type timestamps: bytes | bytearray | memoryview | None
+        :return: 各pid的解码结果，{pid: DaqBatch}，不存在解码计划的pid被忽略
+        :rtype: dict[int, DaqBatch]
+        """
+        pid_arr = np.frombuffer(pids, dtype=np.uint8)
+        ts_arr = np.frombuffer(timestamps, dtype=np.float64) if timestamps is not None else None
+        batches: dict[int, DaqBatch] = {}
+        for pid in np.unique(pid_arr).tolist():
+            dtype = self.dtypes.get(pid)
+            if dtype is None:
+                continue
+            mask = pid_arr == pid
+            records = np.frombuffer(payloads, dtype=dtype, count=len(pid_arr))[mask]
+            values = {}
+            for element in self.plans[pid].elements:
+                column = records[element.name]
+                if element.vtab is None:
+                    # 线性转换按列整体计算
+                    column = (column.astype(np.float64) - element.offset) / element.divisor
+                values[element.name] = column
+            batches[pid] = DaqBatch(timestamps=ts_arr[mask] if ts_arr is not None else np.empty(0),
+                                    values=values)
+        return batches
+
+    def decode_ring(self, ring: DaqRingBuffer, first_seq: int, count: int) -> dict[int, DaqBatch]:
+        """
+        批量解码环形缓冲区中的多帧dto(零拷贝读取)，回绕时分两段解码后拼接
+
+        :param ring: 环形缓冲区
+        :type ring: DaqRingBuffer
+        :param first_seq: 首帧序号
+        :type first_seq: int
+        :param count: 帧数
+        :type count: int
+        :return: 各pid的解码结果，{pid: DaqBatch}
+        :rtype: dict[int, DaqBatch]
+        """
+        start = first_seq & ring.mask
+        spans = [(start, min(count, ring.capacity - start))]
+        if spans[0][1] < count:
+            spans.append((0, count - spans[0][1]))
+        parts = [self.decode_frames(memoryview(ring.pids)[slot:slot + n],
+                                    ring.payloads_view[slot * DTO_PAYLOAD_SIZE:(slot + n) * DTO_PAYLOAD_SIZE],
+                                    memoryview(ring.timestamps)[slot:slot + n])
+                 for slot, n in spans]
+        if len(parts) == 1:
+            return parts[0]
+        batches = parts[0]
+        for pid, batch in parts[1].items():
+            if pid not in batches:
+                batches[pid] = batch
+                continue
+            head = batches[pid]
+            batches[pid] = DaqBatch(timestamps=np.concatenate((head.timestamps, batch.timestamps)),
+                                    values={name: np.concatenate((column, batch.values[name]))
+                                            for name, column in head.values.items()})
+        return batches
+
+    def update_display(self, batches: dict[int, DaqBatch], display_values: dict[int, tuple[str, str]]) -> None:
+        """
+        以各pid最后一帧的值更新待显示的值
+
+        :param batches: 各pid的解码结果
+        :type batches: dict[int, DaqBatch]
+        :param display_values: 待显示的值，{在测量表中的索引: (名称, 物理值)}
+        :type display_values: dict[int, tuple[str, str]]
+        """
+        for pid, batch in batches.items():
+            plan = self.plans[pid]
+            for element in plan.elements:
+                column = batch.values[element.name]
+                if not len(column):
+                    continue
+                vtab = element.vtab
+                if vtab is not None:
+                    value = vtab.get(int(column[-1]), PARSE_ERROR)
+                else:
+                    value = float(column[-1])
+                    value = format(value, element.format_spec).strip() if element.format_spec else str(value)
+                display_values[element.idx_in_table] = (element.name, value)
+            for element in plan.failed:
+                display_values[element.idx_in_table] = (element.name, PARSE_ERROR)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Author  : ZYD
+# @Time    : 2026/10/16 上午9:12
+# @version : V1.0.0
+# @function: DAQ解码计划，
+#   启动测量时为每个pid预编译一个覆盖odt全部元素的struct.Struct以及各元素的(除数, 偏移, 映射表)，
+#   解码一帧dto只需一次unpack_from和若干次减法、除法运算
+
+
+##############################
+# Module imports
+##############################
+from struct import Struct
+from typing import NamedTuple
+
+from utils import pad_hex
+
+from .model import ASAP2Measure, ASAP2EnumDataType, ASAP2EnumConversionType
+
+
+##############################
+# Constant definitions
+##############################
+PARSE_ERROR = '!ParseError'  # 无法解析时显示的物理值
+
+# 数据类型对应的struct格式字符(大端)
+STRUCT_FORMATS: dict[ASAP2EnumDataType, str] = {
+    ASAP2EnumDataType.UBYTE: 'B',
+    ASAP2EnumDataType.SBYTE: 'b',
+    ASAP2EnumDataType.UWORD: 'H',
+    ASAP2EnumDataType.SWORD: 'h',
+    ASAP2EnumDataType.ULONG: 'I',
+    ASAP2EnumDataType.SLONG: 'i',
+    ASAP2EnumDataType.FLOAT32_IEEE: 'f',
+}
+
+
+##############################
+# Type definitions
+##############################
+
+class ElementDecodePlan(NamedTuple):
+    """
+    odt元素的解码参数，物理值 = (原始值 - offset) / divisor，与标定界面的物理值计算方式一致
+
+    :param idx_in_table: 在测量表格中的索引
+    :type idx_in_table: int
+    :param name: 测量对象名称
+    :type name: str
+    :param divisor: 除数，线性转换f(x) = B*x + C的B
+    :type divisor: float
+    :param offset: 偏移，线性转换f(x) = B*x + C的C
+    :type offset: float
+    :param vtab: 映射表，{原始值: 显示名称}，非映射类型为None
+    :type vtab: dict[int, str] | None
+    :param format_spec: 物理值的格式说明，例如：' <8.2f'，为空时不格式化
+    :type format_spec: str
+    :param error: 无法解析时的原因，可解析时为空
+    :type error: str
+    :param fmt: struct格式字符，例如：'H'
+    :type fmt: str
+    :param position: 元素在odt数据中的字节偏移
+    :type position: int
+    """
+    idx_in_table: int
+    name: str
+    divisor: float
+    offset: float
+    vtab: dict[int, str] | None
+    format_spec: str
+    error: str
+    fmt: str
+    position: int
+
+
+class OdtDecodePlan(NamedTuple):
+    """
+    odt的解码计划
+
+    :param codec: 覆盖odt全部元素的struct对象，无法解析的元素以填充字节跳过
+    :type codec: Struct
+    :param elements: 可解析元素的解码参数，与codec解出的值一一对应
+    :type elements: tuple[ElementDecodePlan, ...]
+    :param failed: 无法解析元素的解码参数，其物理值固定显示为PARSE_ERROR
+    :type failed: tuple[ElementDecodePlan, ...]
+    """
+    codec: Struct
+    elements: tuple[ElementDecodePlan, ...]
+    failed: tuple[ElementDecodePlan, ...]
+
+
+##############################
+# Function definitions
+##############################
+
+def build_element_plan(item: ASAP2Measure, position: int = 0) -> tuple[str, ElementDecodePlan]:
+    """
+    预编译单个测量对象的解码参数
+
+    :param item: 测量对象
+    :type item: ASAP2Measure
+    :param position: 元素在odt数据中的字节偏移
+    :type position: int
+    :return: (struct格式字符, 解码参数)
+    :rtype: tuple[str, ElementDecodePlan]
+    """
+    fmt = STRUCT_FORMATS.get(item.data_type)
+    error = ''
+    divisor, offset, vtab, format_spec = 1.0, 0.0, None, ''
+    if fmt is None or Struct('>' + fmt).size != item.element_size:
+        error = f"无法解析{item.name}的物理值,尚未支持类型{item.data_type}"
+    else:
+        conversion_type = item.conversion.conversion_type
+        # 若是转换类型为映射表，预先生成各原始值的显示名称
+        if conversion_type == ASAP2EnumConversionType.TAB_VERB:
+            size = ASAP2EnumDataType.get_size(item.data_type.name)
+            vtab = {raw_value: ''.join([name, ':', pad_hex(hex(raw_value), size)])
+                    for raw_value, name in item.conversion.compu_tab_ref.read_dict.items()}
+        # 若是转换类型为普通数值(线性转换)
+        elif conversion_type == ASAP2EnumConversionType.RAT_FUNC:
+            # raw_value = f(physical_value);
+            # f(x) = B*x + C;
+            # physical_value = (raw_value - C) / B
+            coeffs = item.conversion.coeffs
+            divisor = coeffs[1]
+            offset = coeffs[2]
+            fm = item.conversion.format[1:]  # 去掉%,%8.2->8.2
+            if fm:
+                format_spec = f' <{fm}f'
+        else:
+            error = f"无法解析{item.name}的物理值,尚未支持类型{conversion_type}"
+    if error:
+        fmt = f'{item.element_size}x'  # 以填充字节跳过无法解析的元素
+    return fmt, ElementDecodePlan(idx_in_table=item.idx_in_table,
+                                  name=item.name,
+                                  divisor=divisor,
+                                  offset=offset,
+                                  vtab=vtab,
+                                  format_spec=format_spec,
+                                  error=error,
+                                  fmt=fmt,
+                                  position=position)
+
+
+def build_decode_plan(daqs: dict[int, dict[int, list[ASAP2Measure]]],
+                      daqs_cfg: dict[int, dict[str, int]]) -> dict[int, OdtDecodePlan]:
+    """
+    按daq列表预编译各pid的解码计划，在启动测量时调用一次
+
+    :param daqs: daq列表，{daq_number: {odt_number: [item, ...]}}
+    :type daqs: dict[int, dict[int, list[ASAP2Measure]]]
+    :param daqs_cfg: daq配置，{daq_number: {first_pid: int, odts_size: int}}
+    :type daqs_cfg: dict[int, dict[str, int]]
+    :return: 各pid的解码计划，{pid: OdtDecodePlan}
+    :rtype: dict[int, OdtDecodePlan]
+    """
+    plans: dict[int, OdtDecodePlan] = {}
+    for daq_number, odts in daqs.items():
+        first_pid = daqs_cfg[daq_number]['first_pid']
+        for odt_number, odt in odts.items():
+            fmts = []
+            elements = []
+            failed = []
+            position = 0
+            for item in odt:
+                fmt, element = build_element_plan(item, position)
+                fmts.append(fmt)
+                position += item.element_size
+                (failed if element.error else elements).append(element)
+            plans[first_pid + odt_number] = OdtDecodePlan(codec=Struct('>' + ''.join(fmts)),
+                                                          elements=tuple(elements),
+                                                          failed=tuple(failed))
+    return plans
+
+
+def decode_odt(plan: OdtDecodePlan,
+               buffer: bytes | bytearray | memoryview,
+               offset: int,
+               display_values: dict[int, tuple[str, str]]) -> None:
+    """
+    按解码计划解析一帧odt数据，将各元素的物理值写入待显示的值
+
+    :param plan: odt的解码计划
+    :type plan: OdtDecodePlan
+    :param buffer: 包含odt数据的缓冲区
+    :type buffer: bytes | bytearray | memoryview
+    :param offset: odt数据在缓冲区中的偏移
+    :type offset: int
+    :param display_values: 待显示的值，{在测量表中的索引: (名称, 物理值)}
+    :type display_values: dict[int, tuple[str, str]]
+    """
+    for element, raw_value in zip(plan.elements, plan.codec.unpack_from(buffer, offset)):
+        vtab = element.vtab
+        if vtab is not None:
+            value = vtab.get(raw_value, PARSE_ERROR)
+        else:
+            value = (raw_value - element.offset) / element.divisor
+            value = format(value, element.format_spec).strip() if element.format_spec else str(value)
+        display_values[element.idx_in_table] = (element.name, value)
+    for element in plan.failed:
+        display_values[element.idx_in_table] = (element.name, PARSE_ERROR)
+
+
+def get_record_layout(plans: dict[int, OdtDecodePlan]) -> dict[str, list[dict]]:
+    """
+    由各pid的解码计划生成可序列化为json的odt布局，随录制数据保存，用于离线解码
+
+    :param plans: 各pid的解码计划，{pid: OdtDecodePlan}
+    :type plans: dict[int, OdtDecodePlan]
+    :return: odt布局，{pid(10进制字符串): [{name, fmt, position, divisor, offset, format_spec, vtab}, ...]}
+    :rtype: dict[str, list[dict]]
+    """
+    return {str(pid): [{'name': element.name,
+                        'fmt': element.fmt,
+                        'position': element.position,
+                        'divisor': element.divisor,
+                        'offset': element.offset,
+                        'format_spec': element.format_spec,
+                        'vtab': ({str(raw_value): text for raw_value, text in element.vtab.items()}
+                                 if element.vtab is not None else None)}
+                       for element in plan.elements]
+            for pid, plan in plans.items()}
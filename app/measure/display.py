@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Author  : ZYD
+# @Time    : 2026/10/16 下午4:20
+# @version : V1.0.0
+# @function: 测量表格显示层，
+#   解码线程与Tk线程之间以可复用的双缓冲交接变化的值，交接时只交换引用，不复制；
+#   缓存表格数据项iid及列索引，记录每行上次显示的值，只对值发生变化的单元格调用Treeview.set；
+#   按Tk事件循环的负载(定时器延迟+刷新耗时)自适应调整刷新周期
+
+
+##############################
+# Module imports
+##############################
+from collections import deque
+import time
+
+from tkui.tktypes import ttk, TkTreeView
+
+
+##############################
+# Constant definitions
+##############################
+REFRESH_MAX_FACTOR = 8  # 刷新周期上限相对于设定值的倍数
+REFRESH_BUSY_LOAD = 0.5  # 负载高于此值时延长刷新周期
+REFRESH_IDLE_LOAD = 0.2  # 负载低于此值时缩短刷新周期(不小于设定值)
+REFRESH_GROW_RATIO = 1.5  # 延长刷新周期的倍率
+REFRESH_SHRINK_RATIO = 0.8  # 缩短刷新周期的倍率
+HANDOFF_MAX_PENDING = 4  # 待显示方取走的缓冲区数上限，达到上限后生产方继续在当前缓冲区中累积
+
+
+##############################
+# Display API function declarations
+##############################
+
+class DisplayBuffer(object):
+    """
+    待显示值的单生产者单消费者交接缓冲区，{在测量表中的索引: (名称, 物理值)}；
+    生产方(解码线程)向back写入变化的值，按刷新周期调用publish将back整体交出并换上一个空闲缓冲区；
+    消费方(Tk线程)调用take取走所有已交出的缓冲区，合并其中变化的值后清空缓冲区并归还；
+    交接通过deque的原子操作完成，无需加锁，缓冲区循环复用，每次交接的开销只与变化的值的个数有关
+    """
+
+    def __init__(self) -> None:
+        """
+        构造函数
+        """
+        self.back: dict[int, tuple[str, str]] = {}  # 生产方正在写入的缓冲区
+        self.published = 0  # 已交出的次数
+        self.__pending: deque[dict[int, tuple[str, str]]] = deque()  # 已交出、待消费方取走的缓冲区
+        self.__free: deque[dict[int, tuple[str, str]]] = deque()  # 消费方归还的空闲缓冲区
+        self.__merged: dict[int, tuple[str, str]] = {}  # 消费方合并后的变化的值
+
+    def publish(self) -> bool:
+        """
+        交出正在写入的缓冲区(生产方调用)，无变化的值或待取走的缓冲区已达上限时不交出
+
+        :return: 是否已交出
+        :rtype: bool
+        """
+        if not self.back or len(self.__pending) >= HANDOFF_MAX_PENDING:
+            return False
+        self.__pending.append(self.back)
+        self.back = self.__free.popleft() if self.__free else {}
+        self.published += 1
+        return True
+
+    def take(self) -> dict[int, tuple[str, str]]:
+        """
+        取走所有已交出的缓冲区(消费方调用)，按交出顺序合并，后交出的值覆盖先交出的值；
+        返回的字典在下次调用take时被复用
+
+        :return: 自上次取走以来变化的值，{在测量表中的索引: (名称, 物理值)}
+        :rtype: dict[int, tuple[str, str]]
+        """
+        merged = self.__merged
+        merged.clear()
+        pending = self.__pending
+        while pending:
+            buffer = pending.popleft()
+            merged.update(buffer)
+            buffer.clear()
+            self.__free.append(buffer)
+        return merged
+
+
+class TableValueRenderer(object):
+    """
+    表格数值列渲染器，只刷新值发生变化的单元格；
+    表格数据项被重建后须调用reset重新缓存iid
+
+    :param table: 表格控件
+    :type table: TkTreeView | ttk.Treeview
+    :param column: 数值列的列名
+    :type column: str
+    """
+
+    def __init__(self, table: TkTreeView | ttk.Treeview, column: str = 'Value') -> None:
+        """
+        构造函数
+        """
+        self.table = table  # 表格控件
+        self.column = column  # 数值列的列名
+        self.__column_index = 0  # 数值列的索引
+        self.__iids: tuple[str, ...] = ()  # 表格中所有数据项的iid，按行排列
+        self.__rendered: dict[int, str] = {}  # 各行上次显示的值，{行索引: 值}
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        重新缓存表格数据项iid及列索引，并清除已显示值的记录
+
+        """
+        self.__column_index = tuple(self.table["columns"]).index(self.column)
+        self.__iids = self.table.get_children()
+        self.__rendered.clear()
+
+    def render(self, values: dict[int, tuple[str, str]]) -> dict[str, str]:
+        """
+        显示各行的值，跳过与上次显示相同的值
+
+        :param values: 待显示的值，{行索引: (名称, 值)}
+        :type values: dict[int, tuple[str, str]]
+        :return: 本次实际刷新的值，{名称: 值}
+        :rtype: dict[str, str]
+        """
+        # 建立局部变量，加快访问速度
+        table_set = self.table.set
+        column_index = self.__column_index
+        iids = self.__iids
+        rendered = self.__rendered
+
+        changed: dict[str, str] = {}
+        for idx, (name, value) in values.items():
+            if rendered.get(idx) == value or idx >= len(iids):
+                continue
+            table_set(iids[idx], column_index, value)
+            rendered[idx] = value
+            changed[name] = value
+        return changed
+
+
+class RefreshPacer(object):
+    """
+    刷新周期调节器，以(定时器实际延迟 + 刷新耗时) / 刷新周期作为Tk事件循环的负载：
+    负载过高时按倍率延长刷新周期(不超过设定值的REFRESH_MAX_FACTOR倍)，负载较低时逐步恢复到设定值
+
+    :param interval_ms: 设定的刷新周期，单位：毫秒
+    :type interval_ms: int
+    """
+
+    def __init__(self, interval_ms: int) -> None:
+        """
+        构造函数
+        """
+        self.min_interval_ms = max(int(interval_ms), 1)  # 刷新周期下限，即设定值
+        self.max_interval_ms = self.min_interval_ms * REFRESH_MAX_FACTOR  # 刷新周期上限
+        self.interval_ms = self.min_interval_ms  # 当前刷新周期
+        self.load = 0.0  # 最近一次刷新时的负载
+        self.__due_time = 0.0  # 下次刷新的预期时间(time.perf_counter)
+
+    def schedule(self) -> int:
+        """
+        记录下次刷新的预期时间，返回当前刷新周期，用于Tk的after
+
+        :return: 刷新周期，单位：毫秒
+        :rtype: int
+        """
+        self.__due_time = time.perf_counter() + self.interval_ms / 1000
+        return self.interval_ms
+
+    def update(self, tick_start: float) -> None:
+        """
+        根据本次刷新的定时器延迟和耗时更新刷新周期，在刷新结束时调用
+
+        :param tick_start: 本次刷新开始的时间(time.perf_counter)
+        :type tick_start: float
+        """
+        lateness = max(tick_start - self.__due_time, 0.0) if self.__due_time else 0.0
+        cost = time.perf_counter() - tick_start
+        self.load = (lateness + cost) * 1000 / self.interval_ms
+        if self.load > REFRESH_BUSY_LOAD:
+            self.interval_ms = min(int(self.interval_ms * REFRESH_GROW_RATIO) + 1, self.max_interval_ms)
+        elif self.load < REFRESH_IDLE_LOAD:
+            self.interval_ms = max(int(self.interval_ms * REFRESH_SHRINK_RATIO), self.min_interval_ms)
@@ -9,9 +9,9 @@
 ##############################
 # Module imports
 ##############################
+from collections.abc import Mapping
 from dataclasses import dataclass
 from enum import Enum
-from queue import Queue
 from tkinter import StringVar
 
 from xba2l.a2l_lib import Module, MemorySegment, Measurement, Characteristic, \
@@ -20,6 +20,9 @@ from xba2l.a2l_lib import Module, MemorySegment, Measurement, Characteristic, \
 from eco import eco_pccp
 from srecord import Srecord
 
+from .display import DisplayBuffer
+from .search import NameSearchIndex
+
 
 ##############################
 # Constant definitions
@@ -595,7 +598,7 @@ class ASAP2Measure(object):
         rate (str): 速率
         element_size (int): odt元素大小
         element_addr (str): odt元素地址
-        daq_number (int): daq列表序号,1:20ms;2:100ms
+        daq_number (int): daq列表序号,启动测量时按速率表分配
         odt_number (int): odt列表序号
         element_number (int): odt元素序号
         pid (str): odt列表对应的pid
@@ -622,7 +625,7 @@ class ASAP2Measure(object):
     element_size: int | None = None  # odt元素大小
     element_addr: str | None = None  # odt元素地址
 
-    daq_number: int | None = None  # daq列表序号,1:20ms;2:100ms
+    daq_number: int | None = None  # daq列表序号,启动测量时按速率表分配
     odt_number: int | None = None  # odt列表序号
     element_number: int | None = None  # odt元素序号
 
@@ -644,15 +647,32 @@ class SelectMeasureItem(object):
     :type is_selected: str
     :param name: 测量对象名称
     :type name: str
-    :param is_selected_20ms: 20ms刷新通道选择标识，'□'-未选择；'√'-选择
-    :type is_selected_20ms: str
-    :param is_selected_100ms: 100ms刷新通道选择标识，'□'或'√'
-    :type is_selected_100ms: str
+    :param rate: 所选速率的名称(速率表DaqRate.name)，''-未选择；表格中每个速率一列，所选速率列显示'√'，其余显示'□'
+    :type rate: str
     """
     is_selected: str = ''
     name: str = ''
-    is_selected_20ms: str = '□'
-    is_selected_100ms: str = '□'
+    rate: str = ''
+
+
+@dataclass(slots=True)
+class DaqRate(object):
+    """
+    速率表中的一项，每个速率占用一个daq列表，由ECU按事件通道及预分频系数采样
+
+    :param name: 速率名称，例如：'20ms'
+    :type name: str
+    :param event_channel: 事件通道
+    :type event_channel: int
+    :param prescaler: 预分频系数，每prescaler次事件传输一次
+    :type prescaler: int
+    :param daq_number: 优先使用的daq列表序号，为None或该列表不可用时使用空闲的daq列表
+    :type daq_number: int | None
+    """
+    name: str = ''
+    event_channel: int = 0
+    prescaler: int = 1
+    daq_number: int | None = None
 
 
 @dataclass(slots=True)
@@ -686,6 +706,10 @@ class MeasureModel(object):
         self.opened_a2l_filepath = ''  # 存储打开的A2L文件路径
         self.table_history_filepath: str = 'history.dat'  # 测量标定表格历史数据保存的文件路径
         self.refresh_operate_measure_time_ms = '100'  # 存储测量表格数值刷新时间，默认100ms
+        self.record_measure = 'False'  # 存储是否在测量时录制原始数据，默认不录制
+        self.record_dir = 'records'  # 存储测量录制数据的保存目录
+        self.a2l_cache_dir = 'a2l_cache'  # 存储A2L工程缓存目录，为空时不使用缓存
+        self.upload_verify_algorithm = ''  # 存储从RAM上传标定数据后ECU以BUILD_CHKSUM校验所用的算法，例如'CRC-16/IBM-3740'，为空时不校验
         self.history_epk = ''  # 存储历史数据epk
         self.table_measure_dict: dict[str, ASAP2Measure] = {}  # 存储测量表格(VALUE)当前显示的数据项内容
         self.table_calibrate_dict: dict[str, ASAP2Calibrate] = {} # 存储标定表格当前显示的数据项内容
@@ -699,30 +723,40 @@ class MeasureModel(object):
         self.ecu_epk = ''  # 存储ECU内存中的epk
         self.pgm_epk = ''  # 存储PGM文件解析后的epk
 
-        self.a2l_module: Module | None = None  # 存储A2L文件解析后的模块对象
+        self.a2l_module: Module | None = None  # 存储A2L文件解析后的模块对象，从缓存加载时为None
         self.a2l_epk = ''  # 存储A2L文件解析后的epk
 
         self.a2l_memory_code: MemorySegment | None = None  # 存储A2L文件解析后的代码段内存段对象
         self.a2l_memory_epk_data: MemorySegment | None = None  # 存储A2L文件解析后的epk数据内存段对象
         self.a2l_memory_ram_cal: MemorySegment | None = None  # 存储A2L文件解析后的ram标定内存段对象
         self.a2l_memory_rom_cal: MemorySegment | None = None  # 存储A2L文件解析后的rom标定内存段对象
-        self.a2l_measurement_dict: dict[str, Measurement] = {}  # 存储A2L文件解析后的测量对象列表
-        self.a2l_calibration_dict: dict[str, Characteristic] = {}  # 存储A2L文件解析后的标定(可调整)对象字典
+        self.a2l_measurement_dict: Mapping[str, Measurement] = {}  # 存储A2L文件解析后的测量对象列表
+        self.a2l_calibration_dict: Mapping[str, Characteristic] = {}  # 存储A2L文件解析后的标定(可调整)对象字典
 
-        self.a2l_record_layout_dict: dict[str, RecordLayout] = {}  # 存储A2L文件解析后的标定变量内存布局
+        self.a2l_record_layout_dict: Mapping[str, RecordLayout] = {}  # 存储A2L文件解析后的标定变量内存布局
         self.a2l_conversion_dict: dict[str, CompuMethod] = {}  # 存储A2L文件解析后的转换方法
         self.a2l_compu_vtab_dict: dict[str, CompuVtab] = {}  # 存储A2L文件解析后的转换表
-        self.a2l_axis_pts_dict: dict[str, list[AxisPts]] = {}  # 存储A2L文件解析后的标定变量的轴类型参考，被一维表、二维表等引用
+        self.a2l_axis_pts_dict: Mapping[str, list[AxisPts]] = {}  # 存储A2L文件解析后的标定变量的轴类型参考，被一维表、二维表等引用
 
         # 下面列表中元素实际指向的内容是相同的，即filter_items由raw_items经浅拷贝得到
         self.table_select_measure_raw_items: list[SelectMeasureItem] = []  # 存储测量选择数据项表格所有的数据项内容
         self.table_select_measure_filter_items: list[SelectMeasureItem] = []  # 存储测量选择表格当前显示的数据项内容（筛选后的数据项）
         self.table_select_calibrate_raw_items: list[SelectCalibrateItem] = []  # 存储选择标定数据项表格所有的数据项内容
         self.table_select_calibrate_filter_items: list[SelectCalibrateItem] = []  # 存储选择表格当前显示的数据项内容（筛选后的数据项）
-
-        # 存储daq列表配置字典{daq通道：{'first_pid':int,'odts_size':int},}
-        # 例如{1: {'first_pid': 0x3c, 'odts_size': 0x20},
-        #     2: {'first_pid': 0x78, 'odts_size': 0x30}}
+        # 选择表格数据项名称的搜索索引，打开A2L文件时建立，搜索结果为数据项在raw_items中的索引
+        self.search_index_measure: NameSearchIndex = NameSearchIndex([])
+        self.search_index_calibrate: NameSearchIndex = NameSearchIndex([])
+
+        # 存储速率表，测量数据项可选的速率，每个速率占用一个daq列表
+        self.daq_rates: list[DaqRate] = [DaqRate(name='20ms', event_channel=1, prescaler=1, daq_number=1),
+                                         DaqRate(name='100ms', event_channel=2, prescaler=1, daq_number=2)]
+        # 存储各速率使用的daq列表{速率名称: daq列表序号}
+        self.daq_rate_numbers: dict[str, int] = {}
+
+        # 存储daq列表配置字典{daq通道：{'first_pid':int,'odts_size':int,'event_channel':int,'prescaler':int},}
+        # 仅含速率已绑定的daq列表，例如
+        #    {1: {'first_pid': 0x3c, 'odts_size': 0x20, 'event_channel': 1, 'prescaler': 1},
+        #     2: {'first_pid': 0x78, 'odts_size': 0x30, 'event_channel': 2, 'prescaler': 1}}
         self.daqs_cfg: dict[int, dict[str, int]] = {}
 
         # 存储daq列表的数据项内容{daq_number: {odt_number: [item, ...]}}
@@ -735,8 +769,11 @@ class MeasureModel(object):
         #     }
         self.daqs: dict[int, dict[int, list[ASAP2Measure]]] = {}
 
-        # 存储线程间通信的队列,测量时的待显示数据
-        self.q = Queue()
+        # 存储各pid的解码计划{pid: OdtDecodePlan}，启动测量时由daq列表预编译
+        self.daq_decode_plans: dict = {}
+
+        # 存储线程间交接的缓冲区,测量时的待显示数据
+        self.display_buffer = DisplayBuffer()
 
         self.table_calibrate_axis_dict: dict[str, ASAP2Calibrate] = {} # 存储X轴点或者数组的标定对象
         self.table_calibrate_axis2_dict: dict[str, ASAP2Calibrate] = {} # 存储Y轴点的标定对象
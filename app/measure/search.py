@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Author  : ZYD
+# @Time    : 2026/10/16 下午6:02
+# @version : V1.0.0
+# @function: 选择表格数据项名称的搜索索引，
+#   打开A2L文件时将所有名称转为小写并以换行符连接为一个字符串，记录各名称的起始偏移；
+#   搜索时以str.find在连接后的字符串中查找，命中后直接跳到下一个名称继续查找，每个名称至多查找一次，
+#   命中较多(例如只输入了一个字符)时改为逐个名称判断；
+#   输入的内容包含上次搜索的内容时(逐字输入)，只在上次的结果中筛选；
+#   同时建立名称到索引的字典，按名称查找数据项索引时无需遍历列表
+
+
+##############################
+# Module imports
+##############################
+from bisect import bisect_right
+
+
+##############################
+# Constant definitions
+##############################
+DENSE_MATCH_RATIO = 0.05  # 出现次数超过名称数的此比例时，逐个名称判断比逐次查找更快
+
+
+##############################
+# Search API function declarations
+##############################
+
+class NameSearchIndex(object):
+    """
+    名称子串搜索索引，不区分大小写，搜索结果为名称在原列表中的索引，按原列表顺序排列
+
+    :param names: 名称列表
+    :type names: list[str]
+    """
+
+    def __init__(self, names: list[str]) -> None:
+        """
+        构造函数
+        """
+        self.__lower_names = [name.lower() for name in names]  # 各名称的小写
+        # 各名称在原列表中的索引，名称重复时取首次出现的索引
+        self.__positions: dict[str, int] = {}
+        for idx, name in enumerate(names):
+            self.__positions.setdefault(name, idx)
+        self.__text = '\n'.join(self.__lower_names)  # 以换行符连接的小写名称
+        # 各名称在连接后的字符串中的起始偏移
+        self.__starts: list[int] = []
+        offset = 0
+        for name in self.__lower_names:
+            self.__starts.append(offset)
+            offset += len(name) + 1
+        self.__last_key = ''  # 上次搜索的内容
+        self.__last_result: list[int] = list(range(len(names)))  # 上次搜索的结果
+
+    def __len__(self) -> int:
+        return len(self.__lower_names)
+
+    def index(self, name: str) -> int:
+        """
+        查找名称在原列表中的索引(区分大小写)
+
+        :param name: 名称
+        :type name: str
+        :return: 索引，名称重复时为首次出现的索引
+        :rtype: int
+        :raises ValueError: 名称不存在
+        """
+        try:
+            return self.__positions[name]
+        except KeyError:
+            raise ValueError(f'{name}不在搜索索引中') from None
+
+    def search(self, text: str) -> list[int]:
+        """
+        搜索名称中包含指定内容的数据项
+
+        :param text: 搜索的内容，忽略首尾空白，不区分大小写
+        :type text: str
+        :return: 名称包含该内容的数据项在原列表中的索引，内容为空时返回所有索引
+        :rtype: list[int]
+        """
+        key = text.strip().lower()
+        if key == self.__last_key:
+            return list(self.__last_result)
+        if not key:
+            result = list(range(len(self.__lower_names)))
+        elif '\n' in key:
+            result = []
+        elif self.__last_key and self.__last_key in key:
+            # 新的内容包含上次的内容，只需在上次的结果中筛选
+            lower_names = self.__lower_names
+            result = [idx for idx in self.__last_result if key in lower_names[idx]]
+        else:
+            result = self.__scan(key)
+        self.__last_key = key
+        self.__last_result = result
+        return list(result)
+
+    def __scan(self, key: str) -> list[int]:
+        """
+        在连接后的字符串中查找所有包含指定内容的名称
+
+        :param key: 小写的搜索内容，不含换行符
+        :type key: str
+        :return: 名称包含该内容的数据项在原列表中的索引
+        :rtype: list[int]
+        """
+        # 建立局部变量，加快访问速度
+        text = self.__text
+        find = text.find
+        starts = self.__starts
+        count = len(starts)
+
+        # 命中较多时逐个名称判断
+        if text.count(key) > count * DENSE_MATCH_RATIO:
+            return [idx for idx, name in enumerate(self.__lower_names) if key in name]
+
+        result: list[int] = []
+        pos = find(key)
+        while pos >= 0:
+            idx = bisect_right(starts, pos) - 1  # 命中位置所在的名称
+            result.append(idx)
+            if idx + 1 >= count:
+                break
+            pos = find(key, starts[idx + 1])  # 跳到下一个名称继续查找
+        return result
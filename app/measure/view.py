@@ -19,7 +19,7 @@ from typing import Any
 from tkui import icon
 from tkui.tktypes import tk, ttk, GetDpiMixIn, messagebox, \
     TkFrame, TkLabel, TkButton, TkEntry, TkTreeView, TkNotebook, \
-    FONT_BUTTON, \
+    TkVirtualTreeView, FONT_BUTTON, \
     COLOR_FRAME_BG, COLOR_LABEL_BG, COLOR_LABEL_FG, \
     COLOR_BUTTON_BG, COLOR_BUTTON_FG, COLOR_BUTTON_ACTIVE_BG, COLOR_BUTTON_ACTIVE_FG, \
     WIDTH_SCROLLER_BAR, WIDTH_LABEL, WIDTH_BUTTON, \
@@ -1401,14 +1401,14 @@ class MsrCalView(GetDpiMixIn):
                         font=FONT_BUTTON,
                         rowheight=super().get_dpi(18), )
         # 设置表格
-        self.table_select_measure = TkTreeView(master=selection_frame,
-                                               show="headings",
-                                               selectmode="browse",
-                                               style="Custom.Treeview",
-                                               x=0,
-                                               y=HEIGHT_ENTRY * 2 - WIDTH_SCROLLER_BAR,
-                                               width=self.WIDTH_SELECTION_FRAME - WIDTH_SCROLLER_BAR,
-                                               height=self.HEIGHT_SELECTION_FRAME - HEIGHT_ENTRY * 4 + WIDTH_SCROLLER_BAR - 30)
+        self.table_select_measure = TkVirtualTreeView(master=selection_frame,
+                                                      show="headings",
+                                                      selectmode="browse",
+                                                      style="Custom.Treeview",
+                                                      x=0,
+                                                      y=HEIGHT_ENTRY * 2 - WIDTH_SCROLLER_BAR,
+                                                      width=self.WIDTH_SELECTION_FRAME - WIDTH_SCROLLER_BAR,
+                                                      height=self.HEIGHT_SELECTION_FRAME - HEIGHT_ENTRY * 4 + WIDTH_SCROLLER_BAR - 30)
         # self.table_select_measure.column("#0", width=420, minwidth=100)
         # 设置滚动条
         self.table_select_measure.create_scrollbar()
@@ -1416,15 +1416,18 @@ class MsrCalView(GetDpiMixIn):
         self.table_select_measure.bind("<<TreeviewSelect>>",
                                        lambda e: self.presenter.handler_on_select_item(e, target='measure'))
         # 设置表头
-        self.table_select_measure["columns"] = ("is_selected", "Name", "20ms", "100ms")
+        # 速率列由速率表生成
+        rate_names = [rate.name for rate in model.daq_rates]
+        self.table_select_measure["columns"] = ("is_selected", "Name", *rate_names)
         self.table_select_measure.column("is_selected", anchor='c', width=super().get_dpi(25), )  # 表示列,不显示
-        self.table_select_measure.column("Name", anchor='w', width=super().get_dpi(365))
-        self.table_select_measure.column("20ms", anchor='c', width=super().get_dpi(45))
-        self.table_select_measure.column("100ms", anchor='c', width=super().get_dpi(44))
+        self.table_select_measure.column("Name", anchor='w',
+                                         width=super().get_dpi(max(454 - 45 * len(rate_names), 200)))
+        for rate_name in rate_names:
+            self.table_select_measure.column(rate_name, anchor='c', width=super().get_dpi(45))
         # self.table_select_measure.heading("is_selected", anchor='w', text="is_selected")  # 显示表头
         self.table_select_measure.heading("Name", anchor='w', text="Name")
-        self.table_select_measure.heading("20ms", anchor='w', text="20ms")
-        self.table_select_measure.heading("100ms", anchor='w', text="100ms")
+        for rate_name in rate_names:
+            self.table_select_measure.heading(rate_name, anchor='w', text=rate_name)
 
         # 鼠标右键菜单
         table_menu = tk.Menu(master=self.table_select_measure, tearoff=False, font=FONT_BUTTON,
@@ -1518,14 +1521,14 @@ class MsrCalView(GetDpiMixIn):
                         font=FONT_BUTTON,
                         rowheight=super().get_dpi(18), )
         # 设置表格
-        self.table_select_calibrate = TkTreeView(master=selection_frame,
-                                                 show="headings",
-                                                 selectmode="browse",
-                                                 style="Custom.Treeview",
-                                                 x=0,
-                                                 y=HEIGHT_ENTRY * 2 - WIDTH_SCROLLER_BAR,
-                                                 width=self.WIDTH_SELECTION_FRAME - WIDTH_SCROLLER_BAR,
-                                                 height=self.HEIGHT_SELECTION_FRAME - HEIGHT_ENTRY * 4 + WIDTH_SCROLLER_BAR - 30)
+        self.table_select_calibrate = TkVirtualTreeView(master=selection_frame,
+                                                        show="headings",
+                                                        selectmode="browse",
+                                                        style="Custom.Treeview",
+                                                        x=0,
+                                                        y=HEIGHT_ENTRY * 2 - WIDTH_SCROLLER_BAR,
+                                                        width=self.WIDTH_SELECTION_FRAME - WIDTH_SCROLLER_BAR,
+                                                        height=self.HEIGHT_SELECTION_FRAME - HEIGHT_ENTRY * 4 + WIDTH_SCROLLER_BAR - 30)
         # self.table_select_calibrate.column("#0", width=420, minwidth=100)
         # 设置滚动条
         self.table_select_calibrate.create_scrollbar()
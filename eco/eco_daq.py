@@ -0,0 +1,358 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @author  : ZYD
+# @version : V1.0.0
+# @function: V1.0.0：DAQ采集引擎，
+#   接收线程批量读取PCAN-CCP接收队列中的DTO消息，写入预分配的环形缓冲区(时间戳, pid, 负载)，
+#   由独立的解码方消费环形缓冲区，接收路径不按帧分配对象，并统计帧率、丢弃帧数及溢出次数
+
+
+##############################
+# Module imports
+##############################
+
+from array import array
+import threading
+import time
+from typing import NamedTuple
+
+from .pcandrive import pcanccp
+
+
+##############################
+# Constant definitions
+##############################
+
+DTO_PAYLOAD_SIZE = 7  # DTO消息中除pid外的负载字节数
+RING_CAPACITY = 1 << 14  # 环形缓冲区默认容量(帧)，须为2的幂
+RECV_BATCH_SIZE = 256  # 接收线程每批最多读取的帧数
+RECV_BACKOFF_MIN_S = 0.0005  # 接收队列为空时的最小退避时间，单位：秒
+RECV_BACKOFF_MAX_S = 0.002  # 接收队列为空时的最大退避时间，单位：秒
+STATISTICS_PERIOD_S = 1.0  # 帧率统计周期，单位：秒
+
+# odt布局中struct格式字符对应的NumPy类型(大端)，供批量解码与录制数据离线读取共用
+NUMPY_FORMATS: dict[str, str] = {
+    'B': '>u1',
+    'b': '>i1',
+    'H': '>u2',
+    'h': '>i2',
+    'I': '>u4',
+    'i': '>i4',
+    'f': '>f4',
+}
+
+
+##############################
+# Type definitions
+##############################
+
+class DaqStatistics(NamedTuple):
+    """
+    DAQ采集统计信息
+
+    :param frames: 已接收的帧数
+    :type frames: int
+    :param frames_per_second: 最近一个统计周期的帧率
+    :type frames_per_second: float
+    :param dropped: 因环形缓冲区已满而丢弃的帧数
+    :type dropped: int
+    :param overruns: 环形缓冲区溢出(由未满变为已满)的次数
+    :type overruns: int
+    :param pending: 环形缓冲区中尚未被消费的帧数
+    :type pending: int
+    """
+    frames: int
+    frames_per_second: float
+    dropped: int
+    overruns: int
+    pending: int
+
+
+class DaqRingBuffer(object):
+    """
+    DTO消息的单生产者单消费者环形缓冲区，存储空间在构造时一次性分配；
+    第seq帧(从0开始计数)位于槽位seq & mask，
+    其时间戳为timestamps[slot]，pid为pids[slot]，负载为payloads[slot * 7: slot * 7 + 7]
+
+    :param capacity: 容量(帧)，须为2的幂
+    :type capacity: int
+    :raises ValueError: 容量不是2的幂
+    """
+
+    def __init__(self, capacity: int = RING_CAPACITY) -> None:
+        """
+        构造函数
+        """
+        if capacity <= 0 or capacity & (capacity - 1):
+            msg = f'环形缓冲区容量{capacity}不是2的幂'
+            raise ValueError(msg)
+        self.capacity = capacity  # 容量(帧)
+        self.mask = capacity - 1  # 槽位掩码
+        self.timestamps = array('d', bytes(8 * capacity))  # 各槽位接收时间戳(time.perf_counter)
+        self.pids = bytearray(capacity)  # 各槽位pid
+        self.payloads = bytearray(DTO_PAYLOAD_SIZE * capacity)  # 各槽位负载
+        self.payloads_view = memoryview(self.payloads)  # 负载的零拷贝视图
+        self.head = 0  # 已写入的帧数(生产者维护)
+        self.tail = 0  # 已消费的帧数(消费者维护)
+
+    def push(self, timestamp: float, pid: int, payload) -> bool:
+        """
+        写入一帧(生产者调用)
+
+        :param timestamp: 接收时间戳
+        :type timestamp: float
+        :param pid: pid
+        :type pid: int
+        :param payload: 负载，7字节
+        :type payload: bytes | bytearray | memoryview
+        :return: 缓冲区已满时返回False
+        :rtype: bool
+        """
+        head = self.head
+        if head - self.tail >= self.capacity:
+            return False
+        slot = head & self.mask
+        self.timestamps[slot] = timestamp
+        self.pids[slot] = pid
+        offset = slot * DTO_PAYLOAD_SIZE
+        self.payloads[offset:offset + DTO_PAYLOAD_SIZE] = payload
+        self.head = head + 1
+        return True
+
+    def acquire(self, max_count: int) -> tuple[int, int]:
+        """
+        获取待消费的帧(消费者调用)，消费完毕后须调用release释放
+
+        :param max_count: 最多获取的帧数
+        :type max_count: int
+        :return: (首帧序号, 帧数)
+        :rtype: tuple[int, int]
+        """
+        tail = self.tail
+        return tail, min(self.head - tail, max_count)
+
+    def release(self, count: int) -> None:
+        """
+        释放已消费的帧(消费者调用)
+
+        :param count: 帧数
+        :type count: int
+        """
+        self.tail += count
+
+    def discard(self) -> None:
+        """
+        丢弃所有待消费的帧(消费者调用)
+
+        """
+        self.tail = self.head
+
+    def payload(self, seq: int) -> memoryview:
+        """
+        获取指定序号帧的负载(零拷贝)
+
+        :param seq: 帧序号
+        :type seq: int
+        :return: 负载
+        :rtype: memoryview
+        """
+        offset = (seq & self.mask) * DTO_PAYLOAD_SIZE
+        return self.payloads_view[offset:offset + DTO_PAYLOAD_SIZE]
+
+    def __len__(self) -> int:
+        return self.head - self.tail
+
+
+##############################
+# DAQ API function declarations
+##############################
+
+class DaqReceiver(threading.Thread):
+    """
+    DAQ接收线程，批量读取PCAN-CCP接收队列中的DTO消息写入环形缓冲区，
+    接收队列为空时按有上限的指数退避休眠
+
+    :param obj_pccp: PCAN-CCP驱动对象
+    :type obj_pccp: pcanccp.PcanCCP
+    :param ccp_handle: PCAN-CCP连接句柄
+    :type ccp_handle: pcanccp.TCCPHandle
+    :param ring: 环形缓冲区
+    :type ring: DaqRingBuffer
+    """
+
+    def __init__(self,
+                 obj_pccp: pcanccp.PcanCCP,
+                 ccp_handle: pcanccp.TCCPHandle,
+                 ring: DaqRingBuffer) -> None:
+        """
+        构造函数
+        """
+        super().__init__(name='task_daq_recv', daemon=True)
+        self.__obj_pccp = obj_pccp
+        self.__ccp_handle = ccp_handle
+        self.ring = ring  # 环形缓冲区
+        self.data_ready = threading.Event()  # 有新数据写入环形缓冲区时置位
+        self.__stop_event = threading.Event()
+
+        self.frames = 0  # 已接收的帧数
+        self.frames_per_second = 0.0  # 最近一个统计周期的帧率
+        self.dropped = 0  # 因环形缓冲区已满而丢弃的帧数
+        self.overruns = 0  # 环形缓冲区溢出的次数
+
+    def stop(self, timeout: float | None = 1.0) -> None:
+        """
+        停止接收并等待线程退出
+
+        :param timeout: 等待线程退出的超时时间，单位：秒
+        :type timeout: float | None
+        """
+        self.__stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
+
+    def run(self) -> None:
+        """
+        接收流程
+
+        """
+        # 建立局部变量，加快访问速度
+        read_msg = self.__obj_pccp.ReadMsg
+        ccp_handle = self.__ccp_handle
+        ring = self.ring
+        capacity = ring.capacity
+        mask = ring.mask
+        timestamps = ring.timestamps
+        pids = ring.pids
+        payloads = ring.payloads
+        data_ready = self.data_ready
+        stop_event = self.__stop_event
+        perf_counter = time.perf_counter
+        sleep = time.sleep
+        ack_ok = pcanccp.TCCP_ERROR_ACKNOWLEDGE_OK.value
+
+        # 预分配的接收消息及其数据视图，接收时复用
+        recv_msg = pcanccp.TCCPMsg()
+        recv_data = memoryview(recv_msg.Data).cast('B')
+
+        backoff = RECV_BACKOFF_MIN_S
+        is_full = False
+        period_start = perf_counter()
+        period_frames = 0
+
+        while not stop_event.is_set():
+            count = 0
+            while count < RECV_BATCH_SIZE:
+                if read_msg(ccp_handle, recv_msg).value != ack_ok:
+                    break
+                count += 1
+                head = ring.head
+                if head - ring.tail >= capacity:
+                    # 环形缓冲区已满，丢弃新帧
+                    self.dropped += 1
+                    if not is_full:
+                        is_full = True
+                        self.overruns += 1
+                    continue
+                is_full = False
+                slot = head & mask
+                timestamps[slot] = perf_counter()
+                pids[slot] = recv_data[0]
+                offset = slot * DTO_PAYLOAD_SIZE
+                payloads[offset:offset + DTO_PAYLOAD_SIZE] = recv_data[1:1 + DTO_PAYLOAD_SIZE]
+                ring.head = head + 1
+
+            now = perf_counter()
+            if count:
+                self.frames += count
+                period_frames += count
+                data_ready.set()
+                backoff = RECV_BACKOFF_MIN_S
+            if now - period_start >= STATISTICS_PERIOD_S:
+                self.frames_per_second = period_frames / (now - period_start)
+                period_start = now
+                period_frames = 0
+            if count < RECV_BATCH_SIZE:
+                # 接收队列已取空，退避等待
+                sleep(backoff)
+                backoff = min(backoff * 2, RECV_BACKOFF_MAX_S)
+        data_ready.set()  # 唤醒等待中的消费者
+
+
+class DaqAcquisition(object):
+    """
+    DAQ采集引擎，由接收线程写入环形缓冲区，解码方通过wait/acquire/release消费
+
+    :param obj_pccp: PCAN-CCP驱动对象
+    :type obj_pccp: pcanccp.PcanCCP
+    :param ccp_handle: PCAN-CCP连接句柄
+    :type ccp_handle: pcanccp.TCCPHandle
+    :param capacity: 环形缓冲区容量(帧)，须为2的幂
+    :type capacity: int
+    """
+
+    def __init__(self,
+                 obj_pccp: pcanccp.PcanCCP,
+                 ccp_handle: pcanccp.TCCPHandle,
+                 capacity: int = RING_CAPACITY) -> None:
+        """
+        构造函数
+        """
+        self.ring = DaqRingBuffer(capacity)  # 环形缓冲区
+        self.__receiver = DaqReceiver(obj_pccp, ccp_handle, self.ring)
+
+    def start(self) -> None:
+        """
+        启动接收线程
+
+        """
+        self.__receiver.start()
+
+    def stop(self) -> None:
+        """
+        停止接收线程
+
+        """
+        self.__receiver.stop()
+
+    @property
+    def is_running(self) -> bool:
+        """
+        接收线程是否运行中
+
+        :return: 是否运行中
+        :rtype: bool
+        """
+        return self.__receiver.is_alive()
+
+    def wait(self, timeout: float) -> bool:
+        """
+        等待环形缓冲区中有待消费的帧
+
+        :param timeout: 超时时间，单位：秒
+        :type timeout: float
+        :return: 是否有待消费的帧
+        :rtype: bool
+        """
+        if len(self.ring):
+            return True
+        data_ready = self.__receiver.data_ready
+        data_ready.clear()
+        if len(self.ring):
+            return True
+        data_ready.wait(timeout)
+        return len(self.ring) > 0
+
+    @property
+    def statistics(self) -> DaqStatistics:
+        """
+        采集统计信息
+
+        :return: 统计信息
+        :rtype: DaqStatistics
+        """
+        receiver = self.__receiver
+        return DaqStatistics(frames=receiver.frames,
+                             frames_per_second=receiver.frames_per_second,
+                             dropped=receiver.dropped,
+                             overruns=receiver.overruns,
+                             pending=len(self.ring))
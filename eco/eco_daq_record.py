@@ -0,0 +1,586 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @author  : ZYD
+# @version : V1.1.0
+# @function: V1.0.0：DAQ测量数据录制，
+#   将带时间戳的原始dto按列以追加方式写入分块文件，由后台写线程缓冲写盘，不阻塞接收与界面线程
+#            V1.1.0：录制数据的离线读取(依赖NumPy)，
+#   以内存映射方式读取各块，支持按时间范围切片、按信号提取列以及用于绘图的min/max/mean抽稀，可脱离界面在脚本中使用
+#
+# 录制目录布局(每次测量一个目录)：
+#   meta.json                  录制信息，{"format", "version", "payload_size", "start_time", "clock_origin",
+#                              "layout", "chunks", "frames"}，
+#                              clock_origin为开始录制时同时读取的{"perf_counter", "unix_time"}，用于将时间戳换算为墙上时间；
+#                              layout为各pid的odt布局(元素名称、struct格式字符、字节偏移、除数、偏移、映射表)，
+#                              用于离线解码；chunks/frames在停止录制时写入
+#   NNNNNN.timestamp.npy       第NNNNNN块各帧的接收时间戳(time.perf_counter()，原点不确定)，'<f8'，形状(n,)
+#   NNNNNN.pid.npy             第NNNNNN块各帧的pid，'|u1'，形状(n,)
+#   NNNNNN.payload.npy         第NNNNNN块各帧的负载，'|u1'，形状(n, 7)
+# 各块文件均为标准的.npy格式(版本1.0)，可由numpy.load(mmap_mode='r')内存映射读取；
+# 每块先写入临时文件，三列全部写完后再依次重命名，payload列最后出现，故payload列存在即表示该块完整
+
+
+##############################
+# Module imports
+##############################
+from datetime import datetime
+import json
+import os
+import queue
+import threading
+import time
+from typing import Iterator, NamedTuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy为可选依赖，仅离线读取时需要
+    np = None
+
+from .eco_daq import DTO_PAYLOAD_SIZE, NUMPY_FORMATS, DaqRingBuffer
+
+
+##############################
+# Constant definitions
+##############################
+RECORD_FORMAT = 'eco-daq-record'  # 录制格式名称
+RECORD_VERSION = 2  # 录制格式版本，布局变化时需递增
+META_FILENAME = 'meta.json'  # 录制信息文件名
+CHUNK_FRAMES = 1 << 16  # 每块的帧数
+WRITE_QUEUE_SIZE = 256  # 写线程队列的最大块数，队列已满时丢弃新数据
+
+# 各列的文件名后缀及.npy描述，(后缀, descr, 每帧字节数)
+COLUMNS = (('timestamp', '<f8', 8),
+           ('pid', '|u1', 1),
+           ('payload', '|u1', DTO_PAYLOAD_SIZE))
+
+
+##############################
+# Type definitions
+##############################
+
+class RecordSignal(NamedTuple):
+    """
+    录制数据中的一个信号(测量对象)，转换参数来自录制时的odt布局
+
+    :param name: 名称
+    :type name: str
+    :param pid: 所在odt的pid
+    :type pid: int
+    :param fmt: struct格式字符，例如：'H'
+    :type fmt: str
+    :param position: 在odt数据中的字节偏移
+    :type position: int
+    :param divisor: 除数，物理值 = (原始值 - offset) / divisor
+    :type divisor: float
+    :param offset: 偏移
+    :type offset: float
+    :param vtab: 映射表，{原始值: 显示名称}，非映射类型为None
+    :type vtab: dict[int, str] | None
+    """
+    name: str
+    pid: int
+    fmt: str
+    position: int
+    divisor: float
+    offset: float
+    vtab: dict[int, str] | None
+
+
+class DecimatedSignal(NamedTuple):
+    """
+    按时间等分抽稀后的信号，用于绘图，空区间的值为nan
+
+    :param timestamps: 各区间的中点时间戳
+    :type timestamps: np.ndarray
+    :param mins: 各区间的最小值
+    :type mins: np.ndarray
+    :param maxs: 各区间的最大值
+    :type maxs: np.ndarray
+    :param means: 各区间的平均值
+    :type means: np.ndarray
+    :param counts: 各区间的样本数
+    :type counts: np.ndarray
+    """
+    timestamps: 'np.ndarray'
+    mins: 'np.ndarray'
+    maxs: 'np.ndarray'
+    means: 'np.ndarray'
+    counts: 'np.ndarray'
+
+
+##############################
+# Function definitions
+##############################
+
+def get_chunk_path(record_dir: str, chunk_number: int, column: str) -> str:
+    """
+    获取块文件路径
+
+    :param record_dir: 录制目录
+    :type record_dir: str
+    :param chunk_number: 块序号
+    :type chunk_number: int
+    :param column: 列名，'timestamp'、'pid'或'payload'
+    :type column: str
+    :return: 块文件路径
+    :rtype: str
+    """
+    return os.path.join(record_dir, f'{chunk_number:06d}.{column}.npy')
+
+
+def make_npy_header(descr: str, shape: tuple[int, ...]) -> bytes:
+    """
+    生成.npy(版本1.0)文件头，文件头总长度按64字节对齐
+
+    :param descr: 数据类型描述，例如：'<f8'
+    :type descr: str
+    :param shape: 数组形状
+    :type shape: tuple[int, ...]
+    :return: 文件头
+    :rtype: bytes
+    """
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': {shape!r}, }}"
+    prefix_size = 10  # magic(6) + version(2) + header_len(2)
+    padding = -(prefix_size + len(header) + 1) % 64
+    header = (header + ' ' * padding + '\n').encode('latin1')
+    return b'\x93NUMPY\x01\x00' + len(header).to_bytes(2, 'little') + header
+
+
+##############################
+# DaqRecorder API function declarations
+##############################
+
+class DaqRecorder(object):
+    """
+    DAQ测量数据录制器，生产方(解码线程)调用append_ring复制环形缓冲区中的帧，
+    后台写线程按块写盘；写线程跟不上时丢弃数据并计数，不阻塞生产方
+
+    :param record_dir: 录制目录，不存在时新建
+    :type record_dir: str
+    :param layout: 各pid的odt布局，写入录制信息供离线解码，须可序列化为json
+    :type layout: dict
+    :param chunk_frames: 每块的帧数
+    :type chunk_frames: int
+    """
+
+    def __init__(self, record_dir: str, layout: dict, chunk_frames: int = CHUNK_FRAMES) -> None:
+        """
+        构造函数
+        """
+        self.record_dir = record_dir  # 录制目录
+        self.chunk_frames = chunk_frames  # 每块的帧数
+        self.frames = 0  # 已写盘的帧数
+        self.chunks = 0  # 已写盘的块数
+        self.dropped = 0  # 因写线程队列已满而丢弃的帧数
+        self.__meta = {'format': RECORD_FORMAT,
+                       'version': RECORD_VERSION,
+                       'payload_size': DTO_PAYLOAD_SIZE,
+                       'start_time': '',
+                       'clock_origin': {'perf_counter': 0.0, 'unix_time': 0.0},
+                       'layout': layout,
+                       'chunks': 0,
+                       'frames': 0}
+        self.__queue: queue.Queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self.__writer: threading.Thread | None = None
+        self.__error: Exception | None = None
+
+    def start(self) -> None:
+        """
+        新建录制目录，写入录制信息并启动写线程；
+        同时读取perf_counter与墙上时间作为时间戳的换算基准
+
+        :raises OSError: 录制目录无法创建或写入
+        """
+        perf_counter, unix_time = time.perf_counter(), time.time()
+        self.__meta['start_time'] = datetime.fromtimestamp(unix_time).isoformat(timespec='milliseconds')
+        self.__meta['clock_origin'] = {'perf_counter': perf_counter, 'unix_time': unix_time}
+        os.makedirs(self.record_dir, exist_ok=True)
+        self.__write_meta()
+        self.__writer = threading.Thread(target=self.__run, name='task_daq_record', daemon=True)
+        self.__writer.start()
+
+    def append(self, timestamps: bytes, pids: bytes, payloads: bytes) -> bool:
+        """
+        追加一批帧(生产方调用)，数据须为独立副本
+
+        :param timestamps: 各帧的接收时间戳，n个double
+        :type timestamps: bytes
+        :param pids: 各帧的pid，n字节
+        :type pids: bytes
+        :param payloads: 各帧的负载，n * 7字节
+        :type payloads: bytes
+        :return: 写线程队列已满而丢弃时返回False
+        :rtype: bool
+        """
+        try:
+            self.__queue.put_nowait((timestamps, pids, payloads))
+            return True
+        except queue.Full:
+            self.dropped += len(pids)
+            return False
+
+    def append_ring(self, ring: DaqRingBuffer, first_seq: int, count: int) -> None:
+        """
+        复制环形缓冲区中的多帧并追加(生产方调用，须在release之前调用)，回绕时分两段复制
+
+        :param ring: 环形缓冲区
+        :type ring: DaqRingBuffer
+        :param first_seq: 首帧序号
+        :type first_seq: int
+        :param count: 帧数
+        :type count: int
+        """
+        start = first_seq & ring.mask
+        first_count = min(count, ring.capacity - start)  # 回绕前的帧数
+        timestamps = memoryview(ring.timestamps).cast('B')
+        for slot, n in ((start, first_count), (0, count - first_count)):
+            if n <= 0:
+                continue
+            self.append(timestamps[slot * 8:(slot + n) * 8].tobytes(),
+                        ring.pids[slot:slot + n],
+                        ring.payloads_view[slot * DTO_PAYLOAD_SIZE:(slot + n) * DTO_PAYLOAD_SIZE].tobytes())
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """
+        停止录制，写完已排队的数据及最后一个不满的块，并更新录制信息
+
+        :param timeout: 等待写线程退出的超时时间，单位：秒
+        :type timeout: float | None
+        :raises OSError: 写盘失败
+        """
+        if self.__writer is None:
+            return
+        if self.__writer.is_alive():
+            self.__queue.put(None)
+            self.__writer.join(timeout)
+        self.__writer = None
+        if self.__error is not None:
+            raise self.__error
+
+    @property
+    def is_running(self) -> bool:
+        """
+        写线程是否运行中
+
+        :return: 是否运行中
+        :rtype: bool
+        """
+        return self.__writer is not None and self.__writer.is_alive()
+
+    def __run(self) -> None:
+        """
+        写线程流程，按块缓冲并写盘
+
+        """
+        buffers = [bytearray() for _ in COLUMNS]
+        pending = 0  # 当前块中的帧数
+        try:
+            while True:
+                item = self.__queue.get()
+                if item is None:
+                    break
+                for buffer, data in zip(buffers, item):
+                    buffer += data
+                pending += len(item[1])
+                while pending >= self.chunk_frames:
+                    self.__write_chunk(buffers, self.chunk_frames)
+                    pending -= self.chunk_frames
+            if pending:
+                self.__write_chunk(buffers, pending)
+        except Exception as e:
+            self.__error = e
+        finally:
+            self.__meta['chunks'] = self.chunks
+            self.__meta['frames'] = self.frames
+            try:
+                self.__write_meta()
+            except OSError as e:
+                self.__error = self.__error or e
+
+    def __write_chunk(self, buffers: list[bytearray], n: int) -> None:
+        """
+        将各列缓冲区中的前n帧写为一块，并从缓冲区中移除
+
+        :param buffers: 各列缓冲区
+        :type buffers: list[bytearray]
+        :param n: 帧数
+        :type n: int
+        """
+        tmp_paths = []
+        for buffer, (column, descr, size) in zip(buffers, COLUMNS):
+            shape = (n, size) if column == 'payload' else (n,)
+            tmp_path = get_chunk_path(self.record_dir, self.chunks, column) + '.tmp'
+            with open(tmp_path, 'wb') as f, memoryview(buffer) as view:
+                f.write(make_npy_header(descr, shape))
+                f.write(view[:n * size])
+            del buffer[:n * size]
+            tmp_paths.append(tmp_path)
+        for tmp_path in tmp_paths:
+            os.replace(tmp_path, tmp_path[:-len('.tmp')])
+        self.chunks += 1
+        self.frames += n
+
+    def __write_meta(self) -> None:
+        """
+        写入录制信息
+
+        """
+        tmp_path = os.path.join(self.record_dir, META_FILENAME + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.__meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, os.path.join(self.record_dir, META_FILENAME))
+
+
+##############################
+# DaqRecording API function declarations
+##############################
+
+class DaqRecording(object):
+    """
+    录制数据的离线读取，各块按需以内存映射方式打开，不会将整个录制数据读入内存；
+    时间戳在块内及块间单调递增，按时间范围切片时用二分查找定位
+
+    :param record_dir: 录制目录
+    :type record_dir: str
+    :raises RuntimeError: 未安装NumPy
+    :raises ValueError: 录制格式或版本不支持
+    :raises OSError: 录制信息无法读取
+    """
+
+    def __init__(self, record_dir: str) -> None:
+        """
+        构造函数
+        """
+        if np is None:
+            msg = '读取录制数据需要安装NumPy'
+            raise RuntimeError(msg)
+        self.record_dir = record_dir  # 录制目录
+        with open(os.path.join(record_dir, META_FILENAME), 'r', encoding='utf-8') as f:
+            self.meta: dict = json.load(f)  # 录制信息
+        if self.meta.get('format') != RECORD_FORMAT or self.meta.get('version') != RECORD_VERSION:
+            msg = f"不支持的录制格式{self.meta.get('format')}(版本{self.meta.get('version')})"
+            raise ValueError(msg)
+
+        # 各信号，{名称: RecordSignal}
+        self.signals: dict[str, RecordSignal] = {}
+        for pid, elements in self.meta['layout'].items():
+            for element in elements:
+                vtab = element['vtab']
+                self.signals[element['name']] = RecordSignal(
+                    name=element['name'],
+                    pid=int(pid),
+                    fmt=element['fmt'],
+                    position=element['position'],
+                    divisor=element['divisor'],
+                    offset=element['offset'],
+                    vtab={int(k): v for k, v in vtab.items()} if vtab is not None else None)
+
+        # 完整的块序号(payload列存在即表示该块完整)
+        self.chunk_numbers: list[int] = sorted(
+            int(filename.split('.')[0]) for filename in os.listdir(record_dir)
+            if filename.endswith('.payload.npy'))
+        self.__chunks: dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def chunk(self, chunk_number: int) -> tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+        """
+        以内存映射方式打开一块
+
+        :param chunk_number: 块序号
+        :type chunk_number: int
+        :return: (时间戳, pid, 负载)，负载形状为(n, 7)
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+        columns = self.__chunks.get(chunk_number)
+        if columns is None:
+            columns = tuple(np.load(get_chunk_path(self.record_dir, chunk_number, column), mmap_mode='r')
+                            for column, _, _ in COLUMNS)
+            self.__chunks[chunk_number] = columns
+        return columns
+
+    @property
+    def frames(self) -> int:
+        """
+        总帧数
+
+        :return: 总帧数
+        :rtype: int
+        """
+        return sum(len(self.chunk(chunk_number)[1]) for chunk_number in self.chunk_numbers)
+
+    @property
+    def time_range(self) -> tuple[float, float]:
+        """
+        录制数据的时间范围
+
+        :return: (首帧时间戳, 末帧时间戳)，无数据时为(nan, nan)
+        :rtype: tuple[float, float]
+        """
+        if not self.chunk_numbers:
+            return float('nan'), float('nan')
+        return float(self.chunk(self.chunk_numbers[0])[0][0]), float(self.chunk(self.chunk_numbers[-1])[0][-1])
+
+    def to_unix_time(self, timestamps: 'np.ndarray | float') -> 'np.ndarray | float':
+        """
+        将时间戳(time.perf_counter())换算为墙上时间(Unix时间戳，单位：秒)，用于与其他日志对齐
+
+        :param timestamps: 时间戳
+        :type timestamps: np.ndarray | float
+        :return: Unix时间戳
+        :rtype: np.ndarray | float
+        """
+        origin = self.meta['clock_origin']
+        return timestamps - origin['perf_counter'] + origin['unix_time']
+
+    def iter_frames(self,
+                    start: float | None = None,
+                    stop: float | None = None) -> Iterator[tuple['np.ndarray', 'np.ndarray', 'np.ndarray']]:
+        """
+        按块遍历时间范围[start, stop)内的帧，返回的是内存映射的切片(不复制数据)
+
+        :param start: 起始时间戳，为None时从首帧开始
+        :type start: float | None
+        :param stop: 结束时间戳(不含)，为None时至末帧
+        :type stop: float | None
+        :return: 迭代器，元素为(时间戳, pid, 负载)
+        :rtype: Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]
+        """
+        for chunk_number in self.chunk_numbers:
+            timestamps, pids, payloads = self.chunk(chunk_number)
+            if not len(timestamps):
+                continue
+            if start is not None and timestamps[-1] < start:
+                continue
+            if stop is not None and timestamps[0] >= stop:
+                break
+            lo = 0 if start is None else int(np.searchsorted(timestamps, start, 'left'))
+            hi = len(timestamps) if stop is None else int(np.searchsorted(timestamps, stop, 'left'))
+            if lo < hi:
+                yield timestamps[lo:hi], pids[lo:hi], payloads[lo:hi]
+
+    def iter_signal(self,
+                    name: str,
+                    start: float | None = None,
+                    stop: float | None = None,
+                    physical: bool = True) -> Iterator[tuple['np.ndarray', 'np.ndarray']]:
+        """
+        按块遍历时间范围[start, stop)内一个信号的样本
+
+        :param name: 信号名称
+        :type name: str
+        :param start: 起始时间戳，为None时从首帧开始
+        :type start: float | None
+        :param stop: 结束时间戳(不含)，为None时至末帧
+        :type stop: float | None
+        :param physical: 是否转换为物理值，映射类型的信号始终为原始值
+        :type physical: bool
+        :return: 迭代器，元素为(时间戳, 值)
+        :rtype: Iterator[tuple[np.ndarray, np.ndarray]]
+        :raises KeyError: 信号不存在
+        """
+        signal = self.signals[name]
+        dtype = np.dtype({'names': ['value'],
+                          'formats': [NUMPY_FORMATS[signal.fmt]],
+                          'offsets': [signal.position],
+                          'itemsize': DTO_PAYLOAD_SIZE})
+        for timestamps, pids, payloads in self.iter_frames(start, stop):
+            mask = pids == signal.pid
+            if not mask.any():
+                continue
+            values = payloads.reshape(-1).view(dtype)['value'][mask]
+            if physical and signal.vtab is None:
+                values = (values.astype(np.float64) - signal.offset) / signal.divisor
+            yield timestamps[mask], values
+
+    def signal(self,
+               name: str,
+               start: float | None = None,
+               stop: float | None = None,
+               physical: bool = True) -> tuple['np.ndarray', 'np.ndarray']:
+        """
+        提取时间范围[start, stop)内一个信号的全部样本
+
+        :param name: 信号名称
+        :type name: str
+        :param start: 起始时间戳，为None时从首帧开始
+        :type start: float | None
+        :param stop: 结束时间戳(不含)，为None时至末帧
+        :type stop: float | None
+        :param physical: 是否转换为物理值，映射类型的信号始终为原始值
+        :type physical: bool
+        :return: (时间戳, 值)
+        :rtype: tuple[np.ndarray, np.ndarray]
+        :raises KeyError: 信号不存在
+        """
+        parts = list(self.iter_signal(name, start, stop, physical))
+        if not parts:
+            dtype = np.float64 if physical and self.signals[name].vtab is None \
+                else NUMPY_FORMATS[self.signals[name].fmt]
+            return np.empty(0, dtype=np.float64), np.empty(0, dtype=dtype)
+        return np.concatenate([t for t, _ in parts]), np.concatenate([v for _, v in parts])
+
+    def decimate(self,
+                 name: str,
+                 buckets: int,
+                 start: float | None = None,
+                 stop: float | None = None) -> DecimatedSignal:
+        """
+        将时间范围[start, stop)等分为buckets个区间，逐块统计每个区间内信号物理值的最小值、最大值与平均值
+
+        :param name: 信号名称
+        :type name: str
+        :param buckets: 区间数，通常取绘图宽度(像素)
+        :type buckets: int
+        :param start: 起始时间戳，为None时从首帧开始
+        :type start: float | None
+        :param stop: 结束时间戳(不含)，为None时至末帧之后
+        :type stop: float | None
+        :return: 抽稀后的信号
+        :rtype: DecimatedSignal
+        :raises KeyError: 信号不存在
+        """
+        first, last = self.time_range
+        start = first if start is None else start
+        stop = float(np.nextafter(last, np.inf)) if stop is None else stop
+        edges = np.linspace(start, stop, buckets + 1)
+        mins = np.full(buckets, np.inf)
+        maxs = np.full(buckets, -np.inf)
+        sums = np.zeros(buckets)
+        counts = np.zeros(buckets, dtype=np.int64)
+        for timestamps, values in self.iter_signal(name, start, stop):
+            idx = np.clip(np.searchsorted(edges, timestamps, 'right') - 1, 0, buckets - 1)
+            values = values.astype(np.float64, copy=False)
+            np.minimum.at(mins, idx, values)
+            np.maximum.at(maxs, idx, values)
+            sums += np.bincount(idx, weights=values, minlength=buckets)
+            counts += np.bincount(idx, minlength=buckets)
+        empty = counts == 0
+        mins[empty] = np.nan
+        maxs[empty] = np.nan
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+        return DecimatedSignal(timestamps=(edges[:-1] + edges[1:]) / 2,
+                               mins=mins,
+                               maxs=maxs,
+                               means=means,
+                               counts=counts)
+
+    def close(self) -> None:
+        """
+        释放已打开的内存映射
+
+        """
+        self.__chunks.clear()
+
+
+if __name__ == '__main__':
+    # 查看录制数据概要：python -m eco.eco_daq_record [录制目录]
+    import sys
+
+    recording = DaqRecording(sys.argv[1])
+    t_first, t_last = recording.time_range
+    print(f"录制开始: {recording.meta['start_time']}  块数: {len(recording.chunk_numbers)}  "
+          f"帧数: {recording.frames}  时长: {t_last - t_first:.3f}s")
+    for signal_name in recording.signals:
+        t, v = recording.signal(signal_name)
+        if len(v):
+            print(f"{signal_name:<40}样本数: {len(v):<10}min: {v.min():<14g}max: {v.max():<14g}")
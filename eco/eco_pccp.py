@@ -17,14 +17,15 @@ import sys
 import threading  # 用于多线程
 import time
 import traceback  # 用于获取异常详细信息
-from typing import Any, Union
-
-from crccheck.crc import Crc16Modbus, Crc16Ibm3740
+from typing import Any, Callable, Union
 
 from app.measure.model import ASAP2Measure
-from srecord import Srecord
+from srecord import Srecord, ChecksumAlgorithm, checksum_hex
+from srecord.checksum import calc_checksum
+from srecord.srecord import EraseMemoryInfo
 from utils import pad_hex, get_c_char
 
+from .eco_daq import DaqAcquisition
 from .pcandrive import pcanccp
 from .seed2key import get_key_of_seed
 
@@ -37,6 +38,16 @@ USE_GETCH = True  # 是否使用getch函数来等待用户输入
 IS_PRINT_EXEC_DETAIL = True  # 是否打印执行细节,一级
 IS_PRINT_MSG_DETAIL = False  # 是否打印消息细节,二级
 IS_PRINT_MAP_DETAIL = False  # 是否打印地址映射细节,三级
+RECV_BACKOFF_MIN_S = 0.0005  # 无接收事件可用时，轮询接收队列的最小退避时间，单位：秒
+RECV_BACKOFF_MAX_S = 0.01  # 无接收事件可用时，轮询接收队列的最大退避时间，单位：秒
+RECV_EVENT_WAIT_MAX_MS = 50  # 等待接收事件的单次最长时间，单位：毫秒
+MAX_DAQ_LIST_NUMBER = 15  # 获取daq列表配置时查询的最大daq列表序号
+# ECU不支持某命令时的响应状态(未知命令、命令语法错误、功能不可用)，据此判断可否回退为其他命令
+UNSUPPORTED_COMMAND_STATUSES = (pcanccp.TCCP_ERROR_UNKNOWN_COMMAND.value,
+                                pcanccp.TCCP_ERROR_COMMAND_SYNTAX.value,
+                                pcanccp.TCCP_ERROR_NOT_AVAILABLE.value)
+UPLOAD_VERIFY_CHUNK_SIZE = 0x400  # 上传数据后按块校验(BUILD_CHKSUM)时每块的长度，单位：字节
+UPLOAD_PROGRESS_INTERVAL_S = 0.2  # 上传数据时回调进度的最小间隔，单位：秒
 
 
 def wait_getch_and_clear() -> None:
@@ -104,6 +115,53 @@ def print_map_detail(txt: str, *args, **kwargs) -> None:
         print(txt)
 
 
+def create_recv_event() -> int | None:
+    """
+    创建用于PCAN接收事件的自动复位事件对象，仅Windows下可用
+
+    :return: 事件句柄，不可用时返回None
+    :rtype: int | None
+    """
+    if not IS_WINDOWS:
+        return None
+    try:
+        from ctypes import wintypes
+        kernel32 = ctypes.windll.kernel32
+        # 句柄为指针宽度，需指定返回类型，否则64位下按int截断
+        kernel32.CreateEventW.restype = wintypes.HANDLE
+        kernel32.CreateEventW.argtypes = (wintypes.LPVOID, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR)
+        kernel32.WaitForSingleObject.restype = wintypes.DWORD
+        kernel32.WaitForSingleObject.argtypes = (wintypes.HANDLE, wintypes.DWORD)
+        kernel32.CloseHandle.restype = wintypes.BOOL
+        kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+        handle = kernel32.CreateEventW(None, False, False, None)
+    except (AttributeError, OSError):
+        return None
+    return handle or None
+
+
+def wait_recv_event(handle: int, timeout_ms: int) -> None:
+    """
+    等待接收事件，直到事件被触发或超时
+
+    :param handle: 事件句柄
+    :type handle: int
+    :param timeout_ms: 超时时间，单位：毫秒
+    :type timeout_ms: int
+    """
+    ctypes.windll.kernel32.WaitForSingleObject(handle, timeout_ms)
+
+
+def close_recv_event(handle: int) -> None:
+    """
+    关闭接收事件对象，释放事件句柄
+
+    :param handle: 事件句柄
+    :type handle: int
+    """
+    ctypes.windll.kernel32.CloseHandle(handle)
+
+
 ##############################
 # Type definitions
 ##############################
@@ -114,13 +172,26 @@ class EcoPccpException(Exception):
 
     :param message: 要显示的异常消息
     :type message: str
+    :param status: 命令的响应状态(TCCPResult的值)，未知时为None
+    :type status: int | None
     """
 
-    def __init__(self, message: str) -> None:
+    def __init__(self, message: str, status: int | None = None) -> None:
         """
         构造函数
         """
         self.message = message
+        self.status = status
+
+    @property
+    def is_unsupported_command(self) -> bool:
+        """
+        是否因ECU不支持该命令而失败(超时等其他错误返回False)
+
+        :return: 是否不支持该命令
+        :rtype: bool
+        """
+        return self.status in UNSUPPORTED_COMMAND_STATUSES
 
     def __str__(self):
         return f"{self.message}"
@@ -195,6 +266,15 @@ class EcoPccpFunc(object):
         self.obj_pccp = pcanccp.PcanCCP()
         self.ccp_handle = pcanccp.TCCPHandle()
 
+        # ECU是否支持PROGRAM_6命令，None表示尚未确定，首次批量编程时探测
+        self.__is_program_6_supported: bool | None = None
+        # ECU是否支持DNLOAD_6命令，None表示尚未确定，首次批量下载时探测
+        self.__is_download_6_supported: bool | None = None
+        # ECU是否支持SHORT_UP命令，None表示尚未确定，首次短数据上传时探测
+        self.__is_short_upload_supported: bool | None = None
+        # 接收自定义服务响应时使用的接收事件句柄，None表示尚未创建，0表示不可用
+        self.__recv_event: int | None = None
+
     def custom_cro(self,
                    data: Union[list[int], bytes, bytearray],
                    timeout: int,
@@ -248,21 +328,13 @@ class EcoPccpFunc(object):
             :rtype: tuple[int, bytes]
             :raises EcoPccpException: 接收消息超时
             """
-            status = pcanccp.PCAN_ERROR_QRCVEMPTY
-            time_start = time.time()
-            while status != pcanccp.PCAN_ERROR_OK:
-                # time.sleep(0.002)
-                status, msg, timestamp = self.obj_pcan.Read(self.channel)
-                time_stop = time.time()
-                # print(f'status={status}')
-                if status == pcanccp.PCAN_ERROR_OK:
-                    return status, bytes(msg.DATA)
-                elif time_stop - time_start > timeout / 1000:
-                    if is_must_response:
-                        msg = f'接收自定义服务消息超时'
-                        raise EcoPccpException(msg)
-                    else:
-                        return status, bytes([0, 0, 0, 0, 0, 0, 0, 0])
+            status, recv_data = self.wait_dto_frame(timeout)
+            if recv_data is not None:
+                return status, recv_data
+            if is_must_response:
+                msg = f'接收自定义服务消息超时'
+                raise EcoPccpException(msg)
+            return status, bytes([0, 0, 0, 0, 0, 0, 0, 0])
 
         status = __write(data)
         if status == pcanccp.PCAN_ERROR_OK:
@@ -278,6 +350,52 @@ class EcoPccpFunc(object):
             msg = f'发送自定义服务消息失败: {bytes.decode(text)}'
             raise EcoPccpException(msg)
 
+    def wait_dto_frame(self, timeout: int) -> tuple[int, bytes | None]:
+        """
+        从Pcan接收队列中等待响应设备(dto_can_id)的第一帧消息，其它CAN_ID的消息被丢弃；
+        接收队列为空时阻塞等待接收事件(Windows)，接收事件不可用时按有上限的指数退避休眠，
+        避免空转占满CPU；等待期间临时替换通道的接收事件，结束后恢复
+
+        :param timeout: 等待超时时间，单位：毫秒
+        :type timeout: int
+        :returns: (最后一次接收状态, 消息数据)，超时则消息数据为None
+        :rtype: tuple[int, bytes | None]
+        """
+        if self.__recv_event is None:
+            self.__recv_event = create_recv_event() or 0
+        old_event = None
+        if self.__recv_event:
+            status, value = self.obj_pcan.GetValue(self.channel, pcanccp.PCAN_RECEIVE_EVENT)
+            if status == pcanccp.PCAN_ERROR_OK and \
+                    self.obj_pcan.SetValue(self.channel, pcanccp.PCAN_RECEIVE_EVENT,
+                                           self.__recv_event) == pcanccp.PCAN_ERROR_OK:
+                old_event = value
+        dto_can_id = self.dto_can_id.value
+        deadline = time.perf_counter() + timeout / 1000
+        backoff = RECV_BACKOFF_MIN_S
+        status = pcanccp.PCAN_ERROR_QRCVEMPTY
+        try:
+            while True:
+                # 取出接收队列中的所有消息，直到队列为空
+                while True:
+                    status, msg, timestamp = self.obj_pcan.Read(self.channel)
+                    if status != pcanccp.PCAN_ERROR_OK:
+                        break
+                    if msg.ID == dto_can_id:
+                        return status, bytes(msg.DATA)
+                    backoff = RECV_BACKOFF_MIN_S
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return status, None
+                if old_event is not None:
+                    wait_recv_event(self.__recv_event, min(int(remaining * 1000) + 1, RECV_EVENT_WAIT_MAX_MS))
+                else:
+                    time.sleep(min(backoff, remaining))
+                    backoff = min(backoff * 2, RECV_BACKOFF_MAX_S)
+        finally:
+            if old_event is not None:
+                self.obj_pcan.SetValue(self.channel, pcanccp.PCAN_RECEIVE_EVENT, old_event)
+
     def initialize_device(self) -> ExecResult:
         """
         初始化设备
@@ -307,6 +425,10 @@ class EcoPccpFunc(object):
         :returns: 执行结果ExecResult
         :rtype: ExecResult
         """
+        # 释放接收事件句柄
+        if self.__recv_event:
+            close_recv_event(self.__recv_event)
+        self.__recv_event = None
         status = self.obj_pccp.Uninitialize(self.channel)
         _, text = self.obj_pccp.GetErrorText(status)
         if self.obj_pccp.StatusIsOk(status, pcanccp.TCCP_ERROR_ACKNOWLEDGE_OK):
@@ -705,6 +827,86 @@ class EcoPccpFunc(object):
 
         return exec_result
 
+    def download_6(self,
+                   data: Union[list[int], bytes, bytearray, memoryview]) -> ExecResult:
+        """
+        下载6字节
+
+        :param data: 要下载的数据
+        :type data: list[int] or bytes or bytearray or memoryview
+        :returns: 执行结果ExecResult
+        :rtype: ExecResult
+        :raises EcoPccpException: 下载错误
+        """
+        data_length = len(data)
+        data_buffer = ctypes.create_string_buffer(data_length)
+        if data:
+            data_buffer.raw = bytes(data)
+
+        mta0_ext = pcanccp.c_ubyte()
+        mta0_addr = pcanccp.c_uint32()
+
+        status = self.obj_pccp.Download_6(ccp_handle=self.ccp_handle,
+                                          data_buffer=data_buffer,
+                                          mta0_ext=mta0_ext,
+                                          mta0_addr=mta0_addr,
+                                          timeout=self.timeout)
+        _, text = self.obj_pccp.GetErrorText(status)
+        if self.obj_pccp.StatusIsOk(status, pcanccp.TCCP_ERROR_ACKNOWLEDGE_OK):
+            addr = int.to_bytes(mta0_addr.value, 4, 'big', signed=False)
+            addr = int.from_bytes(addr, 'little', signed=False)
+            msg = f'下载6字节:{text.decode()},当前地址为{pad_hex(hex(addr + mta0_ext.value), 4)}'
+            print_msg_detail(msg)
+            exec_result = ExecResult(is_success=True, data=msg)
+        else:
+            msg = f'下载6字节:{text.decode()}'
+            print_exec_detail(msg)
+            raise EcoPccpException(msg, status=status.value)
+
+        return exec_result
+
+    def download_block(self,
+                       addr: int,
+                       data: Union[bytes, bytearray, memoryview]) -> int:
+        """
+        从指定地址起批量下载一块连续的数据，
+        优先使用DNLOAD_6每帧下载6字节，ECU响应不支持该命令时回退为DNLOAD每帧下载5字节(超时等其他错误直接抛出)；
+        仅在开始时设置一次MTA0，之后由ECU随下载自动递增，
+        回退时从本地跟踪的地址重新设置MTA0继续下载
+
+        :param addr: 下载起始地址
+        :type addr: int
+        :param data: 要下载的数据
+        :type data: bytes or bytearray or memoryview
+        :returns: 下载的字节数
+        :rtype: int
+        :raises EcoPccpException: 下载错误
+        """
+        view = memoryview(data).cast('B')
+        total = len(view)
+        offset = 0  # 本地跟踪的MTA0相对下载起始地址的偏移
+        self.__set_mta0(addr)
+        while offset < total:
+            remain = total - offset
+            if remain >= 6 and self.__is_download_6_supported is not False:
+                try:
+                    self.download_6(data=view[offset:offset + 6])
+                except EcoPccpException as e:
+                    if self.__is_download_6_supported or not e.is_unsupported_command:
+                        raise
+                    # 首次使用DNLOAD_6即响应不支持该命令，回退为DNLOAD并重新设置MTA0
+                    self.__is_download_6_supported = False
+                    print_exec_detail('下载:ECU不支持DNLOAD_6命令,回退为DNLOAD命令')
+                    self.__set_mta0(addr + offset)
+                    continue
+                self.__is_download_6_supported = True
+                offset += 6
+            else:
+                size = min(5, remain)
+                self.download(data=view[offset:offset + size])
+                offset += size
+        return total
+
     def upload(self,
                size: int) -> ExecResult:
         """
@@ -737,6 +939,91 @@ class EcoPccpFunc(object):
 
         return exec_result
 
+    def short_upload(self,
+                     addr: int,
+                     size: int) -> ExecResult:
+        """
+        查询指定地址的数据(至多5字节)，无需设置mta0，mta0保持不变
+
+        :param addr: 数据地址
+        :type addr: int
+        :param size: 要查询的数据的长度，单位：字节
+        :type size: int
+        :returns: 执行结果ExecResult，ExecResult.data含有data数据(bytes)
+        :rtype: ExecResult
+        :raises EcoPccpException: 查询数据失败
+        """
+        data_buffer = pcanccp.c_buffer(size)
+        # 地址按dll要求转换字节序
+        addr = int.to_bytes(addr, 4, 'big', signed=False)
+        addr = int.from_bytes(addr, 'little', signed=False)
+
+        status = self.obj_pccp.ShortUpload(ccp_handle=self.ccp_handle,
+                                           size=pcanccp.c_ubyte(size),
+                                           mta0_ext=pcanccp.c_ubyte(0),
+                                           mta0_addr=pcanccp.c_uint32(addr),
+                                           data_buffer=data_buffer,
+                                           timeout=self.timeout)
+        _, text = self.obj_pccp.GetErrorText(status)
+        if self.obj_pccp.StatusIsOk(status, pcanccp.TCCP_ERROR_ACKNOWLEDGE_OK):
+            msg = f'短查询数据:{text.decode()},data={data_buffer.value}'
+            print_msg_detail(msg)
+            exec_result = ExecResult(is_success=True, data=bytes(data_buffer))
+        else:
+            msg = f'短查询数据:{text.decode()}'
+            print_exec_detail(msg)
+            raise EcoPccpException(msg, status=status.value)
+
+        return exec_result
+
+    def upload_block(self,
+                     addr: int,
+                     buffer: Union[bytearray, memoryview],
+                     progress: Callable[[int], None] | None = None) -> int:
+        """
+        从指定地址起批量上传一块数据，直接写入预分配的缓冲区；
+        不超过5字节时优先使用SHORT_UP，一次往返即可完成，ECU响应不支持该命令时回退为设置MTA0后UPLOAD(超时等其他错误直接抛出)；
+        超过5字节时仅在开始时设置一次MTA0，之后每帧UPLOAD 5字节，由ECU自动递增MTA0
+
+        :param addr: 上传起始地址
+        :type addr: int
+        :param buffer: 接收数据的缓冲区，上传的长度即缓冲区的长度
+        :type buffer: bytearray or memoryview
+        :param progress: 进度回调函数，参数为已上传的字节数，每帧调用一次
+        :type progress: Callable[[int], None] | None
+        :returns: 上传的字节数
+        :rtype: int
+        :raises EcoPccpException: 上传错误
+        """
+        view = memoryview(buffer).cast('B')
+        total = len(view)
+        if 0 < total <= 5 and self.__is_short_upload_supported is not False:
+            try:
+                exec_result = self.short_upload(addr=addr, size=total)
+            except EcoPccpException as e:
+                if self.__is_short_upload_supported or not e.is_unsupported_command:
+                    raise
+                # 首次使用SHORT_UP即响应不支持该命令，回退为UPLOAD
+                self.__is_short_upload_supported = False
+                print_exec_detail('查询数据:ECU不支持SHORT_UP命令,回退为UPLOAD命令')
+            else:
+                self.__is_short_upload_supported = True
+                view[:] = exec_result.data[:total]
+                if progress is not None:
+                    progress(total)
+                return total
+
+        offset = 0  # 本地跟踪的MTA0相对上传起始地址的偏移
+        self.__set_mta0(addr)
+        while offset < total:
+            size = min(5, total - offset)
+            exec_result = self.upload(size=size)
+            view[offset:offset + size] = exec_result.data[:size]
+            offset += size
+            if progress is not None:
+                progress(offset)
+        return total
+
     def move(self,
              size: int) -> ExecResult:
         """
@@ -1069,12 +1356,12 @@ class EcoPccpFunc(object):
         return exec_result
 
     def program(self,
-                data: Union[list[int], bytes, bytearray]) -> ExecResult:
+                data: Union[list[int], bytes, bytearray, memoryview]) -> ExecResult:
         """
         编程
 
         :param data: 要编程的数据
-        :type data: list[int] or bytes or bytearray
+        :type data: list[int] or bytes or bytearray or memoryview
         :returns: 执行结果ExecResult
         :rtype: ExecResult
         :raises EcoPccpException: 编程错误
@@ -1082,8 +1369,7 @@ class EcoPccpFunc(object):
         data_length = len(data)
         data_buffer = ctypes.create_string_buffer(data_length)
         if data:
-            for i in range(data_length):
-                data_buffer[i] = get_c_char(ord(chr(data[i])))
+            data_buffer.raw = bytes(data)
 
         mta0_ext = pcanccp.c_ubyte()
         mta0_addr = pcanccp.c_uint32()
@@ -1111,12 +1397,12 @@ class EcoPccpFunc(object):
         return exec_result
 
     def program_6(self,
-                  data: Union[list[int], bytes, bytearray]) -> ExecResult:
+                  data: Union[list[int], bytes, bytearray, memoryview]) -> ExecResult:
         """
         编程6字节
 
         :param data: 要编程的数据
-        :type data: list[int] or bytes or bytearray
+        :type data: list[int] or bytes or bytearray or memoryview
         :returns: 执行结果ExecResult
         :rtype: ExecResult
         :raises EcoPccpException: 编程错误
@@ -1124,8 +1410,7 @@ class EcoPccpFunc(object):
         data_length = len(data)
         data_buffer = ctypes.create_string_buffer(data_length)
         if data:
-            for i in range(data_length):
-                data_buffer[i] = get_c_char(ord(chr(data[i])))
+            data_buffer.raw = bytes(data)
 
         mta0_ext = pcanccp.c_ubyte()
         mta0_addr = pcanccp.c_uint32()
@@ -1147,10 +1432,95 @@ class EcoPccpFunc(object):
             msg = f'编程6字节:{text.decode()}'
             print_exec_detail(msg)
             # self.__display_uds_msg(request, None, False)
-            raise EcoPccpException(msg)
+            raise EcoPccpException(msg, status=status.value)
 
         return exec_result
 
+    def program_block(self,
+                      addr: int,
+                      data: Union[bytes, bytearray, memoryview]) -> int:
+        """
+        从指定地址起批量编程一块数据，
+        优先使用PROGRAM_6每帧编程6字节，ECU响应不支持该命令时回退为PROGRAM每帧编程5字节(超时等其他错误直接抛出)；
+        仅在开始时设置一次MTA0，之后由ECU随编程自动递增，本地同步跟踪当前MTA0，
+        回退时从本地跟踪的地址继续编程
+
+        :param addr: 编程起始地址
+        :type addr: int
+        :param data: 要编程的数据
+        :type data: bytes or bytearray or memoryview
+        :returns: 编程的字节数
+        :rtype: int
+        :raises EcoPccpException: 编程错误
+        """
+        view = memoryview(data).cast('B')
+        total = len(view)
+        offset = 0  # 本地跟踪的MTA0相对编程起始地址的偏移
+        self.__set_mta0(addr)
+        while offset < total:
+            remain = total - offset
+            if remain >= 6 and self.__is_program_6_supported is not False:
+                try:
+                    self.program_6(data=view[offset:offset + 6])
+                except EcoPccpException as e:
+                    if self.__is_program_6_supported or not e.is_unsupported_command:
+                        raise
+                    # 首次使用PROGRAM_6即响应不支持该命令，回退为PROGRAM并重新设置MTA0
+                    self.__is_program_6_supported = False
+                    print_exec_detail('编程:ECU不支持PROGRAM_6命令,回退为PROGRAM命令')
+                    self.__set_mta0(addr + offset)
+                    continue
+                self.__is_program_6_supported = True
+                offset += 6
+            else:
+                size = min(5, remain)
+                self.program(data=view[offset:offset + size])
+                offset += size
+        return total
+
+    def __set_mta0(self, addr: int) -> ExecResult:
+        """
+        设置MTA0为指定地址(地址按dll要求转换字节序)
+
+        :param addr: 地址
+        :type addr: int
+        :returns: 执行结果ExecResult
+        :rtype: ExecResult
+        :raises EcoPccpException: 设置内存操作地址失败
+        """
+        addr = int.to_bytes(addr, 4, 'big', signed=False)
+        addr = int.from_bytes(addr, 'little', signed=False)
+        return self.set_mta(mta=0,
+                            addr_offset=0,
+                            addr_base=addr)
+
+    def __check_segment(self,
+                        obj_srecord: Srecord,
+                        erase_memory_info: EraseMemoryInfo) -> tuple[bool, int, str]:
+        """
+        对一个数据段执行内存校验，并与本地CRC-16/MODBUS校验值比对
+
+        :param obj_srecord: Srecord对象
+        :type obj_srecord: Srecord
+        :param erase_memory_info: 数据段信息
+        :type erase_memory_info: EraseMemoryInfo
+        :returns: (是否一致, 远程校验结果, 本地校验结果(0x开头16进制))
+        :rtype: tuple[bool, int, str]
+        :raises EcoPccpException: 设置内存操作地址失败；内存校验错误
+        """
+        start_address = int(erase_memory_info.erase_start_address32, 16)
+        length = int(erase_memory_info.erase_length, 16)
+        # 设置内存操作地址
+        self.__set_mta0(start_address)
+        # 校验
+        erase_length = int.to_bytes(length, 4, 'big', signed=False)
+        erase_length = int.from_bytes(erase_length, 'little', signed=False)
+        ecec_result = self.build_checksum(block_size=erase_length)
+        # 本地校验结果
+        crc_local = obj_srecord.checksums.region(ChecksumAlgorithm.CRC16_MODBUS, start_address, length)
+        crc_local = ''.join(['0x', checksum_hex(ChecksumAlgorithm.CRC16_MODBUS, crc_local, 'little')])
+        return int(crc_local, 16) == ecec_result.data, ecec_result.data, crc_local
+
     def build_checksum(self,
                        block_size: int) -> ExecResult:
         """
@@ -1185,15 +1555,20 @@ class EcoPccpFunc(object):
         return exec_result
 
     def erase_write_data(self,
-                         obj_srecord: Srecord) -> float:
+                         obj_srecord: Srecord,
+                         is_delta: bool = False) -> float:
         """
         将Srecord文件的S3数据，擦除并写入Flash。
         擦写流程：
-        对于每个连续擦写段执行擦除内存后，再执行编程每个连续数据段，
-        编程结束后checksum各数据段，最后通过自定义服务消息(0x1D)定位程序起始地址启动程序
+        对于每个连续擦写段执行擦除内存后，再执行编程每个连续数据段(优先使用PROGRAM_6批量编程，并输出编程速率)，
+        编程结束后checksum各数据段，最后通过自定义服务消息(0x1D)定位程序起始地址启动程序；
+        增量模式下，擦除前先对各数据段执行checksum并与本地校验值比对，仅擦写不一致的数据段，
+        编程结束后(或无需擦写时)仍checksum所有数据段，以发现被扇区擦除波及的相邻数据段
 
         :param obj_srecord: Srecord对象，对象中包含erase_memory_infos属性，此属性含有各连续擦写数据段的详细信息
         :type obj_srecord: Srecord
+        :param is_delta: 是否为增量模式，仅擦写与ECU中不一致的数据段
+        :type is_delta: bool
         :return: 返回执行时间，单位s
         :rtype: float
         :raises EcoPccpException: 擦写错误
@@ -1206,82 +1581,87 @@ class EcoPccpFunc(object):
             msg = f'->擦写:Srecord对象为空'
             raise EcoPccpException(msg)
 
-        # 擦除各数据段
-        msg = f'擦除:共需擦除{len(obj_srecord.erase_memory_infos)}个数据段'
-        print_exec_detail(msg)
-        for erase_memory_info in obj_srecord.erase_memory_infos:
-            # if erase_memory_info.erase_number != obj_srecord.erase_memory_infos[-1].erase_number:
-            #     continue
-            msg = f'-> 擦除:擦除第{erase_memory_info.erase_number}个数据段,'
-            msg = msg + f'地址为{erase_memory_info.erase_start_address32},'
-            msg = msg + f'长度为{erase_memory_info.erase_length}'
+        erase_memory_infos = obj_srecord.erase_memory_infos
+        # 增量模式，比对各数据段校验结果，筛选出需要擦写的数据段
+        if is_delta:
+            msg = f'比对:共需比对{len(obj_srecord.erase_memory_infos)}个数据段'
             print_exec_detail(msg)
-            # 设置内存操作地址
-            addr = int.to_bytes(int(erase_memory_info.erase_start_address32, 16), 4, 'big', signed=False)
-            addr = int.from_bytes(addr, 'little', signed=False)
-            ecec_result = self.set_mta(mta=0,
-                                       addr_offset=0,
-                                       addr_base=addr)
-            # 擦除内存
-            erase_length = int.to_bytes(int(erase_memory_info.erase_length, 16), 4, 'big', signed=False)
-            erase_length = int.from_bytes(erase_length, 'little', signed=False)
-            ecec_result = self.clear_memory(memory_size=erase_length)
-
-        # 编程各数据段
-        msg = f'编程:共需编程{len(obj_srecord.erase_memory_infos)}个数据段'
-        print_exec_detail(msg)
-        for erase_memory_info in obj_srecord.erase_memory_infos:
-            # if erase_memory_info.erase_number != obj_srecord.erase_memory_infos[-1].erase_number:
-            #     continue
-            msg = f'-> 编程:编程第{erase_memory_info.erase_number}个数据段,'
-            msg = msg + f'地址为{erase_memory_info.erase_start_address32},'
-            msg = msg + f'长度为{erase_memory_info.erase_length}'
+            erase_memory_infos = []
+            for erase_memory_info in obj_srecord.erase_memory_infos:
+                is_match, remote_crc, local_crc = self.__check_segment(obj_srecord, erase_memory_info)
+                msg = f'-> 比对:第{erase_memory_info.erase_number}个数据段{is_match and "一致,跳过擦写" or "不一致,需擦写"},'
+                msg = msg + f'远程校验结果为{hex(remote_crc)},'
+                msg = msg + f'本地校验结果为{local_crc}'
+                print_exec_detail(msg)
+                if not is_match:
+                    erase_memory_infos.append(erase_memory_info)
+
+        if erase_memory_infos:
+            # 擦除各数据段
+            msg = f'擦除:共需擦除{len(erase_memory_infos)}个数据段'
             print_exec_detail(msg)
-            # 设置内存操作地址
-            addr = int.to_bytes(int(erase_memory_info.erase_start_address32, 16), 4, 'big', signed=False)
-            addr = int.from_bytes(addr, 'little', signed=False)
-            ecec_result = self.set_mta(mta=0,
-                                       addr_offset=0,
-                                       addr_base=addr)
-            # 编程
-            erase_data = bytes.fromhex(erase_memory_info.erase_data)
-            for i in range(0, len(erase_data), 5):
-                data = erase_data[i:i + 5]
-                ecec_result = self.program(data=data)
-        # 编程完所有数据段最后再发送数据全0的编程帧，否则最后一个数据段校验结果不正确
-        ecec_result = self.program(data=[])
-        # return
-
-        # 校验各数据段
-        msg = f'校验:共需校验{len(obj_srecord.erase_memory_infos)}个数据段'
+            for erase_memory_info in erase_memory_infos:
+                msg = f'-> 擦除:擦除第{erase_memory_info.erase_number}个数据段,'
+                msg = msg + f'地址为{erase_memory_info.erase_start_address32},'
+                msg = msg + f'长度为{erase_memory_info.erase_length}'
+                print_exec_detail(msg)
+                # 设置内存操作地址
+                addr = int.to_bytes(int(erase_memory_info.erase_start_address32, 16), 4, 'big', signed=False)
+                addr = int.from_bytes(addr, 'little', signed=False)
+                ecec_result = self.set_mta(mta=0,
+                                           addr_offset=0,
+                                           addr_base=addr)
+                # 擦除内存
+                erase_length = int.to_bytes(int(erase_memory_info.erase_length, 16), 4, 'big', signed=False)
+                erase_length = int.from_bytes(erase_length, 'little', signed=False)
+                ecec_result = self.clear_memory(memory_size=erase_length)
+
+            # 编程各数据段
+            msg = f'编程:共需编程{len(erase_memory_infos)}个数据段'
+            print_exec_detail(msg)
+            time_program = time.time()
+            program_bytes = 0  # 已编程的字节数
+            for erase_memory_info in erase_memory_infos:
+                msg = f'-> 编程:编程第{erase_memory_info.erase_number}个数据段,'
+                msg = msg + f'地址为{erase_memory_info.erase_start_address32},'
+                msg = msg + f'长度为{erase_memory_info.erase_length}'
+                print_exec_detail(msg)
+                # 编程
+                time_segment = time.time()
+                program_length = self.program_block(addr=int(erase_memory_info.erase_start_address32, 16),
+                                                    data=erase_memory_info.erase_data_view)
+                program_bytes += program_length
+                time_segment = time.time() - time_segment
+                msg = f'--> 编程:第{erase_memory_info.erase_number}个数据段编程完成,'
+                msg = msg + f'用时{time_segment:.2f}s,速率{program_length / max(time_segment, 1e-6):.0f}字节/s'
+                print_exec_detail(msg)
+            # 编程完所有数据段最后再发送数据全0的编程帧，否则最后一个数据段校验结果不正确
+            ecec_result = self.program(data=[])
+            time_program = time.time() - time_program
+            msg = f'编程:共编程{program_bytes}字节,'
+            msg = msg + f'用时{time_program:.2f}s,平均速率{program_bytes / max(time_program, 1e-6):.0f}字节/s'
+            print_exec_detail(msg)
+        else:
+            msg = f'擦写:所有数据段均与ECU一致,无需擦写'
+            print_exec_detail(msg)
+
+        # 校验各数据段，增量模式下校验所有数据段，
+        # 因擦除以扇区为单位，可能同时擦除了比对一致而跳过擦写的相邻数据段
+        check_memory_infos = obj_srecord.erase_memory_infos if is_delta else erase_memory_infos
+        msg = f'校验:共需校验{len(check_memory_infos)}个数据段'
         print_exec_detail(msg)
-        for erase_memory_info in obj_srecord.erase_memory_infos:
-            # if erase_memory_info.erase_number != obj_srecord.erase_memory_infos[-1].erase_number:
-            #     continue
+        for erase_memory_info in check_memory_infos:
             msg = f'-> 校验:校验第{erase_memory_info.erase_number}个数据段,'
             msg = msg + f'地址为{erase_memory_info.erase_start_address32},'
             msg = msg + f'长度为{erase_memory_info.erase_length}'
             print_exec_detail(msg)
-            # 设置内存操作地址
-            addr = int.to_bytes(int(erase_memory_info.erase_start_address32, 16), 4, 'big', signed=False)
-            addr = int.from_bytes(addr, 'little', signed=False)
-            ecec_result = self.set_mta(mta=0,
-                                       addr_offset=0,
-                                       addr_base=addr)
-            # 校验
-            erase_length = int.to_bytes(int(erase_memory_info.erase_length, 16), 4, 'big', signed=False)
-            erase_length = int.from_bytes(erase_length, 'little', signed=False)
-            ecec_result = self.build_checksum(block_size=erase_length)
-            # 比对校验结果
-            erase_data = bytes.fromhex(erase_memory_info.erase_data)
-            crc_local = Crc16Modbus.calchex(erase_data, byteorder='little')
-            crc_local = ''.join(['0x', crc_local])  # 本地校验结果
-            match_result = (int(crc_local, 16) == ecec_result.data) and '成功' or '失败'
-            msg = f'--> 校验:校验第{erase_memory_info.erase_number}个数据段{match_result},'
-            msg = msg + f'远程校验结果为{hex(ecec_result.data)},'
-            msg = msg + f'本地校验结果为{crc_local}'
+            # 校验并比对校验结果
+            is_match, remote_crc, local_crc = self.__check_segment(obj_srecord, erase_memory_info)
+            msg = f'--> 校验:校验第{erase_memory_info.erase_number}个数据段{is_match and "成功" or "失败"},'
+            msg = msg + f'远程校验结果为{hex(remote_crc)},'
+            msg = msg + f'本地校验结果为{local_crc}'
             print_exec_detail(msg)
-            if int(crc_local, 16) != ecec_result.data:
+            if not is_match:
                 raise EcoPccpException(msg)
 
         # 程序执行起始地址
@@ -1326,6 +1706,8 @@ class DownloadThread(threading.Thread):
     :type seed2key_filepath: str
     :param obj_srecord: 程序记录文件对象
     :type obj_srecord: Srecord
+    :param is_delta: 是否为增量下载，仅擦写与ECU中不一致的数据段
+    :type is_delta: bool
     """
 
     def __init__(self,
@@ -1338,7 +1720,8 @@ class DownloadThread(threading.Thread):
                  device_baudrate: str,
                  download_filepath: str,
                  seed2key_filepath: str,
-                 obj_srecord: Srecord) -> None:
+                 obj_srecord: Srecord,
+                 is_delta: bool = False) -> None:
         """
         构造函数
         """
@@ -1353,6 +1736,7 @@ class DownloadThread(threading.Thread):
         self.__download_filepath = download_filepath
         self.__seed2key_filepath = seed2key_filepath
         self.__obj_srecord = obj_srecord
+        self.__is_delta = is_delta
 
         self.obj_pccp = self.__create_pccp_obj()
         self.__has_open_device = False
@@ -1516,7 +1900,7 @@ class DownloadThread(threading.Thread):
             obj_pccp.unlock(key_data)
             # 擦写数据
             self.print_detail('------擦写数据------')
-            self.__ew_time = obj_pccp.erase_write_data(self.__obj_srecord)
+            self.__ew_time = obj_pccp.erase_write_data(self.__obj_srecord, self.__is_delta)
             # 程序已启动
             if self.__ew_time:
                 self.__has_ecu_reset = True
@@ -1591,6 +1975,9 @@ class Measure(object):
         self.has_measured = False
         self.__has_ecu_reset = False
         self.__ew_time = 0.0
+        self.__daq_acquisition: DaqAcquisition | None = None  # DAQ采集引擎，测量期间有效
+        # 本次连接中已写入ECU的daq列表条目，{(daq列表序号, odt序号, 元素序号): (元素大小, 元素地址)}
+        self.__daq_entries: dict[tuple[int, int, int], tuple[int, int]] = {}
 
     def __del__(self):
         """析构函数"""
@@ -1625,25 +2012,10 @@ class Measure(object):
         :returns: epk字符串
         :rtype: str
         """
-        epk = []
+        epk = bytearray(epk_len)
         self.print_detail('------从ecu获取epk------')
-        # 设置内存操作地址
-        addr = int.to_bytes(epk_addr, 4, 'big', signed=False)
-        addr = int.from_bytes(addr, 'little', signed=False)
-        self.obj_pccp.set_mta(mta=0,
-                              addr_offset=0,
-                              addr_base=addr)
-        upd_sum = epk_len
-        while True:
-            if upd_sum >= 0x5:
-                exec_result = self.obj_pccp.upload(size=0x5)
-                epk.append(exec_result.data)
-                upd_sum -= 0x5
-            else:
-                exec_result = self.obj_pccp.upload(size=upd_sum)
-                epk.append(exec_result.data)
-                break
-        return b''.join(epk).decode('utf-8').rstrip('\x00')
+        self.obj_pccp.upload_block(addr=epk_addr, buffer=epk)
+        return epk.decode('utf-8').rstrip('\x00')
 
     def check_ecu_ram_cal(self, check_addr: int, check_length: int) -> tuple[str, str]:
         """
@@ -1696,26 +2068,15 @@ class Measure(object):
                    f"\n\t地址 -> {hex(addr)}"
                    f"\n\t长度 -> {hex(length)}")
             self.print_detail(msg)
-            # pgm标定区域小于等于校验长度
-            if len(cal_data) <= check_length:
-                # 校验区域1
-                cal_data_1 = cal_data + b'\xff' * (check_length - len(cal_data))
-                cal_value_1 = Crc16Ibm3740.calchex(cal_data_1, byteorder='little')
-                # 校验区域2
-                cal_data_2 = b'\xff' * check_length
-                cal_value_2 = Crc16Ibm3740.calchex(cal_data_2, byteorder='little')
-            # pgm标定区域不大于校验长度
-            else:
-                # 校验区域1
-                cal_data_1 = cal_data[0:check_length]
-                cal_value_1 = Crc16Ibm3740.calchex(cal_data_1, byteorder='little')
-
-                # 校验区域2
-                cal_data_2 = cal_data[check_length:]
-                cal_data_2 += b'\xff' * (check_length - len(cal_data_2))
-                cal_value_2 = Crc16Ibm3740.calchex(cal_data_2, byteorder='little')
-            value1 = '0x' + cal_value_1
-            value2 = '0x' + cal_value_2
+            # 分成两块校验，不足校验长度的部分以0xFF虚拟填充，校验结果由pgm的校验服务按内容缓存
+            algorithm = ChecksumAlgorithm.CRC16_IBM3740
+            cal_view = memoryview(cal_data)
+            # 校验区域1
+            cal_value_1 = pgm.checksums.data(algorithm, cal_view[0:check_length], pad_to=check_length)
+            # 校验区域2
+            cal_value_2 = pgm.checksums.data(algorithm, cal_view[check_length:], pad_to=check_length)
+            value1 = '0x' + checksum_hex(algorithm, cal_value_1, 'little')
+            value2 = '0x' + checksum_hex(algorithm, cal_value_2, 'little')
             self.print_detail(f"pgm_cal_1校验值为{value1}")
             self.print_detail(f"pgm_cal_1校验值为{value2}")
             return value1, value2
@@ -1829,6 +2190,7 @@ class Measure(object):
                 self.print_detail('ecu标定数据区与pgm标定数据区一致', 'done')
             else:
                 self.print_detail('ecu标定数据区与pgm标定数据区不一致', 'error')
+            self.__daq_entries.clear()  # 新的连接中ECU的daq列表内容未知
             self.has_connected = True  # 置位连接标识
             # 返回epk
             return ecu_epk, (int(ecu_cal_1, 16) == int(pgm_cal_1, 16) and int(ecu_cal_2, 16) == int(pgm_cal_2, 16))
@@ -1858,10 +2220,13 @@ class Measure(object):
                 # 终止同步数据传输
                 self.print_detail('------停止同步数据传输------')
                 self.obj_pccp.start_stop_sync_data_transmission(is_start=False)
+            # 停止DAQ采集引擎
+            self.__stop_daq_acquisition()
 
             # 断开连接
             self.print_detail('------断开连接------')
             self.obj_pccp.disconnect(is_temporary=True)
+            self.__daq_entries.clear()
             self.has_connected = False  # 复位连接标识
             self.has_measured = False  # 复位测量标识
             # 关闭设备
@@ -1904,12 +2269,57 @@ class Measure(object):
             self.print_detail(f'发生异常 {e}', 'error')
             self.print_detail(f"{traceback.format_exc()}", 'error')
 
-    def start_measure(self, daqs: dict[int, dict[int, list[ASAP2Measure]]]) -> None:
+    def get_daq_cfgs(self, max_list_number: int = MAX_DAQ_LIST_NUMBER) -> dict[int, dict[str, int]] | None:
+        """
+        依次以GET_DAQ_SIZE查询daq列表0~max_list_number，获取ECU中所有可用的daq列表配置；
+        ECU对不存在或不可用的daq列表返回的odt列表个数为0，此类列表被忽略
+
+        :param max_list_number: 查询的最大daq列表序号
+        :type max_list_number: int
+        :return: daqs_cfg，daq列表配置，{daq列表序号: {'first_pid': int, 'odts_size': int}}
+        :rtype: dict[int, dict[str, int]] or None
+        """
+        try:
+            # 若未连接，则返回
+            if not self.has_connected:
+                return
+
+            # 获取measure对象
+            obj_pccp = self.obj_pccp
+            self.print_detail(f'------获取daq列表配置------')
+            # 设置当前通信状态
+            obj_pccp.set_session_status(expected_status=pcanccp.TCCPSessionStatus(0x0))
+
+            daqs_cfg: dict[int, dict[str, int]] = {}
+            for list_number in range(max_list_number + 1):
+                try:
+                    # 获取daq列表大小
+                    _, first_pid, odts_size = obj_pccp.get_daq_list_size(list_number=list_number,
+                                                                         dto_id=self.__response_can_id).data
+                except EcoPccpException:
+                    # 首个可用列表之前的查询失败可能是ECU不支持该序号，继续查询；之后的失败视为列表已查询完毕
+                    if daqs_cfg:
+                        break
+                    continue
+                if int(odts_size, 16):
+                    daqs_cfg[list_number] = {'first_pid': int(first_pid, 16), 'odts_size': int(odts_size, 16)}
+            return daqs_cfg
+        except Exception as e:
+            # 输出异常信息
+            self.print_detail(f'发生异常 {e}', 'error')
+            self.print_detail(f"{traceback.format_exc()}", 'error')
+
+    def start_measure(self,
+                      daqs: dict[int, dict[int, list[ASAP2Measure]]],
+                      daqs_cfg: dict[int, dict[str, int]]) -> None:
         """
         启动测量流程
 
         :param daqs: daq列表
         :type daqs: dict[int, dict[int, list[ASAP2Measure]]]
+        :param daqs_cfg: daq列表配置，{daq列表序号: {'first_pid': int, 'odts_size': int,
+            'event_channel': int, 'prescaler': int}}
+        :type daqs_cfg: dict[int, dict[str, int]]
         """
         try:
             # 若未连接，则返回
@@ -1919,48 +2329,30 @@ class Measure(object):
             # 获取measure对象
             obj_pccp = self.obj_pccp
             self.print_detail('------设置daq列表启动测量监视流程------')
-            # 设置daq列表指针
-            for daq_number, odts in daqs.items():
-                for odt_number, odt in odts.items():
-                    for element_number in range(len(odt)):
-                        item = odt[element_number]  # 获取监视数据项
-
-                        # msg = (f"设置daq列表->daq:{item.daq_number},odt:{item.odt_number},element:{item.element_number}"
-                        #        f"name:{item.name},size:{item.element_size},addr{item.element_addr}")
-                        # self.print_detail(msg)
-
-                        # self.print_detail('------设置daq列表指针------')
-                        obj_pccp.set_daq_list_ptr(list_number=item.daq_number,
-                                                  odt_number=item.odt_number,
-                                                  element_number=item.element_number)
-                        # self.print_detail('------写入daq列表------')
-                        obj_pccp.write_daq_list_entry(size_element=item.element_size,
-                                                      addr_ext=0,
-                                                      addr=item.element_addr)
+            # 写入daq列表，仅写入与本次连接中上次写入内容不同的条目
+            start_time = time.perf_counter()
+            written, skipped = self.__write_daq_lists(daqs)
+            self.print_detail(f'写入daq列表{written}个条目,跳过未变化的{skipped}个条目,'
+                              f'耗时{(time.perf_counter() - start_time) * 1000:.1f}ms')
 
             # 设置当前通信状态
             self.print_detail('设置当前通信状态')
             obj_pccp.set_session_status(expected_status=pcanccp.TCCPSessionStatus(0x02))
 
             for daq_number, odts in daqs.items():
-                if daq_number == 1:
-                    # 开始数据传输
-                    self.print_detail(f'开始daq{daq_number}数据传输')
-                    last_odt_number = len(odts) - 1
-                    obj_pccp.start_stop_data_transmission(mode=2,
-                                                          list_number=daq_number,
-                                                          last_odt_number=last_odt_number,
-                                                          event_channel=daq_number,
-                                                          prescaler='0x01')
-                elif daq_number == 2:
-                    # 开始数据传输
-                    self.print_detail(f'开始daq{daq_number}数据传输')
-                    last_odt_number = len(odts) - 1
-                    obj_pccp.start_stop_data_transmission(mode=2,
-                                                          list_number=daq_number,
-                                                          last_odt_number=last_odt_number,
-                                                          event_channel=daq_number,
-                                                          prescaler='0x01')
+                # 开始数据传输，由ECU按事件通道及预分频系数降采样
+                event_channel = daqs_cfg[daq_number]['event_channel']
+                prescaler = daqs_cfg[daq_number]['prescaler']
+                self.print_detail(f'开始daq{daq_number}数据传输(事件通道{event_channel},预分频{prescaler})')
+                last_odt_number = len(odts) - 1
+                obj_pccp.start_stop_data_transmission(mode=2,
+                                                      list_number=daq_number,
+                                                      last_odt_number=last_odt_number,
+                                                      event_channel=event_channel,
+                                                      prescaler=hex(prescaler))
+            # 启动DAQ采集引擎
+            self.__daq_acquisition = DaqAcquisition(obj_pccp.obj_pccp, obj_pccp.ccp_handle)
+            self.__daq_acquisition.start()
             # 开始同步数据传输
             self.print_detail('------启动同步数据传输------')
             obj_pccp.start_stop_sync_data_transmission(is_start=True)
@@ -1970,6 +2362,40 @@ class Measure(object):
             # 输出异常信息
             self.print_detail(f'发生异常 {e}', 'error')
             self.print_detail(f"{traceback.format_exc()}", 'error')
+            self.__stop_daq_acquisition()
+
+    def __write_daq_lists(self, daqs: dict[int, dict[int, list[ASAP2Measure]]]) -> tuple[int, int]:
+        """
+        写入daq列表条目，与本次连接中已写入ECU的条目逐一比对，只对发生变化的条目执行SET_DAQ_PTR和WRITE_DAQ；
+        未被新配置覆盖的旧条目保留在ECU中，其所在odt不被传输或其数据不被解码
+
+        :param daqs: daq列表
+        :type daqs: dict[int, dict[int, list[ASAP2Measure]]]
+        :return: (写入的条目数, 跳过的条目数)
+        :rtype: tuple[int, int]
+        """
+        obj_pccp = self.obj_pccp
+        daq_entries = self.__daq_entries
+        written = skipped = 0
+        for odts in daqs.values():
+            for odt in odts.values():
+                for item in odt:
+                    key = (item.daq_number, item.odt_number, item.element_number)
+                    entry = (item.element_size, int(item.element_addr, 16))
+                    if daq_entries.get(key) == entry:
+                        skipped += 1
+                        continue
+                    # 写入失败时ECU中该条目的内容未知，先移除记录，写入成功后再记录
+                    daq_entries.pop(key, None)
+                    obj_pccp.set_daq_list_ptr(list_number=item.daq_number,
+                                              odt_number=item.odt_number,
+                                              element_number=item.element_number)
+                    obj_pccp.write_daq_list_entry(size_element=item.element_size,
+                                                  addr_ext=0,
+                                                  addr=item.element_addr)
+                    daq_entries[key] = entry
+                    written += 1
+        return written, skipped
 
     def stop_measure(self) -> None:
         """
@@ -1985,11 +2411,35 @@ class Measure(object):
             self.obj_pccp.start_stop_sync_data_transmission(is_start=False)
 
             self.has_measured = False  # 复位测量标识
+            # 停止DAQ采集引擎
+            self.__stop_daq_acquisition()
         except Exception as e:
             # 输出异常信息
             self.print_detail(f'发生异常 {e}', 'error')
             self.print_detail(f"{traceback.format_exc()}", 'error')
 
+    def __stop_daq_acquisition(self) -> None:
+        """
+        停止DAQ采集引擎并打印采集统计信息
+
+        """
+        if self.__daq_acquisition is None or not self.__daq_acquisition.is_running:
+            return
+        self.__daq_acquisition.stop()
+        stat = self.__daq_acquisition.statistics
+        msg = f'DAQ采集统计 -> 接收{stat.frames}帧,丢弃{stat.dropped}帧,缓冲区溢出{stat.overruns}次'
+        self.print_detail(msg, 'warning' if stat.dropped else None)
+
+    @property
+    def daq_acquisition(self) -> DaqAcquisition | None:
+        """
+        DAQ采集引擎，启动测量后有效
+
+        :return: DAQ采集引擎
+        :rtype: DaqAcquisition | None
+        """
+        return self.__daq_acquisition
+
     def read_dto_msg(self) -> list[int] | None:
         """
         读取pid数据
@@ -2011,15 +2461,17 @@ class Measure(object):
         # 若已连接，则清空
         if self.has_connected:
             self.obj_pccp.reset()
+            if self.__daq_acquisition is not None:
+                self.__daq_acquisition.ring.discard()
 
-    def write_ram_cal(self, addr: int, data: Union[list[int], bytes, bytearray]) -> bool | None:
+    def write_ram_cal_block(self, addr: int, data: Union[bytes, bytearray]) -> bool | None:
         """
-        写入ram标定数据，最多5字节
+        写入一段连续的ram标定数据，长度不限，只设置一次MTA0，之后以DNLOAD_6/DNLOAD连续下载
 
-        :param addr: 标定地址
+        :param addr: 起始标定地址
         :type addr: int
         :param data: 要标定的数据
-        :type data: list[int] or bytes or bytearray
+        :type data: bytes or bytearray
         :return: 若执行成功，返回True
         :rtype: bool or None
         """
@@ -2027,57 +2479,134 @@ class Measure(object):
             # 若未连接，则返回
             if not self.has_connected:
                 return
-            addr = int.to_bytes(addr, 4, 'big', signed=False)
-            addr = int.from_bytes(addr, 'little', signed=False)
-            self.obj_pccp.set_mta(mta=0,
-                                  addr_offset=0,
-                                  addr_base=addr)
-            exec_result = self.obj_pccp.download(data=data)
-            return exec_result.is_success
+            self.obj_pccp.download_block(addr=addr, data=data)
+            return True
         except Exception as e:
             # 输出异常信息
             self.print_detail(f'发生异常 {e}', 'error')
             self.print_detail(f"{traceback.format_exc()}", 'error')
 
-    def read_ram_cal(self, addr: int, length: int) -> bytes | None:
+    def read_ram_cal(self,
+                     addr: int,
+                     length: int,
+                     progress: Callable[[int, int, float], None] | None = None,
+                     verify_algorithm: ChecksumAlgorithm | None = None) -> tuple[bytes, bool | None] | None:
         """
-        读取ram标定数据
+        读取ram标定数据，上传到预分配的缓冲区；
+        可选按块以BUILD_CHKSUM校验上传的数据，校验不一致的块重新上传一次
 
         :param addr: 标定地址
         :type addr: int
         :param length: 长度
         :type length: int
-        :return: 若执行成功，返回数据序列
-        :rtype: bytes or None
+        :param progress: 进度回调函数，参数为(已上传的字节数, 总字节数, 平均速率(字节/秒))，
+            至多每UPLOAD_PROGRESS_INTERVAL_S秒调用一次，上传完成时必定调用一次
+        :type progress: Callable[[int, int, float], None] | None
+        :param verify_algorithm: ECU执行BUILD_CHKSUM所用的校验算法，为None时不校验
+        :type verify_algorithm: ChecksumAlgorithm | None
+        :return: 若执行成功，返回(数据序列, 校验结果)，校验结果为None表示未校验或ECU不支持校验
+        :rtype: tuple[bytes, bool | None] or None
         """
         try:
             # 若未连接，则返回
             if not self.has_connected:
                 return
 
-            upd_data = []
-            # 设置内存操作地址
-            addr = int.to_bytes(addr, 4, 'big', signed=False)
-            addr = int.from_bytes(addr, 'little', signed=False)
-            self.obj_pccp.set_mta(mta=0,
-                             addr_offset=0,
-                             addr_base=addr)
-            upd_sum = length
-            while True:
-                if upd_sum >= 0x5:
-                    exec_result = self.obj_pccp.upload(size=0x5)
-                    upd_data.append(exec_result.data)
-                    upd_sum -= 0x5
-                else:
-                    exec_result = self.obj_pccp.upload(size=upd_sum)
-                    upd_data.append(exec_result.data)
-                    break
-            return b''.join(upd_data)
+            buffer = bytearray(length)
+            start_time = time.perf_counter()
+            last_report_time = 0.0
+
+            def _report(done: int) -> None:
+                """
+                按最小间隔回调上传进度
+
+                :param done: 已上传的字节数
+                :type done: int
+                """
+                nonlocal last_report_time
+                now = time.perf_counter()
+                if done < length and now - last_report_time < UPLOAD_PROGRESS_INTERVAL_S:
+                    return
+                last_report_time = now
+                elapsed = now - start_time
+                progress(done, length, done / elapsed if elapsed > 0 else 0.0)
+
+            self.obj_pccp.upload_block(addr=addr,
+                                       buffer=buffer,
+                                       progress=_report if progress is not None else None)
+            elapsed = time.perf_counter() - start_time
+            self.print_detail(f'上传{hex(length)}字节,耗时{elapsed:.2f}s,'
+                              f'平均速率{length / elapsed if elapsed > 0 else 0.0:.0f}B/s')
+            verified = None
+            if verify_algorithm is not None:
+                verified = self.__verify_upload(addr=addr, buffer=buffer, algorithm=verify_algorithm)
+            return bytes(buffer), verified
         except Exception as e:
             # 输出异常信息
             self.print_detail(f'发生异常 {e}', 'error')
             self.print_detail(f"{traceback.format_exc()}", 'error')
 
+    def __verify_upload(self, addr: int, buffer: bytearray, algorithm: ChecksumAlgorithm) -> bool | None:
+        """
+        按UPLOAD_VERIFY_CHUNK_SIZE分块，以BUILD_CHKSUM校验上传的数据，校验不一致的块重新上传一次；
+        重新上传后仍不一致时，视为ECU的校验算法与指定的不同，停止校验；
+        校验命令执行失败时(例如ECU不支持BUILD_CHKSUM)，跳过校验
+
+        :param addr: 上传起始地址
+        :type addr: int
+        :param buffer: 上传的数据，重新上传的块直接写入其中
+        :type buffer: bytearray
+        :param algorithm: ECU执行BUILD_CHKSUM所用的校验算法
+        :type algorithm: ChecksumAlgorithm
+        :return: 所有块是否校验一致，跳过校验时为None
+        :rtype: bool | None
+        """
+        view = memoryview(buffer)
+        reread = 0  # 重新上传的块数
+        try:
+            for offset in range(0, len(view), UPLOAD_VERIFY_CHUNK_SIZE):
+                chunk = view[offset:offset + UPLOAD_VERIFY_CHUNK_SIZE]
+                if self.__check_chunk(addr=addr + offset, chunk=chunk, algorithm=algorithm):
+                    continue
+                self.print_detail(f'地址{hex(addr + offset)}处的数据块校验不一致,重新上传', 'warning')
+                reread += 1
+                self.obj_pccp.upload_block(addr=addr + offset, buffer=chunk)
+                if not self.__check_chunk(addr=addr + offset, chunk=chunk, algorithm=algorithm):
+                    self.print_detail(f'地址{hex(addr + offset)}处的数据块重新上传后仍校验不一致,停止校验', 'warning')
+                    return False
+        except EcoPccpException as e:
+            self.print_detail(f'上传数据校验失败 {e},跳过校验', 'warning')
+            return None
+        self.print_detail(f'上传数据校验一致,重新上传{reread}块', 'done')
+        return True
+
+    def __check_chunk(self, addr: int, chunk: memoryview, algorithm: ChecksumAlgorithm) -> bool:
+        """
+        以BUILD_CHKSUM校验ECU中的一块数据，并与本地数据的校验值比对
+
+        :param addr: 数据块地址
+        :type addr: int
+        :param chunk: 本地数据块
+        :type chunk: memoryview
+        :param algorithm: ECU执行BUILD_CHKSUM所用的校验算法
+        :type algorithm: ChecksumAlgorithm
+        :return: 是否一致
+        :rtype: bool
+        """
+        # 设置内存操作地址
+        addr = int.to_bytes(addr, 4, 'big', signed=False)
+        addr = int.from_bytes(addr, 'little', signed=False)
+        self.obj_pccp.set_mta(mta=0,
+                              addr_offset=0,
+                              addr_base=addr)
+        # 校验
+        size = int.to_bytes(len(chunk), 4, 'big', signed=False)
+        size = int.from_bytes(size, 'little', signed=False)
+        exec_result = self.obj_pccp.build_checksum(block_size=size)
+        # 本地校验结果，与ECU返回的校验值按相同字节序比对
+        checksum_local = int(checksum_hex(algorithm, calc_checksum(algorithm, [chunk]), 'little'), 16)
+        return checksum_local == exec_result.data
+
     def write_rom_cal(self, addr_rom: int, addr_ram: int, length: int, data: bytes) -> bool | None:
         """
         写入rom标定数据后，复制到ram区
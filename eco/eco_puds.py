@@ -957,14 +957,14 @@ class EcoPudsFunc(object):
 
     def transfer_data(self,
                       block_sequence_counter: int,
-                      data: list[int]) -> ExecResult:
+                      data: Union[list[int], bytes, bytearray, memoryview]) -> ExecResult:
         """
         数据传输
 
         :param block_sequence_counter: 块序列计数器
         :type block_sequence_counter: int
         :param data: 数据列表
-        :type data: list[int]
+        :type data: list[int] or bytes or bytearray or memoryview
         :return: 执行结果ExecResult
         :rtype: ExecResult
         :raises EcoPudsException: 参数错误；数据传输失败
@@ -976,8 +976,7 @@ class EcoPudsFunc(object):
         if data:
             transfer_request_parameter_record_size = len(data)
             transfer_request_parameter_record = ctypes.create_string_buffer(transfer_request_parameter_record_size)
-            for i in range(transfer_request_parameter_record_size):
-                transfer_request_parameter_record[i] = get_c_char(ord(chr(data[i])))
+            transfer_request_parameter_record.raw = bytes(data)
         else:
             msg = f'数据传输参数错误:无效的负载数据'
             print_exec_detail(msg)
@@ -1098,16 +1097,20 @@ class EcoPudsFunc(object):
         return exec_result
 
     def erase_write_data(self,
-                         obj_srecord: Srecord) -> float:
+                         obj_srecord: Srecord,
+                         is_delta: bool = False) -> float:
         """
         将Srecord文件的S3数据，擦除并写入Flash
         擦写流程：
         对于每个连续擦写段执行routine_control(擦除内存)后，再执行request_download(请求下载),
         将擦写段分成单个或多个block执行transfer_data(数据传输),当前擦写段的所有block传输完毕执行request_transfer_exit(退出传输),
-        然后开始下一段擦写,直到将所有的擦写段擦写完毕
+        然后开始下一段擦写,直到将所有的擦写段擦写完毕；
+        增量模式下，擦写前先执行routine_control(检查数据完整性)比对程序文件的CRC32校验值，ECU中的数据一致时跳过擦写
 
         :param obj_srecord: Srecord对象，对象中包含erase_memory_infos属性，此属性含有各连续擦写数据段的详细信息
         :type obj_srecord: Srecord
+        :param is_delta: 是否为增量模式，ECU中的数据与程序文件一致时跳过擦写
+        :type is_delta: bool
         :return: 返回执行时间，单位s
         :rtype: float
         :raises EcoPudsException: Srecord对象为空；执行擦除内存未得到有效反馈；执行请求下载未得到有效反馈；执行数据传输未得到有效反馈；
@@ -1134,6 +1137,22 @@ class EcoPudsFunc(object):
             print_exec_detail(msg)
             raise EcoPudsException(msg)
 
+        # 增量模式，由ECU检查数据完整性，一致则无需擦写
+        if is_delta:
+            msg = f'比对:检查ECU中的数据与程序文件CRC32校验值{[hex(b) for b in obj_srecord.crc32_values]}是否一致'
+            print_exec_detail(msg)
+            try:
+                self.routine_control(self.obj_puds.PUDS_SVC_PARAM_RC_STR,
+                                     routine_id=0x0202,
+                                     data=obj_srecord.crc32_values)
+            except EcoPudsException:
+                msg = f'比对:ECU中的数据与程序文件不一致,需擦写所有数据段'
+                print_exec_detail(msg)
+            else:
+                msg = f'比对:ECU中的数据与程序文件一致,无需擦写'
+                print_exec_detail(msg)
+                return time.time() - time_start
+
         msg = f'擦写:共需擦写{len(obj_srecord.erase_memory_infos)}个数据段'
         print_exec_detail(msg)
         for erase_memory_info in obj_srecord.erase_memory_infos:
@@ -1175,7 +1194,7 @@ class EcoPudsFunc(object):
 
             # 数据传输
             block_size -= 2  # 减去命令标识与块序列计数器2个字节
-            erase_data = [byte for byte in bytes.fromhex(erase_memory_info.erase_data)]
+            erase_data = erase_memory_info.erase_data_view
             if block_size >= len(erase_data):
                 block_sum = 1
             else:
@@ -1272,6 +1291,8 @@ class DownloadThread(threading.Thread):
     :type seed2key_filepath: str
     :param obj_srecord: 程序记录文件对象
     :type obj_srecord: Srecord
+    :param is_delta: 是否为增量下载，ECU中的数据与程序文件一致时跳过擦写
+    :type is_delta: bool
     """
     def __init__(self,
                  request_can_id: str,
@@ -1281,7 +1302,8 @@ class DownloadThread(threading.Thread):
                  device_baudrate: str,
                  download_filepath: str,
                  seed2key_filepath: str,
-                 obj_srecord: Srecord) -> None:
+                 obj_srecord: Srecord,
+                 is_delta: bool = False) -> None:
         """
         构造函数
         """
@@ -1294,6 +1316,7 @@ class DownloadThread(threading.Thread):
         self.__download_filepath = download_filepath
         self.__seed2key_filepath = seed2key_filepath
         self.__obj_srecord = obj_srecord
+        self.__is_delta = is_delta
 
         self.obj_flash = self.__create_flash_obj()
         self.__has_open_device = False
@@ -1505,7 +1528,7 @@ class DownloadThread(threading.Thread):
             obj_flash.security_access(obj_flash.obj_puds.PUDS_SVC_PARAM_SA_SK_4, data=key_data)
             # 擦写数据
             self.print_detail('------擦写数据------')
-            self.__ew_time = obj_flash.erase_write_data(self.__obj_srecord)
+            self.__ew_time = obj_flash.erase_write_data(self.__obj_srecord, self.__is_delta)
             # 检查数据完整性
             self.print_detail('------检查数据完整性------')
             obj_flash.routine_control(obj_flash.obj_puds.PUDS_SVC_PARAM_RC_STR,
@@ -7,3 +7,6 @@
 
 
 from .srecord import Srecord
+from .memory_image import MemoryImage, ImageSegment
+from .checksum import ChecksumAlgorithm, ChecksumService, checksum_hex
+from .srecord_cache import SrecordCache, srecord_cache, load_srecord
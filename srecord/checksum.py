@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @author  : ZYD
+# @version : V1.0.0
+# @function:
+"""
+内存映像校验服务，
+统一计算CRC-32/BZIP2、CRC-16/MODBUS、CRC-16/IBM-3740校验值，
+内存映像中的区域按(算法, 地址, 长度, 填充长度)缓存校验结果，可修改的数据(如标定区副本)按内容哈希缓存校验结果，
+不足校验长度时以0xFF虚拟填充，不生成填充后的数据副本
+"""
+
+
+##############################
+# Module imports
+##############################
+from collections import OrderedDict
+from enum import Enum
+from typing import Iterable
+import hashlib
+
+from crccheck.crc import Crc16Modbus, Crc16Ibm3740
+
+from utils import Crc32Bzip2
+
+from .memory_image import MemoryImage, ImageSegment
+
+
+##############################
+# Constant definitions
+##############################
+PAD_BYTE = 0xFF  # 虚拟填充字节
+PAD_BLOCK = memoryview(bytes([PAD_BYTE]) * 4096)  # 虚拟填充时每次输入校验算法的数据块
+MAX_DATA_ENTRIES = 16  # 按内容哈希缓存的校验结果最大条目数
+
+
+##############################
+# Type definitions
+##############################
+
+class ChecksumAlgorithm(Enum):
+    """
+    校验算法
+
+    :cvar CRC32_BZIP2: CRC-32/BZIP2，用于UDS刷写后的程序校验
+    :cvar CRC16_MODBUS: CRC-16/MODBUS，用于CCP刷写后各数据段的校验(BUILD_CHKSUM)
+    :cvar CRC16_IBM3740: CRC-16/IBM-3740，用于CCP标定区的校验(BUILD_CHKSUM)
+    """
+    CRC32_BZIP2 = 'CRC-32/BZIP2'
+    CRC16_MODBUS = 'CRC-16/MODBUS'
+    CRC16_IBM3740 = 'CRC-16/IBM-3740'
+
+    @property
+    def width(self) -> int:
+        """
+        校验值的字节数
+
+        :return: 校验值的字节数
+        :rtype: int
+        """
+        return 4 if self is ChecksumAlgorithm.CRC32_BZIP2 else 2
+
+
+##############################
+# Function definitions
+##############################
+
+def calc_checksum(algorithm: ChecksumAlgorithm,
+                  chunks: Iterable[bytes | bytearray | memoryview],
+                  pad_length: int = 0) -> int:
+    """
+    按顺序输入各数据块计算校验值，数据块之后再虚拟填充pad_length个0xFF
+
+    :param algorithm: 校验算法
+    :type algorithm: ChecksumAlgorithm
+    :param chunks: 按顺序排列的数据块
+    :type chunks: Iterable[bytes | bytearray | memoryview]
+    :param pad_length: 虚拟填充的0xFF字节数
+    :type pad_length: int
+    :return: 校验值
+    :rtype: int
+    """
+    if algorithm is ChecksumAlgorithm.CRC32_BZIP2:
+        obj_crc = Crc32Bzip2(poly=0x04C11DB7,
+                             init_crc=0xFFFFFFFF,
+                             ref_in=False,
+                             ref_out=False,
+                             xor_out=0xFFFFFFFF)
+        update = obj_crc.update
+    else:
+        obj_crc = Crc16Modbus() if algorithm is ChecksumAlgorithm.CRC16_MODBUS else Crc16Ibm3740()
+        update = obj_crc.process
+    for chunk in chunks:
+        update(chunk)
+    while pad_length > 0:
+        block = PAD_BLOCK[:pad_length]
+        update(block)
+        pad_length -= len(block)
+    if algorithm is ChecksumAlgorithm.CRC32_BZIP2:
+        return obj_crc.crc32_int
+    return obj_crc.final()
+
+
+def checksum_hex(algorithm: ChecksumAlgorithm, value: int, byteorder: str = 'big') -> str:
+    """
+    校验值按指定字节序转换为16进制序列，与crccheck的calchex结果一致
+
+    :param algorithm: 校验算法
+    :type algorithm: ChecksumAlgorithm
+    :param value: 校验值
+    :type value: int
+    :param byteorder: 字节序，'big'或'little'
+    :type byteorder: str
+    :return: 16进制序列(不含0x)，例如：'374b'
+    :rtype: str
+    """
+    return value.to_bytes(algorithm.width, byteorder, signed=False).hex()
+
+
+##############################
+# ChecksumService API function declarations
+##############################
+
+class ChecksumService(object):
+    """
+    内存映像校验服务，校验结果按需计算并缓存；
+    内存映像只读，故区域校验结果在服务的生命周期内一直有效，
+    服务随解析结果共享，通过解析缓存重复加载同一程序文件时不再重复计算
+
+    :param memory_image: 稀疏内存映像
+    :type memory_image: MemoryImage
+    """
+
+    def __init__(self, memory_image: MemoryImage) -> None:
+        """
+        构造函数
+        """
+        self.__memory_image = memory_image
+        # 内存映像区域的校验结果，{(算法, 地址, 长度, 填充长度): 校验值}，地址为None表示所有内存段
+        self.__region_values: dict[tuple[ChecksumAlgorithm, int | None, int, int], int] = {}
+        # 可修改数据的校验结果，{(算法, 内容哈希, 长度, 填充长度): 校验值}
+        self.__data_values: OrderedDict[tuple[ChecksumAlgorithm, str, int, int], int] = OrderedDict()
+
+    def image(self, algorithm: ChecksumAlgorithm) -> int:
+        """
+        所有内存段数据按地址顺序拼接(不填充段间空隙)后的校验值
+
+        :param algorithm: 校验算法
+        :type algorithm: ChecksumAlgorithm
+        :return: 校验值
+        :rtype: int
+        """
+        key = (algorithm, None, self.__memory_image.size, 0)
+        value = self.__region_values.get(key)
+        if value is None:
+            value = calc_checksum(algorithm, (segment.view() for segment in self.__memory_image))
+            self.__region_values[key] = value
+        return value
+
+    def segment(self, algorithm: ChecksumAlgorithm, segment: ImageSegment) -> int:
+        """
+        一个内存段的校验值
+
+        :param algorithm: 校验算法
+        :type algorithm: ChecksumAlgorithm
+        :param segment: 内存段
+        :type segment: ImageSegment
+        :return: 校验值
+        :rtype: int
+        """
+        return self.region(algorithm, segment.start_address, segment.length)
+
+    def region(self, algorithm: ChecksumAlgorithm, address: int, length: int, pad_to: int = 0) -> int:
+        """
+        内存映像中一段区域的校验值，区域不可跨越内存段；
+        区域长度小于pad_to时，以0xFF虚拟填充至pad_to
+
+        :param algorithm: 校验算法
+        :type algorithm: ChecksumAlgorithm
+        :param address: 区域起始地址
+        :type address: int
+        :param length: 区域长度
+        :type length: int
+        :param pad_to: 校验长度，为0时不填充
+        :type pad_to: int
+        :return: 校验值
+        :rtype: int
+        :raises MemoryImageException: 地址不存在；范围跨越内存段
+        """
+        pad_length = max(0, pad_to - length)
+        key = (algorithm, address, length, pad_length)
+        value = self.__region_values.get(key)
+        if value is None:
+            value = calc_checksum(algorithm, (self.__memory_image.read(address, length),), pad_length)
+            self.__region_values[key] = value
+        return value
+
+    def data(self, algorithm: ChecksumAlgorithm, data: bytes | bytearray | memoryview, pad_to: int = 0) -> int:
+        """
+        任意(可修改的)数据的校验值，按内容哈希缓存，内容未变化时不再重复计算；
+        数据长度小于pad_to时，以0xFF虚拟填充至pad_to
+
+        :param algorithm: 校验算法
+        :type algorithm: ChecksumAlgorithm
+        :param data: 数据
+        :type data: bytes | bytearray | memoryview
+        :param pad_to: 校验长度，为0时不填充
+        :type pad_to: int
+        :return: 校验值
+        :rtype: int
+        """
+        pad_length = max(0, pad_to - len(data))
+        key = (algorithm, hashlib.blake2b(data, digest_size=16).hexdigest(), len(data), pad_length)
+        value = self.__data_values.get(key)
+        if value is None:
+            value = calc_checksum(algorithm, (data,), pad_length)
+            self.__data_values[key] = value
+            while len(self.__data_values) > MAX_DATA_ENTRIES:
+                self.__data_values.popitem(last=False)
+        else:
+            self.__data_values.move_to_end(key)
+        return value
+
+    def clear(self) -> None:
+        """
+        清空已缓存的校验结果
+
+        """
+        self.__region_values.clear()
+        self.__data_values.clear()
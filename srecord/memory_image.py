@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @author  : ZYD
+# @version : V1.0.0
+# @function:
+"""
+稀疏内存映像，
+以按地址排序的连续内存段保存程序数据，每个内存段由bytearray存储，
+对外通过memoryview提供零拷贝的数据切片，避免16进制字符串与字节序列之间的反复转换
+"""
+
+
+##############################
+# Module imports
+##############################
+from bisect import bisect_right
+
+
+##############################
+# Type definitions
+##############################
+
+class MemoryImageException(Exception):
+    """
+    MemoryImage异常类
+
+    :param message: 要显示的异常消息
+    :type message: str
+    """
+
+    def __init__(self, message: str):
+        """
+        构造函数
+        """
+        self.message = message
+
+    def __str__(self):
+        return f"{self.message}"
+
+
+class ImageSegment(object):
+    """
+    一段地址连续的内存数据
+
+    :param start_address: 内存段起始地址
+    :type start_address: int
+    :param data: 内存段数据
+    :type data: bytearray
+    """
+
+    __slots__ = ('start_address', 'data')
+
+    def __init__(self, start_address: int, data: bytearray = None) -> None:
+        """
+        构造函数
+        """
+        self.start_address = start_address  # 内存段起始地址
+        self.data = data if data is not None else bytearray()  # 内存段数据
+
+    @property
+    def length(self) -> int:
+        """
+        内存段长度(单位Byte)
+
+        :return: 内存段长度
+        :rtype: int
+        """
+        return len(self.data)
+
+    @property
+    def end_address(self) -> int:
+        """
+        内存段结束地址(不包含)
+
+        :return: 内存段结束地址
+        :rtype: int
+        """
+        return self.start_address + len(self.data)
+
+    def view(self, offset: int = 0, length: int | None = None) -> memoryview:
+        """
+        获取内存段数据的零拷贝切片
+
+        :param offset: 相对内存段起始地址的偏移(0基)
+        :type offset: int
+        :param length: 切片长度，为None时至内存段结尾
+        :type length: int | None
+        :return: 数据切片
+        :rtype: memoryview
+        """
+        mv = memoryview(self.data)
+        if length is None:
+            return mv[offset:]
+        return mv[offset:offset + length]
+
+
+##############################
+# MemoryImage API function declarations
+##############################
+
+class MemoryImage(object):
+    """
+    稀疏内存映像，由按起始地址升序排列、互不重叠的内存段组成
+    """
+
+    def __init__(self) -> None:
+        """
+        构造函数
+        """
+        self.__segments: list[ImageSegment] = []  # 按起始地址升序排列的内存段
+        self.__starts: list[int] = []  # 各内存段起始地址，用于二分查找
+
+    def append(self, address: int, data: bytes | bytearray | memoryview) -> None:
+        """
+        在映像尾部追加数据，若与最后一个内存段地址相接则合并，否则新建内存段
+
+        :param address: 数据起始地址
+        :type address: int
+        :param data: 数据
+        :type data: bytes | bytearray | memoryview
+        :raises MemoryImageException: 地址非单调递增
+        """
+        if self.__segments:
+            last = self.__segments[-1]
+            if address == last.end_address:
+                last.data += data
+                return
+            if address < last.end_address:
+                msg = f"内存映像追加地址{hex(address)}非单调递增"
+                raise MemoryImageException(msg)
+        self.__segments.append(ImageSegment(start_address=address, data=bytearray(data)))
+        self.__starts.append(address)
+
+    def find_segment(self, address: int) -> ImageSegment | None:
+        """
+        查找包含指定地址的内存段
+
+        :param address: 地址
+        :type address: int
+        :return: 包含该地址的内存段，不存在则返回None
+        :rtype: ImageSegment | None
+        """
+        idx = bisect_right(self.__starts, address) - 1
+        if idx >= 0:
+            segment = self.__segments[idx]
+            if address < segment.end_address:
+                return segment
+        return None
+
+    def read(self, address: int, length: int) -> memoryview:
+        """
+        读取指定地址和长度的数据(零拷贝)，数据不可跨越内存段
+
+        :param address: 起始地址
+        :type address: int
+        :param length: 长度
+        :type length: int
+        :return: 数据切片
+        :rtype: memoryview
+        :raises MemoryImageException: 地址不存在；范围跨越内存段
+        """
+        segment = self.find_segment(address)
+        if segment is None:
+            msg = f"内存映像中不存在地址{hex(address)}"
+            raise MemoryImageException(msg)
+        if address + length > segment.end_address:
+            msg = f"内存映像中地址{hex(address)}起长度{hex(length)}的范围超出内存段"
+            raise MemoryImageException(msg)
+        return segment.view(address - segment.start_address, length)
+
+    def tobytes(self) -> bytes:
+        """
+        将所有内存段数据按地址顺序拼接(不填充段间空隙)
+
+        :return: 拼接后的数据
+        :rtype: bytes
+        """
+        return b''.join(segment.data for segment in self.__segments)
+
+    @property
+    def segments(self) -> list[ImageSegment]:
+        """
+        所有内存段
+
+        :return: 按起始地址升序排列的内存段
+        :rtype: list[ImageSegment]
+        """
+        return self.__segments
+
+    @property
+    def size(self) -> int:
+        """
+        所有内存段的数据总长度
+
+        :return: 数据总长度(单位Byte)
+        :rtype: int
+        """
+        return sum(len(segment.data) for segment in self.__segments)
+
+    def __len__(self) -> int:
+        return len(self.__segments)
+
+    def __iter__(self):
+        return iter(self.__segments)
@@ -7,7 +7,8 @@
 解析.mot/.s19/.srec格式的SRecord记录文件,
 获取S0中的描述信息保存在属性describe_info:str，
 获取S3数据记录保存在属性s3records:List[S3Record]，
-获取S3记录的擦写内存区域信息保存在属性erase_memory_infos:List[EraseMemoryInfo]
+获取S3记录的擦写内存区域信息保存在属性erase_memory_infos:List[EraseMemoryInfo]，
+S3数据在解析时一次性写入稀疏内存映像memory_image:MemoryImage，各擦写内存区域的数据均为其零拷贝切片
 
 SRecord格式
 SRecord文件是由Motorola公司定义的一种ASCII文本文件，
@@ -30,12 +31,22 @@ CheckSum：一个字节长度，2个十六进制字符，表示Byte count、Addr
 ##############################
 # Module imports
 ##############################
+from array import array
+from binascii import unhexlify, Error as BinasciiError
 import os
 import shutil
 import time
 
 from utils import pad_hex
-from utils import Crc32Bzip2 as Crc32
+
+from .checksum import ChecksumAlgorithm, ChecksumService
+from .memory_image import MemoryImage, MemoryImageException
+
+
+##############################
+# Constant definitions
+##############################
+READ_CHUNK_SIZE = 1 << 20  # 流式解析时每次读取文件的字节数
 
 
 ##############################
@@ -122,8 +133,8 @@ class EraseMemoryInfo(object):
     :type erase_start_address32: str
     :param erase_length: 本段擦写内存的长度，单位Byte(0x开头16进制)
     :type erase_length: str
-    :param erase_data: 本段擦写数据(16进制序列)
-    :type erase_data: str
+    :param erase_data_view: 本段擦写数据(内存映像的零拷贝切片)
+    :type erase_data_view: memoryview
     :param erase_memory_record: 本段擦写内存的首尾行记录
     :type erase_memory_record: EraseMemoryRecord
     """
@@ -132,7 +143,7 @@ class EraseMemoryInfo(object):
                  erase_number: int,
                  erase_start_address32: str,
                  erase_length: str,
-                 erase_data: str,
+                 erase_data_view: memoryview,
                  erase_memory_record: EraseMemoryRecord
                  ):
         """
@@ -141,9 +152,66 @@ class EraseMemoryInfo(object):
         self.erase_number = erase_number  # 擦写内存段的标号(第几段连续内存区域)
         self.erase_start_address32 = erase_start_address32  # 本段擦写内存的起始地址
         self.erase_length = erase_length  # 本段擦写内存的长度Byte
-        self.erase_data = erase_data  # 本段擦写数据
+        self.erase_data_view = erase_data_view  # 本段擦写数据(零拷贝切片)
         self.erase_memory_record = erase_memory_record  # 本段擦写内存的首尾行记录
 
+    @property
+    def erase_data(self) -> str:
+        """
+        本段擦写数据的16进制序列，按需由内存映像生成，仅用于兼容旧接口
+
+        :return: 本段擦写数据(16进制序列)
+        :rtype: str
+        """
+        return self.erase_data_view.hex().upper()
+
+
+class SrecordParseResult(object):
+    """
+    Srecord文件解析后的只读结果，可在多个Srecord对象间共享(例如通过解析缓存)
+
+    :param memory_image: S3数据记录的稀疏内存映像
+    :type memory_image: MemoryImage
+    :param segment_bounds: 各内存段首尾记录在记录索引中的序号
+    :type segment_bounds: list[tuple[int, int]]
+    :param rec_addrs: 记录索引，各S3数据记录的起始地址
+    :type rec_addrs: array
+    :param rec_lengths: 记录索引，各S3数据记录的数据长度
+    :type rec_lengths: array
+    :param rec_lines: 记录索引，各S3数据记录在源文件中的行号(1基)
+    :type rec_lines: array
+    :param describe_info: S0中的描述信息
+    :type describe_info: str
+    :param pgm_start_addr: S7中的程序起始地址信息
+    :type pgm_start_addr: list[int]
+    :param checksums: 内存映像校验服务
+    :type checksums: ChecksumService
+    """
+
+    __slots__ = ('memory_image', 'segment_bounds', 'rec_addrs', 'rec_lengths', 'rec_lines',
+                 'describe_info', 'pgm_start_addr', 'checksums')
+
+    def __init__(self,
+                 memory_image: MemoryImage,
+                 segment_bounds: list[tuple[int, int]],
+                 rec_addrs: array,
+                 rec_lengths: array,
+                 rec_lines: array,
+                 describe_info: str,
+                 pgm_start_addr: list[int],
+                 checksums: ChecksumService) -> None:
+        """
+        构造函数
+        """
+        self.memory_image = memory_image  # S3数据记录的稀疏内存映像
+        self.segment_bounds = segment_bounds  # 各内存段首尾记录在记录索引中的序号
+        self.rec_addrs = rec_addrs  # 各S3数据记录的起始地址
+        self.rec_lengths = rec_lengths  # 各S3数据记录的数据长度
+        self.rec_lines = rec_lines  # 各S3数据记录在源文件中的行号(1基)
+        self.describe_info = describe_info  # S0中的描述信息
+        self.pgm_start_addr = pgm_start_addr  # S7中的程序起始地址信息
+        self.checksums = checksums  # 内存映像校验服务(缓存各区域校验结果)
+
 
 ##############################
 # Srecord API function declarations
@@ -155,6 +223,8 @@ class Srecord(object):
 
     :param filepath: SRecord文件路径
     :type filepath: str
+    :param parse_result: 已有的解析结果(例如来自解析缓存)，为None时解析文件
+    :type parse_result: SrecordParseResult | None
     """
     srecord_type_dic = {
         # 记录头16位地址，主要描述供应商相关信息，比如文件、产品、供应商等信息
@@ -182,21 +252,27 @@ class Srecord(object):
         'pgm_start_addr16': 'S9',
     }
 
-    def __init__(self, filepath: str) -> None:
+    def __init__(self, filepath: str, parse_result: SrecordParseResult | None = None) -> None:
         """
         构造函数
         """
         self.__filepath = filepath # 文件路径
-        self.__check_all_sum(filepath)
-        (self.__s3_records,
-         self.__describe_info,
-         self.__pgm_start_addr) = self.__get_s3records(filepath)
-        self.__erase_memory_records = self.__get_erase_memory_records(self.__s3_records)
-        self.__erase_memory_infos = self.__get_erase_memory_infos(self.__s3_records,
-                                                                  self.__erase_memory_records)
-        self.__crc32_values = self.__get_crc32_values()
-
-        self.__cal_data: bytes = b'' # 指定PGM标定区数据序列
+        if parse_result is None:
+            parse_result = self.parse(filepath)
+        self.__parse_result = parse_result # 解析结果(只读，可共享)
+        self.__memory_image = parse_result.memory_image
+        self.__segment_bounds = parse_result.segment_bounds
+        # S3数据记录索引(各记录的地址、数据长度、源文件行号)，S3Record对象按需生成
+        self.__rec_addrs = parse_result.rec_addrs
+        self.__rec_lengths = parse_result.rec_lengths
+        self.__rec_lines = parse_result.rec_lines
+        self.__s3_records: list[S3Record] | None = None
+        self.__describe_info = parse_result.describe_info
+        self.__pgm_start_addr = list(parse_result.pgm_start_addr)
+        self.__erase_memory_infos = self.__get_erase_memory_infos()
+        self.__checksums = parse_result.checksums
+
+        self.__cal_data: bytearray = bytearray() # 指定PGM标定区数据序列(可修改的副本)
         self.__cal_memory_info: EraseMemoryInfo = None # 原PGM标定区数据段信息
 
     @staticmethod
@@ -211,36 +287,22 @@ class Srecord(object):
         :return: 本条记录的校验和(一个字节的16进制序列)
         :rtype: str
         """
-        # 去除类型、校验和
-        check_string = record[2:-2]
-        # 将字符串每两个分割之后转换成16进制数字
-        numbers = [int(check_string[i:i + 2], 16) for i in range(0, len(check_string), 2)]
-        # 求 (长度 + 地址 + 数据)的和
-        sum_number = sum(numbers)
-        # 求 校验和=0xff – (长度 + 地址 + 数据) ；转化成字符串之后去掉前面的'0X'字符
-        checksum = hex(0xff - (0xff & sum_number)).upper().replace('0X', '')
-        # 格式化校验和字符串，如果长度大于2取后两位，如果长度小于2在前面补零
-        if len(checksum) < 2:
-            while len(checksum) < 2:
-                checksum = '0' + checksum
-        else:
-            checksum = checksum[-2:]
-        return checksum
+        # 去除类型、校验和，求 校验和=0xff – (长度 + 地址 + 数据)
+        return '%02X' % (0xff - (0xff & sum(unhexlify(record[2:-2]))))
 
-    def get_epk(self, addr: int) -> str | None:
+    def get_epk(self, addr: int) -> memoryview:
         """
         获取epk
 
         :param addr: epk信息首地址
         :type addr: int
-        :return: 若存在返回epk(16进制序列)，否则返回None
-        :rtype: str or None
-        :rtype: bytes
+        :return: epk数据区的数据(零拷贝切片)
+        :rtype: memoryview
         :raises SrecordException: 不存在指定地址的epk数据区
         """
         for erase_memory_info in self.__erase_memory_infos:
             if int(erase_memory_info.erase_start_address32, 16) == addr:
-                return erase_memory_info.erase_data
+                return erase_memory_info.erase_data_view
         else:
             msg = f"在Srecord文件中不存在首地址为{hex(addr)}的epk数据区"
             raise SrecordException(msg)
@@ -256,7 +318,7 @@ class Srecord(object):
         """
         for erase_memory_info in self.__erase_memory_infos:
             if int(erase_memory_info.erase_start_address32, 16) == addr:
-                self.__cal_data = bytes.fromhex(erase_memory_info.erase_data)
+                self.__cal_data = bytearray(erase_memory_info.erase_data_view)
                 self.__cal_memory_info = erase_memory_info
                 break
         else:
@@ -274,7 +336,7 @@ class Srecord(object):
         if not self.__cal_data:
             msg = f"在Srecord文件中尚未指定标定数据区"
             raise SrecordException(msg)
-        return self.__cal_memory_info.erase_data.upper() != self.__cal_data.hex().upper()
+        return self.__cal_data != self.__cal_memory_info.erase_data_view
 
     def get_cal_data(self) -> tuple[int, int, bytes]:
         """
@@ -287,7 +349,7 @@ class Srecord(object):
         if not self.__cal_data:
             msg = f"在Srecord文件中尚未指定标定数据区"
             raise SrecordException(msg)
-        return int(self.__cal_memory_info.erase_start_address32, 16), len(self.__cal_data), self.__cal_data
+        return int(self.__cal_memory_info.erase_start_address32, 16), len(self.__cal_data), bytes(self.__cal_data)
 
     def get_raw_data_from_cal_data(self, offset: int, length: int) -> bytes:
         """
@@ -307,7 +369,7 @@ class Srecord(object):
         if offset >= len(self.__cal_data) or offset + length > len(self.__cal_data):
             msg = f"参数超出指定标定数据区的范围"
             raise SrecordException(msg)
-        return self.__cal_data[offset:offset + length]
+        return bytes(self.__cal_data[offset:offset + length])
 
     def flush_cal_data(self, offset: int, data: bytes) -> None:
         """
@@ -326,9 +388,7 @@ class Srecord(object):
         if len(data) > len(self.__cal_data):
             msg = f"数据超出指定标定数据区的长度"
             raise SrecordException(msg)
-        l = [i for i in self.__cal_data]  # bytes转列表
-        l[offset:offset + len(data)] = [i for i in data]  # 修改数据
-        self.__cal_data = bytes(l)  # 列表转bytes
+        self.__cal_data[offset:offset + len(data)] = data  # 原地修改数据
 
     def creat_file_from_cal_data(self, filetype: str) -> str:
         """
@@ -435,196 +495,163 @@ class Srecord(object):
         # 返回文件路径
         return new_filepath
 
-    def __check_all_sum(self, filepath: str) -> bool:
+    @staticmethod
+    def __iter_lines(filepath: str):
         """
-        校验Srecord文件各行的checksum
+        以大块二进制方式流式读取文件，逐行产出去除首尾空白的行内容
 
-        :return: 若校验通过返回True
-        :rtype: bool
-        :raises SrecordException: 某行校验错误
-        """
-        with open(file=filepath, mode='r', encoding='utf-8') as f:
-            raw_file_line_number = 0
-            for line in f.readlines():
-                line = line.strip()  # 去除该行的换行符
-                raw_file_line_number += 1
-                if line != '' and self.__checksum(line) != line[-2:]:
-                    f.close()
-                    msg = f'Srecord文件在第{raw_file_line_number}行校验和错误，应为"{self.__checksum(line)}"，实际为"{line[-2:]}"'
-                    raise SrecordException(msg)
-        return True
-
-    def __get_s3records(self, filepath: str) ->  tuple[list[S3Record], str, list[int]]:
-        """
-        解析SRecord文件，将每条S3即32位地址的数据记录以列表形式保存，获取S0信息以及S7程序起始地址
+        :param filepath: 文件路径
+        :type filepath: str
+        :return: 行内容迭代器
+        :rtype: Iterator[bytes]
+        """
+        with open(file=filepath, mode='rb') as f:
+            remainder = b''
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                lines = (remainder + chunk).split(b'\n')
+                remainder = lines.pop()  # 最后一段可能是不完整的行，留待与下一块拼接
+                for line in lines:
+                    yield line.strip()
+            if remainder:
+                yield remainder.strip()
+
+    @classmethod
+    def parse(cls, filepath: str) -> SrecordParseResult:
+        """
+        单遍流式解析SRecord文件，逐行校验checksum，
+        将S3即32位地址的数据记录写入稀疏内存映像并建立记录索引，获取S0信息、S7程序起始地址以及CRC32校验值
 
         :param filepath: SRecord文件路径
         :type filepath: str
-        :return: 解析后的S3数据记录列表, S0中的描述信息, S7中的程序起始地址信息
-        :rtype: tuple[list[S3Record], str, list[int]]
-        :raises SrecordException: 某行内容为空；某行类型无法处理；某行地址不递增；某行不连续
+        :return: 解析结果
+        :rtype: SrecordParseResult
+        :raises SrecordException: 某行内容为空；某行校验错误；某行类型无法处理；某行地址不递增；某行不连续
         """
+        type_s3 = cls.srecord_type_dic['data_record_addr32'].encode()
+        type_s0 = cls.srecord_type_dic['record_head'].encode()
+        type_s7 = cls.srecord_type_dic['pgm_start_addr32'].encode()
         describe_info = ''  # 保存S0中的描述信息
         pgm_start_addr = []  # 保存S7中程序起始地址信息
-        s3records = []  # 保存解析后的S3数据记录
-        line_number = 0  # 列表中的存储的数据记录的行号(0基)
+        memory_image = MemoryImage()  # 保存S3数据记录的内存映像
+        segment_bounds = []  # 各内存段首尾记录的序号
+        rec_addrs = array('I')  # 各S3数据记录的起始地址
+        rec_lengths = array('I')  # 各S3数据记录的数据长度
+        rec_lines = array('I')  # 各S3数据记录在源文件中的行号(1基)
+        line_number = 0  # 索引中的存储的数据记录的序号(0基)
         raw_file_line_number = 0  # 源文件中的数据记录的行号(1基)
-        with open(file=filepath, mode='r', encoding='utf-8') as f:
-            for line in f.readlines():
-                raw_file_line_number += 1
-                line = line.strip()  # 去除该行的换行符
-                if line == '':
-                    msg = f'Srecord文件第{raw_file_line_number}行内容为空'
-                    raise SrecordException(msg)
-                record_type = line[0:2]  # 获取type
-                if record_type == self.srecord_type_dic['data_record_addr32']:
-                    # 获取数据长度(byte)
-                    data_length = int(line[2:4], 16) - 4 - 1
-                    # 获取32位起始地址
-                    start_address32 = hex(int(line[4:12], 16))
-                    # 32位16进制完整显示(eg:0x00000001)
-                    start_address32 = pad_hex(start_address32, 4)
-                    # 获取数据
-                    data = line[12:12 + data_length * 2]
-                    s3record = S3Record(line_number=line_number,
-                                        raw_file_line_number=raw_file_line_number,
-                                        record_type=record_type,
-                                        data_length=data_length,
-                                        start_address32=start_address32,
-                                        data=data)
-                    s3records.append(s3record)
-                    line_number += 1
-                elif record_type == self.srecord_type_dic['record_head']:
-                    # 获取数据长度(byte)
-                    data_length = int(line[2:4], 16) - 2 - 1
-                    # 获取数据
-                    data = line[8:8 + data_length * 2]
-                    describe_info = bytes.fromhex(data).decode(encoding='utf-8')
-                elif record_type == self.srecord_type_dic['pgm_start_addr32']:
-                    # 获取地址长度(byte)
-                    addr_length = int(line[2:4], 16) - 1
-                    # 获取地址
-                    addr = line[4:4 + addr_length * 2]
-                    pgm_start_addr = [i for i in bytes.fromhex(addr)]
-                else:
-                    msg = f'Srecord文件第{raw_file_line_number}行的"{record_type}"类型无法处理'
-                    raise SrecordException(msg)
-        # 判断S3数据记录区域在源文件中是否连续，不连续抛出异常
-        for i in range(len(s3records) - 1):
-            if int(s3records[i + 1].start_address32, 16) <= int(s3records[i].start_address32, 16):
-                msg = f'Srecord文件中的S3数据记录在第{s3records[i].raw_file_line_number}行地址非单调递增'
+        for line in cls.__iter_lines(filepath):
+            raw_file_line_number += 1
+            if not line:
+                msg = f'Srecord文件第{raw_file_line_number}行内容为空'
+                raise SrecordException(msg)
+            # 长度、地址、数据及校验和
+            try:
+                body = unhexlify(line[2:])
+            except BinasciiError:
+                msg = f'Srecord文件第{raw_file_line_number}行内容无法解析'
+                raise SrecordException(msg)
+            # 长度、地址、数据与校验和之和的低字节应为0xFF
+            if sum(body) & 0xff != 0xff:
+                msg = (f'Srecord文件在第{raw_file_line_number}行校验和错误，'
+                       f'应为"{0xff - (0xff & sum(body[:-1])):02X}"，实际为"{line[-2:].decode()}"')
                 raise SrecordException(msg)
-            if s3records[i + 1].raw_file_line_number - s3records[i].raw_file_line_number != 1:
-                msg = f'Srecord文件中的S3数据记录在第{s3records[i].raw_file_line_number}行不连续'
+            record_type = line[0:2]  # 获取type
+            if record_type == type_s3:
+                # 获取数据长度(byte)
+                data_length = body[0] - 4 - 1
+                # 获取32位起始地址
+                start_address32 = int.from_bytes(body[1:5], 'big')
+                if line_number:
+                    # 判断S3数据记录区域在源文件中是否单调递增且连续，否则抛出异常
+                    if start_address32 <= rec_addrs[-1]:
+                        msg = f'Srecord文件中的S3数据记录在第{rec_lines[-1]}行地址非单调递增'
+                        raise SrecordException(msg)
+                    if raw_file_line_number - rec_lines[-1] != 1:
+                        msg = f'Srecord文件中的S3数据记录在第{rec_lines[-1]}行不连续'
+                        raise SrecordException(msg)
+                # 地址与上一条记录不相接则开始新的内存段
+                if not line_number or start_address32 != rec_addrs[-1] + rec_lengths[-1]:
+                    if line_number:
+                        segment_bounds[-1] = (segment_bounds[-1][0], line_number - 1)
+                    segment_bounds.append((line_number, line_number))
+                # 写入内存映像
+                try:
+                    memory_image.append(start_address32, memoryview(body)[5:5 + data_length])
+                except MemoryImageException:
+                    msg = f'Srecord文件中的S3数据记录在第{rec_lines[-1]}行地址重叠'
+                    raise SrecordException(msg)
+                rec_addrs.append(start_address32)
+                rec_lengths.append(data_length)
+                rec_lines.append(raw_file_line_number)
+                line_number += 1
+            elif record_type == type_s0:
+                # 获取数据长度(byte)
+                data_length = body[0] - 2 - 1
+                # 获取数据
+                describe_info = body[3:3 + data_length].decode(encoding='utf-8')
+            elif record_type == type_s7:
+                # 获取地址长度(byte)
+                addr_length = body[0] - 1
+                # 获取地址
+                pgm_start_addr = [i for i in body[1:1 + addr_length]]
+            else:
+                msg = f'Srecord文件第{raw_file_line_number}行的"{record_type.decode(errors="replace")}"类型无法处理'
                 raise SrecordException(msg)
+        if segment_bounds:
+            segment_bounds[-1] = (segment_bounds[-1][0], line_number - 1)
         # 返回
-        return s3records, describe_info, pgm_start_addr
+        return SrecordParseResult(memory_image=memory_image,
+                                  segment_bounds=segment_bounds,
+                                  rec_addrs=rec_addrs,
+                                  rec_lengths=rec_lengths,
+                                  rec_lines=rec_lines,
+                                  describe_info=describe_info,
+                                  pgm_start_addr=pgm_start_addr,
+                                  checksums=ChecksumService(memory_image))
+
+    def __make_s3record(self, line_number: int) -> S3Record:
+        """
+        根据记录索引生成一条S3数据记录
+
+        :param line_number: 数据记录在索引中的序号(0基)
+        :type line_number: int
+        :return: S3数据记录
+        :rtype: S3Record
+        """
+        address = self.__rec_addrs[line_number]
+        data_length = self.__rec_lengths[line_number]
+        data = self.__memory_image.read(address, data_length).hex().upper() if data_length else ''
+        return S3Record(line_number=line_number,
+                        raw_file_line_number=self.__rec_lines[line_number],
+                        record_type=self.srecord_type_dic['data_record_addr32'],
+                        data_length=data_length,
+                        start_address32=pad_hex(hex(address), 4),
+                        data=data)
+
+    def __get_erase_memory_infos(self) -> list[EraseMemoryInfo]:
+        """
+        根据内存映像中的各内存段生成擦写内存区域信息
 
-    @staticmethod
-    def __get_erase_memory_records(records: list[S3Record]) -> list[EraseMemoryRecord]:
-        """
-        从S3数据记录列表中提取出所有擦写内存区域的首尾行记录
-
-        :param records: S3数据记录列表
-        :type records: list[S3Record]
-        :return: 擦写内存区域首尾行数据记录的列表
-        :rtype: list[EraseMemoryRecord]
-        """
-        erase_memory_records = []
-        erase_memory_record = EraseMemoryRecord(begin_record=records[0],
-                                                end_record=None)
-        for i in range(1, len(records)):
-            if (
-                    int(records[i].start_address32, 16) -
-                    int(records[i - 1].start_address32, 16)
-                    != records[i - 1].data_length
-            ):
-                erase_memory_record.end_record = records[i - 1]
-                erase_memory_records.append(erase_memory_record)
-                erase_memory_record = EraseMemoryRecord(begin_record=records[i],
-                                                        end_record=None)
-        erase_memory_record.end_record = records[-1]
-        erase_memory_records.append(erase_memory_record)
-        return erase_memory_records
-
-    @staticmethod
-    def __get_erase_memory_infos(records: list[S3Record],
-                                 erase_memory_records: list[EraseMemoryRecord]) -> list[EraseMemoryInfo]:
-        """
-        从S3数据记录列表中提取出所有擦写内存区域的首尾行信息
-
-        :param records: S3数据记录列表
-        :type records: list[S3Record]
-        :param erase_memory_records: 包含擦写内存区域的首尾行记录的列表
-        :type erase_memory_records: list[EraseMemoryRecord]
         :return: 包含每个擦写内存区域信息的列表
         :rtype: list[EraseMemoryInfo]
         """
-
-        def get_erase_data(records: list[S3Record], begin_line_number: int, end_line_number: int) -> str:
-            """
-            获取一块擦写内存区域的数据
-
-            :param records: S3数据记录列表
-            :type records: list[S3Record]
-            :param begin_line_number: 擦写区域的首行序号
-            :type begin_line_number: int
-            :param end_line_number: 擦写区域的尾行序号
-            :type end_line_number: int
-            :return: 擦写区域的数据(16进制序列)
-            :rtype: str
-            """
-            erase_data = []
-            for i in range(begin_line_number, end_line_number + 1):
-                erase_data.append(records[i].data)
-            return ''.join(erase_data)
-
         erase_memory_infos = []
-        erase_num = 0
-        for erase_memory_record in erase_memory_records:
-            erase_num += 1
-            erase_begin_address32 = erase_memory_record.begin_record.start_address32
-            erase_end_address32 = erase_memory_record.end_record.start_address32
-            # 若是擦写区域只有一行
-            if int(erase_end_address32, 16) - int(erase_begin_address32, 16) == 0:
-                erase_length = erase_memory_record.begin_record.data_length
-            # 若是擦写区域有多行
-            else:
-                erase_length = int(erase_end_address32, 16) - int(erase_begin_address32, 16) + \
-                               erase_memory_record.end_record.data_length
-            erase_length = pad_hex(hex(erase_length), 4)
-            erase_data = get_erase_data(records,
-                                        erase_memory_record.begin_record.line_number,
-                                        erase_memory_record.end_record.line_number)
+        for erase_num, (segment, (begin, end)) in enumerate(zip(self.__memory_image.segments,
+                                                               self.__segment_bounds), start=1):
+            erase_memory_record = EraseMemoryRecord(begin_record=self.__make_s3record(begin),
+                                                    end_record=self.__make_s3record(end))
             erase_memory_info = EraseMemoryInfo(erase_number=erase_num,
-                                                erase_start_address32=erase_begin_address32,
-                                                erase_length=erase_length,
-                                                erase_data=erase_data,
+                                                erase_start_address32=pad_hex(hex(segment.start_address), 4),
+                                                erase_length=pad_hex(hex(segment.length), 4),
+                                                erase_data_view=segment.view(),
                                                 erase_memory_record=erase_memory_record)
             erase_memory_infos.append(erase_memory_info)
         # 返回
         return erase_memory_infos
 
-    def __get_crc32_values(self) -> list[int]:
-        """
-        计算所有擦写数据段的数据CRC32校验值
-
-        :return: 返回一个包含4个字节的列表，表示CRC32校验值，例如：[252, 137, 25, 24]，即b'\xfc\x89\x19\x18'，0xFC891918
-        :rtype: list[int]
-        """
-        all_erase_datas = []
-        for erase_memory_info in self.__erase_memory_infos:
-            all_erase_datas.append(erase_memory_info.erase_data)
-        hex_string = ''.join(all_erase_datas)
-        ascii_values = bytes.fromhex(hex_string)
-        obj_crc32 = Crc32(check_data=ascii_values,
-                          poly=0x04C11DB7,
-                          init_crc=0xFFFFFFFF,
-                          ref_in=False,
-                          ref_out=False,
-                          xor_out=0xFFFFFFFF)
-        return obj_crc32.crc32_bytes_arr
-
     @property
     def describe_info(self) -> str:
         """
@@ -653,8 +680,30 @@ class Srecord(object):
         :return: S3记录
         :rtype: list[S3Record]
         """
+        if self.__s3_records is None:
+            self.__s3_records = [self.__make_s3record(i) for i in range(len(self.__rec_addrs))]
         return self.__s3_records
 
+    @property
+    def parse_result(self) -> SrecordParseResult:
+        """
+        解析结果(只读，可在多个Srecord对象间共享)
+
+        :return: 解析结果
+        :rtype: SrecordParseResult
+        """
+        return self.__parse_result
+
+    @property
+    def memory_image(self) -> MemoryImage:
+        """
+        S3数据记录的稀疏内存映像
+
+        :return: 内存映像
+        :rtype: MemoryImage
+        """
+        return self.__memory_image
+
     @property
     def erase_memory_infos(self) -> list[EraseMemoryInfo]:
         """
@@ -673,7 +722,18 @@ class Srecord(object):
         :return: CRC32校验值
         :rtype: list[int]
         """
-        return self.__crc32_values
+        crc32_int = self.__checksums.image(ChecksumAlgorithm.CRC32_BZIP2)
+        return list(crc32_int.to_bytes(4, 'big', signed=False))
+
+    @property
+    def checksums(self) -> ChecksumService:
+        """
+        内存映像校验服务，与共享同一解析结果的Srecord对象共用已缓存的校验结果
+
+        :return: 内存映像校验服务
+        :rtype: ChecksumService
+        """
+        return self.__checksums
 
 
 if __name__ == '__main__':
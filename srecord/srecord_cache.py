@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @author  : ZYD
+# @version : V1.0.0
+# @function:
+"""
+Srecord文件解析缓存，
+进程内以(文件路径, 文件大小, 修改时间, 内容哈希)为键、按LRU淘汰保存解析结果(内存映像、擦写段、校验服务)，
+可选地将解析结果以内容哈希命名保存为磁盘旁路文件，使重复打开同一程序文件时无需重新解析
+"""
+
+
+##############################
+# Module imports
+##############################
+from collections import OrderedDict
+import hashlib
+import os
+import pickle
+import threading
+
+from .checksum import ChecksumAlgorithm
+from .srecord import Srecord, SrecordParseResult
+
+
+##############################
+# Constant definitions
+##############################
+SIDECAR_VERSION = 2  # 磁盘旁路文件格式版本，解析结果结构变化时需递增
+SIDECAR_SUFFIX = '.srec.pkl'  # 磁盘旁路文件后缀
+HASH_CHUNK_SIZE = 1 << 20  # 计算内容哈希时每次读取文件的字节数
+SIDECAR_MAX_FILES = 8  # 旁路文件目录中保留的旁路文件数上限，超出时删除最久未使用的文件
+
+
+##############################
+# SrecordCache API function declarations
+##############################
+
+class SrecordCache(object):
+    """
+    Srecord文件解析缓存，线程安全；
+    缓存中保存的是只读的解析结果，每次加载均返回新的Srecord对象，各对象的标定区数据互不影响
+
+    :param max_entries: 进程内缓存的最大条目数，超出时淘汰最久未使用的条目
+    :type max_entries: int
+    :param sidecar_dir: 磁盘旁路文件的保存目录，为None时不使用磁盘旁路文件
+    :type sidecar_dir: str | None
+    """
+
+    def __init__(self, max_entries: int = 4, sidecar_dir: str | None = None) -> None:
+        """
+        构造函数
+        """
+        self.max_entries = max_entries  # 进程内缓存的最大条目数
+        self.sidecar_dir = sidecar_dir  # 磁盘旁路文件的保存目录
+        self.__entries: OrderedDict[tuple[str, int, int, str], SrecordParseResult] = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def load(self, filepath: str) -> Srecord:
+        """
+        加载Srecord文件，命中缓存时直接使用已有的解析结果，否则解析文件并写入缓存
+
+        :param filepath: SRecord文件路径
+        :type filepath: str
+        :return: Srecord对象
+        :rtype: Srecord
+        :raises SrecordException: 文件解析错误
+        :raises OSError: 文件无法读取
+        """
+        key = self.__get_key(filepath)
+        with self.__lock:
+            parse_result = self.__entries.get(key)
+            if parse_result is not None:
+                self.__entries.move_to_end(key)
+                return Srecord(filepath, parse_result=parse_result)
+
+        parse_result = self.__load_sidecar(key)
+        if parse_result is None:
+            parse_result = Srecord.parse(filepath)
+            if self.__get_sidecar_path(key):
+                # 校验值按需计算，保存旁路文件前先计算整个映像的CRC32，使旁路文件中包含该校验值
+                parse_result.checksums.image(ChecksumAlgorithm.CRC32_BZIP2)
+            self.__save_sidecar(key, parse_result)
+
+        with self.__lock:
+            self.__entries[key] = parse_result
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+        return Srecord(filepath, parse_result=parse_result)
+
+    def clear(self) -> None:
+        """
+        清空进程内缓存(不删除磁盘旁路文件)
+
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @staticmethod
+    def __get_key(filepath: str) -> tuple[str, int, int, str]:
+        """
+        获取文件的缓存键
+
+        :param filepath: 文件路径
+        :type filepath: str
+        :return: (规范化的绝对路径, 文件大小, 修改时间(ns), 内容哈希)
+        :rtype: tuple[str, int, int, str]
+        """
+        path = os.path.normcase(os.path.abspath(filepath))
+        stat = os.stat(path)
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        return path, stat.st_size, stat.st_mtime_ns, digest.hexdigest()
+
+    def __get_sidecar_path(self, key: tuple[str, int, int, str]) -> str | None:
+        """
+        获取磁盘旁路文件路径，旁路文件以内容哈希命名，与文件路径和修改时间无关
+
+        :param key: 缓存键
+        :type key: tuple[str, int, int, str]
+        :return: 旁路文件路径，未启用旁路文件时返回None
+        :rtype: str | None
+        """
+        if not self.sidecar_dir:
+            return None
+        return os.path.join(self.sidecar_dir, key[3] + SIDECAR_SUFFIX)
+
+    def __load_sidecar(self, key: tuple[str, int, int, str]) -> SrecordParseResult | None:
+        """
+        从磁盘旁路文件加载解析结果，旁路文件不存在、版本或内容不匹配时返回None
+
+        :param key: 缓存键
+        :type key: tuple[str, int, int, str]
+        :return: 解析结果
+        :rtype: SrecordParseResult | None
+        """
+        sidecar_path = self.__get_sidecar_path(key)
+        if not sidecar_path or not os.path.isfile(sidecar_path):
+            return None
+        try:
+            with open(sidecar_path, 'rb') as f:
+                content = pickle.load(f)
+            if (content.get('version') == SIDECAR_VERSION and
+                    content.get('size') == key[1] and
+                    content.get('digest') == key[3]):
+                # 更新访问时间，用于清理最久未使用的旁路文件
+                try:
+                    os.utime(sidecar_path)
+                except OSError:
+                    pass
+                return content['result']
+        except Exception:
+            pass
+        return None
+
+    def __save_sidecar(self, key: tuple[str, int, int, str], parse_result: SrecordParseResult) -> None:
+        """
+        将解析结果保存到磁盘旁路文件，并清理多余的旁路文件，保存失败(目录不可写、解析结果无法序列化等)不影响加载
+
+        :param key: 缓存键
+        :type key: tuple[str, int, int, str]
+        :param parse_result: 解析结果
+        :type parse_result: SrecordParseResult
+        """
+        sidecar_path = self.__get_sidecar_path(key)
+        if not sidecar_path:
+            return
+        tmp_path = sidecar_path + '.tmp'
+        try:
+            os.makedirs(self.sidecar_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                # noinspection PyTypeChecker
+                pickle.dump({'version': SIDECAR_VERSION,
+                             'size': key[1],
+                             'digest': key[3],
+                             'result': parse_result}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, sidecar_path)
+        except Exception:
+            # 删除写入失败的临时文件
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        # 清理最久未使用的旁路文件
+        try:
+            sidecar_files = [os.path.join(self.sidecar_dir, name) for name in os.listdir(self.sidecar_dir)
+                             if name.endswith(SIDECAR_SUFFIX)]
+            sidecar_files.sort(key=os.path.getmtime, reverse=True)
+        except OSError:
+            return
+        for path in sidecar_files[SIDECAR_MAX_FILES:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# 进程内共享的解析缓存
+srecord_cache = SrecordCache()
+
+
+def load_srecord(filepath: str) -> Srecord:
+    """
+    通过进程内共享的解析缓存加载Srecord文件
+
+    :param filepath: SRecord文件路径
+    :type filepath: str
+    :return: Srecord对象
+    :rtype: Srecord
+    :raises SrecordException: 文件解析错误
+    """
+    return srecord_cache.load(filepath)
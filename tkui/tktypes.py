@@ -14,6 +14,7 @@ import ctypes
 import os
 import tkinter as tk
 from tkinter import messagebox, ttk
+from typing import Any, Callable, Sequence
 
 ##############################
 # Constant definitions
@@ -471,6 +472,7 @@ class TkTreeView(ttk.Treeview, GetDpiMixIn):
                           width=super().get_dpi(WIDTH_SCROLLER_BAR),
                           height=self.height + super().get_dpi(WIDTH_SCROLLER_BAR))
         self.config(yscrollcommand=y_scrollbar.set)
+        self.y_scrollbar = y_scrollbar  # 垂直滚动条
         # 创建一个水平滚动条组件，并将它与组件绑定
         x_scrollbar = ttk.Scrollbar(master=self.master, orient='horizontal',
                                     command=self.xview)
@@ -478,6 +480,283 @@ class TkTreeView(ttk.Treeview, GetDpiMixIn):
                           width=self.width, height=super().get_dpi(WIDTH_SCROLLER_BAR))
         self.config(xscrollcommand=x_scrollbar.set)
 
+
+class TkVirtualTreeView(TkTreeView):
+    """
+    虚拟Treeview，数据项保存在模型列表中，控件中只有与可见行数相同的一组行(iid循环复用)，
+    滚动时只更新滚出、滚入的行；选中状态按模型行记录，滚动时随模型行移动，
+    由滚动引起的<<TreeviewSelect>>事件不会传递给通过bind绑定的回调函数
+
+    :param args: 位置参数
+    :param kwargs: 关键字参数，同TkTreeView
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """构造函数"""
+        super().__init__(*args, **kwargs)
+        self.rows: Sequence[Any] = ()  # 模型列表
+        self.__values_of: Callable[[Any], tuple] = tuple  # 由模型行获取各列值的函数
+        self.__first = 0  # 首个可见行在模型列表中的索引
+        self.__visible_count = 0  # 可见行数
+        self.__pool: list[str] = []  # 控件中的行iid，按显示顺序排列
+        self.__pool_values: list[tuple | None] = []  # 控件中各行当前显示的值
+        self.__selected_row: int | None = None  # 选中的模型行索引
+        self.__select_callbacks: list[Callable] = []  # 通过bind绑定的<<TreeviewSelect>>回调函数
+        self.__pending_select_events = 0  # 由滚动引起、尚未处理的<<TreeviewSelect>>事件数
+        self.__next_iid = 0  # 下一个新建行的iid序号
+
+        super().bind('<<TreeviewSelect>>', self.__on_select)
+        super().bind('<Configure>', lambda e: self.__render(), add='+')
+        super().bind('<MouseWheel>', self.__on_mouse_wheel)  # Windows
+        super().bind('<Button-4>', lambda e: self.scroll(-3) or 'break')  # Linux
+        super().bind('<Button-5>', lambda e: self.scroll(3) or 'break')  # Linux
+        super().bind('<Up>', lambda e: self.__on_arrow_key(-1))
+        super().bind('<Down>', lambda e: self.__on_arrow_key(1))
+        super().bind('<Prior>', lambda e: self.scroll(-max(self.__visible_count - 1, 1)) or 'break')
+        super().bind('<Next>', lambda e: self.scroll(max(self.__visible_count - 1, 1)) or 'break')
+
+    def bind(self, sequence=None, func=None, add=None):
+        """
+        绑定事件，<<TreeviewSelect>>事件的回调函数由本控件分发，忽略由滚动引起的选择变化
+
+        """
+        if sequence == '<<TreeviewSelect>>' and func is not None:
+            if not add:
+                self.__select_callbacks.clear()
+            self.__select_callbacks.append(func)
+            return None
+        return super().bind(sequence, func, add)
+
+    def create_scrollbar(self) -> None:
+        """
+        创建滚动条，垂直滚动条按模型列表滚动
+
+        """
+        super().create_scrollbar()
+        self.config(yscrollcommand='')
+        self.y_scrollbar.config(command=self.__on_yscroll)
+        self.__update_scrollbar()
+
+    def set_rows(self, rows: Sequence[Any], values_of: Callable[[Any], tuple]) -> None:
+        """
+        设置模型列表，滚动到首行并清除选中状态
+
+        :param rows: 模型列表，控件不复制列表，列表内容变化后须调用set_rows或update_row
+        :type rows: Sequence[Any]
+        :param values_of: 由模型行获取各列值的函数
+        :type values_of: Callable[[Any], tuple]
+        """
+        self.rows = rows
+        self.__values_of = values_of
+        self.__first = 0
+        self.__selected_row = None
+        self.__pool_values = [None] * len(self.__pool)  # 强制刷新所有行
+        self.__render()
+
+    def row_of(self, iid: str) -> int | None:
+        """
+        获取控件中的行对应的模型行索引
+
+        :param iid: 行iid
+        :type iid: str
+        :return: 模型行索引，该行未显示数据时返回None
+        :rtype: int | None
+        """
+        if iid not in self.__pool:
+            return None
+        row = self.__first + self.__pool.index(iid)
+        return row if row < len(self.rows) else None
+
+    def update_row(self, iid: str, item: Any) -> None:
+        """
+        更新控件中的行对应的模型行，并刷新该行的显示
+
+        :param iid: 行iid
+        :type iid: str
+        :param item: 新的模型行
+        :type item: Any
+        """
+        row = self.row_of(iid)
+        if row is None:
+            return
+        self.rows[row] = item
+        slot = row - self.__first
+        values = self.__values_of(item)
+        self.item(iid, values=values)
+        self.__pool_values[slot] = values
+
+    def scroll(self, count: int) -> None:
+        """
+        滚动指定行数
+
+        :param count: 行数，正数向下滚动，负数向上滚动
+        :type count: int
+        """
+        self.__scroll_to(self.__first + count)
+
+    def __scroll_to(self, first: int) -> None:
+        """
+        滚动到指定的首个可见行，可回收的行只移动位置，不重新设置值
+
+        :param first: 首个可见行在模型列表中的索引
+        :type first: int
+        """
+        first = max(0, min(first, len(self.rows) - self.__visible_count))
+        delta = first - self.__first
+        if not delta:
+            return
+        pool = self.__pool
+        if 0 < abs(delta) < len(pool):
+            # 滚出的行移动到另一端，保持其余行的iid和值不变
+            if delta > 0:
+                moved, kept = pool[:delta], pool[delta:]
+                for iid in moved:
+                    self.move(iid, '', 'end')
+                self.__pool = kept + moved
+                self.__pool_values = self.__pool_values[delta:] + [None] * delta
+            else:
+                moved, kept = pool[delta:], pool[:delta]
+                for iid in reversed(moved):
+                    self.move(iid, '', 0)
+                self.__pool = moved + kept
+                self.__pool_values = [None] * -delta + self.__pool_values[:delta]
+        else:
+            self.__pool_values = [None] * len(pool)
+        self.__first = first
+        self.__render()
+
+    def __measure_visible_count(self) -> int:
+        """
+        计算控件可完整显示的行数
+
+        :return: 可见行数
+        :rtype: int
+        """
+        height = self.winfo_height()
+        if height <= 1:
+            height = self.height  # 控件尚未显示
+        bbox = self.bbox(self.__pool[0]) if self.__pool else ''
+        if bbox:
+            header, row_height = bbox[1], bbox[3]
+        else:
+            header = row_height = int(ttk.Style().lookup(self.cget('style') or 'Treeview', 'rowheight') or
+                                      self.get_dpi(20))
+        return max((height - header) // max(row_height, 1), 1)
+
+    def __render(self) -> None:
+        """
+        按首个可见行刷新控件中的行，只更新值发生变化的行
+
+        """
+        self.__visible_count = self.__measure_visible_count()
+        rows = self.rows
+        self.__first = max(0, min(self.__first, len(rows) - self.__visible_count))
+        count = min(self.__visible_count, len(rows) - self.__first)
+
+        # 行数不足时新建，多余时删除
+        pool = self.__pool
+        while len(pool) < count:
+            iid = f'vrow{self.__next_iid}'
+            self.__next_iid += 1
+            self.insert(parent='', index='end', iid=iid, values=())
+            pool.append(iid)
+            self.__pool_values.append(None)
+        if len(pool) > count:
+            self.delete(*pool[count:])
+            del pool[count:]
+            del self.__pool_values[count:]
+
+        values_of = self.__values_of
+        pool_values = self.__pool_values
+        for slot in range(count):
+            values = values_of(rows[self.__first + slot])
+            if pool_values[slot] != values:
+                self.item(pool[slot], values=values)
+                pool_values[slot] = values
+
+        self.__sync_selection()
+        self.__update_scrollbar()
+
+    def __sync_selection(self) -> None:
+        """
+        使控件的选中行与选中的模型行一致，由此引起的<<TreeviewSelect>>事件不分发
+
+        """
+        row = self.__selected_row
+        if row is not None and self.__first <= row < self.__first + len(self.__pool):
+            desired = (self.__pool[row - self.__first],)
+        else:
+            desired = ()
+        if tuple(self.selection()) != desired:
+            self.__pending_select_events += 1
+            self.selection_set(desired)
+        if desired:
+            self.focus(desired[0])
+
+    def __update_scrollbar(self) -> None:
+        """
+        按模型列表刷新垂直滚动条
+
+        """
+        scrollbar = getattr(self, 'y_scrollbar', None)
+        if scrollbar is None:
+            return
+        total = len(self.rows)
+        if not total:
+            scrollbar.set(0.0, 1.0)
+            return
+        scrollbar.set(self.__first / total, min((self.__first + len(self.__pool)) / total, 1.0))
+
+    def __on_yscroll(self, action: str, value: str, unit: str = '') -> None:
+        """
+        垂直滚动条的回调函数
+
+        """
+        if action == 'moveto':
+            self.__scroll_to(round(float(value) * len(self.rows)))
+        elif action == 'scroll':
+            step = int(value) * (max(self.__visible_count - 1, 1) if unit == 'pages' else 1)
+            self.scroll(step)
+
+    def __on_mouse_wheel(self, event: tk.Event) -> str:
+        """
+        鼠标滚轮的回调函数，每格滚动3行
+
+        """
+        self.scroll(-3 * int(event.delta / 120) if abs(event.delta) >= 120 else (-1 if event.delta > 0 else 1))
+        return 'break'
+
+    def __on_arrow_key(self, step: int) -> str | None:
+        """
+        方向键的回调函数，焦点位于首行或末行时滚动一行并选中滚入的行
+
+        """
+        focus = self.focus()
+        if not self.__pool or not focus or focus != (self.__pool[0] if step < 0 else self.__pool[-1]):
+            return None  # 由控件默认处理
+        before = self.__first
+        self.scroll(step)
+        if self.__first == before:
+            return 'break'
+        iid = self.__pool[0] if step < 0 else self.__pool[-1]
+        self.selection_set(iid)
+        self.focus(iid)
+        return 'break'
+
+    def __on_select(self, event: tk.Event) -> None:
+        """
+        <<TreeviewSelect>>事件的回调函数，记录选中的模型行并分发给通过bind绑定的回调函数
+
+        """
+        if self.__pending_select_events:
+            self.__pending_select_events -= 1
+            return
+        selection = self.selection()
+        self.__selected_row = self.row_of(selection[0]) if selection else None
+        for callback in self.__select_callbacks:
+            callback(event)
+
+
 class TkNotebook(ttk.Notebook, GetDpiMixIn):
     """
     自定义Notebook窗口管理，继承ttk.Notebook
@@ -1,14 +1,99 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # @author  : ZYD
-# @version : V1.0.0
+# @version : V1.1.0
 # @function: V1.0.0：crc32校验类（使用查表法）
+#            V1.1.0：slicing-by-8查表法，查表按生成项缓存于模块级，支持update/digest增量计算
 
 
 ##############################
 # Module imports
 ##############################
+from struct import iter_unpack
 from typing import Union
+import zlib
+
+
+##############################
+# Constant definitions
+##############################
+CRC32_POLY_IEEE = 0x04C11DB7  # zlib所用的生成项，使用此生成项时由zlib完成计算
+SLICE_SIZE = 8  # slicing-by-8每次处理的字节数
+
+# 单字节位逆序表，用于ref_in为True时翻转输入字节以及与zlib(反射算法)之间的镜像转换
+_REVERSE8 = bytes(int(f'{i:08b}'[::-1], 2) for i in range(256))
+
+# 按生成项缓存的slicing-by-8查表，{poly: (table0, ..., table7)}
+_CRC32_TABLES: dict[int, tuple[tuple[int, ...], ...]] = {}
+
+
+##############################
+# Function definitions
+##############################
+
+def get_crc32_tables(poly: int) -> tuple[tuple[int, ...], ...]:
+    """
+    获取指定生成项的slicing-by-8查表，首次生成后缓存于模块级；
+    table_k[i]为字节i后跟k个0字节的crc余数
+
+    :param poly: 生成项，例如：0x04C11DB7
+    :type poly: int
+    :return: 8张查表，每张256项
+    :rtype: tuple[tuple[int, ...], ...]
+    """
+    poly = poly & 0xFFFFFFFF
+    tables = _CRC32_TABLES.get(poly)
+    if tables is None:
+        table0 = []
+        for i in range(256):
+            c = i << 24
+            for _ in range(8):
+                c = ((c << 1) ^ poly) if c & 0x80000000 else (c << 1)
+            table0.append(c & 0xFFFFFFFF)
+        tables = [tuple(table0)]
+        for _ in range(1, SLICE_SIZE):
+            prev = tables[-1]
+            tables.append(tuple(((c << 8) & 0xFFFFFFFF) ^ table0[c >> 24] for c in prev))
+        tables = tuple(tables)
+        _CRC32_TABLES[poly] = tables
+    return tables
+
+
+def _reflect32(v: int) -> int:
+    """
+    获取32位数据的位逆序
+
+    :param v: 待位逆序的数据
+    :type v: int
+    :return: 位逆序后的数据
+    :rtype: int
+    """
+    return int(f'{v & 0xFFFFFFFF:032b}'[::-1], 2)
+
+
+def _update_sliced(crc: int, data: memoryview, tables: tuple[tuple[int, ...], ...]) -> int:
+    """
+    以slicing-by-8方式更新crc寄存器(非反射算法)，
+    8字节对齐部分每次处理8字节，剩余部分逐字节处理
+
+    :param crc: crc寄存器当前值
+    :type crc: int
+    :param data: 待测数据
+    :type data: memoryview
+    :param tables: slicing-by-8查表
+    :type tables: tuple[tuple[int, ...], ...]
+    :return: 更新后的crc寄存器值
+    :rtype: int
+    """
+    t0, t1, t2, t3, t4, t5, t6, t7 = tables
+    n_sliced = len(data) - len(data) % SLICE_SIZE
+    for hi, lo in iter_unpack('>II', data[:n_sliced]):
+        crc ^= hi
+        crc = (t7[crc >> 24] ^ t6[(crc >> 16) & 0xFF] ^ t5[(crc >> 8) & 0xFF] ^ t4[crc & 0xFF] ^
+               t3[lo >> 24] ^ t2[(lo >> 16) & 0xFF] ^ t1[(lo >> 8) & 0xFF] ^ t0[lo & 0xFF])
+    for byte in data[n_sliced:]:
+        crc = t0[byte ^ (crc >> 24)] ^ ((crc << 8) & 0xFFFFFF00)
+    return crc
 
 
 ##############################
@@ -28,10 +113,13 @@ class Crc32Bzip2(object):
     _xor_output = 0xffffffff;
     _check_result = 0xfc891918.
 
+    支持增量计算：构造时check_data可为None，之后通过update(chunk)分块输入数据，
+    crc32_int/crc32_bytes/crc32_bytes_arr/digest()返回当前已输入数据的校验值
+
     :param check_data: 待测数据，整数列表，例如：字符串"123456789"，
             转换为整数列表[0x31, 0x32, 0x33, 0x34, 0x35, 0x36, 0x37, 0x38, 0x39],
             或b"123456789"
-    :type check_data: Union[List[int], bytes]
+    :type check_data: Union[List[int], bytes, bytearray, memoryview, None]
     :param poly: 生成项的简写，例如：0x04C11DB7，忽略最高位的"1"，即完整的生成项是0x104C11DB7
     :type poly: int
     :param init_crc: 算法开始时crc的初始化预置值，例如：0xFFFFFFFF
@@ -44,7 +132,7 @@ class Crc32Bzip2(object):
     :type xor_out: int
     """
     def __init__(self,
-                 check_data: Union[list[int], bytes],
+                 check_data: Union[list[int], bytes, bytearray, memoryview, None] = None,
                  poly: int = 0x04C11DB7,
                  init_crc: int = 0xFFFFFFFF,
                  ref_in: bool = False,
@@ -53,102 +141,51 @@ class Crc32Bzip2(object):
         """
         构造函数
         """
-        self.__check_value = check_data
-        self.__poly = poly
-        self.__init_crc = init_crc
+        self.__poly = poly & 0xFFFFFFFF
         self.__ref_in = ref_in
         self.__ref_out = ref_out
         self.__xor_out = xor_out
-        self.__crc32_table = self.__generate_crc32_table(self.__poly)
-        self.__crc32_int = self.__get_crc32(check_data=self.__check_value,
-                                            table=self.__crc32_table,
-                                            init_crc=self.__init_crc,
-                                            ref_in=self.__ref_in,
-                                            ref_out=self.__ref_out,
-                                            xor_out=self.__xor_out)
-
-    @staticmethod
-    def __generate_crc32_table(poly: int) -> list[int]:
-        """
-        生成crc32校验表
+        self.__crc = init_crc & 0xFFFFFFFF  # crc寄存器(非反射)
+        self.__use_zlib = self.__poly == CRC32_POLY_IEEE
+        self.__crc32_tables = None if self.__use_zlib else get_crc32_tables(self.__poly)
+        if check_data is not None:
+            self.update(check_data)
 
-        :param poly: 生成项
-        :type poly: int
-        :return: crc32校验表
-        :rtype: list[int]
-        """
-        poly = poly & 0xFFFFFFFF
-        table = [0 for _ in range(0, 256)]
-        for i in range(256):
-            c = i << 24
-            for j in range(8):
-                if c & 0x80000000:
-                    c = (c << 1) ^ poly
-                else:
-                    c = c << 1
-            table[i] = c & 0xFFFFFFFF
-        return table
-
-    @staticmethod
-    def __get_crc32(check_data: Union[list[int], bytes],
-                    table: list[int],
-                    init_crc: int,
-                    ref_in: bool,
-                    ref_out: bool,
-                    xor_out: int) -> int:
+    def update(self, chunk: Union[list[int], bytes, bytearray, memoryview]) -> 'Crc32Bzip2':
         """
-        计算crc32校验值，以局部变量访问可以大幅提升计算速度
+        输入一块待测数据，更新crc寄存器
 
-        :param check_data: 待测数据，整数列表，例如：字符串'123456789'，
-            转换为整数列表[0x31, 0x32, 0x33, 0x34, 0x35, 0x36, 0x37, 0x38, 0x39],
-            或b'123456789'
-        :type check_data: Union[List[int], bytes]
-        :param table: crc32校验表
-        :type table: list[int]
-        :param init_crc: 算法开始时crc的初始化预置值，例如：0xFFFFFFFF
-        :type init_crc: int
-        :param ref_in: 待测数据的每个字节是否按位反转，True或False
-        :type:type ref_in: bool
-        :param ref_out: 在计算后之后，异或输出之前，整个数据是否按位反转，True或False
-        :type ref_out: bool
-        :param xor_out: 计算结果与此参数异或后得到最终的crc值
-        :type xor_out: int
-        :return: crc32校验值，整型
-        :rtype: int
+        :param chunk: 待测数据块
+        :type chunk: Union[List[int], bytes, bytearray, memoryview]
+        :return: 自身，便于链式调用
+        :rtype: Crc32Bzip2
         """
-
-        def get_reverse(temp_data: int, byte_length: int) -> int:
-            """
-            获取数据的位逆序
-
-            :param temp_data: 待位逆序的数据
-            :type temp_data: int
-            :param byte_length: 待位逆序的数据的字节长度
-            :type byte_length: int
-            :return: 位逆序后的数据
-            :rtype: int
-            """
-            reverse_data = 0
-            bits_length = byte_length << 3
-            for i in range(0, bits_length):
-                reverse_data += ((temp_data >> i) & 1) << (bits_length - 1 - i)
-            return reverse_data
-
-        if check_data is not None:
-            crc = init_crc
-            if ref_in:
-                for byte in check_data:
-                    crc = table[get_reverse(byte, 1) ^ ((crc >> 24) & 0xFF)] \
-                          ^ ((crc << 8) & 0xFFFFFF00)
-            else:
-                for byte in check_data:
-                    crc = table[byte ^ ((crc >> 24) & 0xFF)] ^ ((crc << 8) & 0xFFFFFF00)
+        if isinstance(chunk, list):
+            chunk = bytes(chunk)
+        data = memoryview(chunk).cast('B')
+        if not data:
+            return self
+        if self.__use_zlib:
+            # CRC-32/BZIP2与zlib所用的CRC-32/ISO-HDLC互为镜像：
+            # 寄存器位逆序，输入字节位逆序，即可借助zlib计算
+            if not self.__ref_in:
+                data = bytes(data).translate(_REVERSE8)
+            register = _reflect32(self.__crc) ^ 0xFFFFFFFF
+            self.__crc = _reflect32(zlib.crc32(data, register) ^ 0xFFFFFFFF)
         else:
-            crc = init_crc
+            if self.__ref_in:
+                data = memoryview(bytes(data).translate(_REVERSE8))
+            self.__crc = _update_sliced(self.__crc, data, self.__crc32_tables)
+        return self
+
+    def digest(self) -> bytes:
+        """
+        当前crc32校验值的bytes形式(大端)
 
-        # 返回计算的CRC值
-        crc = ref_out and (get_reverse(crc, 4) ^ xor_out) or (crc ^ xor_out)
-        return crc & 0xFFFFFFFF
+        :return: crc32校验值，例如：b'\xfc\x89\x19\x18'
+        :rtype: bytes
+        """
+        return self.crc32_bytes
 
     @property
     def crc32_int(self) -> int:
@@ -158,7 +195,8 @@ class Crc32Bzip2(object):
         :return: crc32校验值的整数形式，例如：4236843288，即0xfc891918
         :rtype: int
         """
-        return self.__crc32_int
+        crc = _reflect32(self.__crc) if self.__ref_out else self.__crc
+        return (crc ^ self.__xor_out) & 0xFFFFFFFF
 
     @property
     def crc32_bytes(self) -> bytes:
@@ -168,7 +206,7 @@ class Crc32Bzip2(object):
         :return: crc32校验值的bytes形式，例如：b'\xfc\x89\x19\x18'，即0xFC891918
         :rtype: bytes
         """
-        return self.__crc32_int.to_bytes(length=4, byteorder='big', signed=False)
+        return self.crc32_int.to_bytes(length=4, byteorder='big', signed=False)
 
     @property
     def crc32_bytes_arr(self) -> list[int]:
@@ -181,26 +219,57 @@ class Crc32Bzip2(object):
         return [b for b in self.crc32_bytes]
 
 
+def _crc32_per_byte(check_data: Union[list[int], bytes],
+                    poly: int = 0x04C11DB7,
+                    init_crc: int = 0xFFFFFFFF,
+                    xor_out: int = 0xFFFFFFFF) -> int:
+    """
+    V1.0.0的逐字节查表实现(不含输入输出反转)，仅作为基准测试与结果比对的参照
+
+    :param check_data: 待测数据
+    :type check_data: Union[List[int], bytes]
+    :param poly: 生成项
+    :type poly: int
+    :param init_crc: crc初始化预置值
+    :type init_crc: int
+    :param xor_out: 结果异或值
+    :type xor_out: int
+    :return: crc32校验值
+    :rtype: int
+    """
+    table = get_crc32_tables(poly)[0]
+    crc = init_crc
+    for byte in check_data:
+        crc = table[byte ^ ((crc >> 24) & 0xFF)] ^ ((crc << 8) & 0xFFFFFF00)
+    return (crc ^ xor_out) & 0xFFFFFFFF
+
+
 if __name__ == '__main__':
-    pass
-    # file = r'.\other\xjmain.mot'
-    # obj_s = srecord.Srecord(file)
-    # all_erase_datas = []
-    # for erase_memory_info in obj_s.erase_memory_infos:
-    #     all_erase_datas.append(erase_memory_info.erase_data)
-    # hex_string = ''.join(all_erase_datas)
-    # ascii_values = bytes.fromhex(hex_string)
-    # # 自定义crc32
-    # buf_s = [0x31, 0x32, 0x33, 0x34, 0x35, 0x36, 0x37, 0x38, 0x39]
-    # obj_crc32 = Crc32(check_data=buf_s,
-    #                   poly=0x04C11DB7,
-    #                   init_crc=0xFFFFFFFF,
-    #                   ref_in=False,
-    #                   ref_out=False,
-    #                   xor_out=0xFFFFFFFF)
-    # crc_value = obj_crc32.crc32_int
-    # # print('自定义算出来的CRC值:', '0x' + "{:0>8s}".format(str('%x' % crc_stm)))
-    # print(f"自定义—CRC-32: {crc_value & 0xffffffff:08x}")
-    # print(f"自定义—CRC-32: {crc_value}")
-    # print(obj_crc32.crc32_bytes)
-    # print(obj_crc32.crc32_bytes_arr)
+    # 基准测试：python -m utils.my_crc32 [程序文件路径，例如main.mot]
+    import sys
+    import time
+
+    if len(sys.argv) > 1:
+        from srecord import Srecord
+        bench_data = Srecord(sys.argv[1]).memory_image.tobytes()
+    else:
+        bench_data = bytes(range(256)) * 4096  # 1MiB
+
+    def _bench(name: str, func) -> int:
+        t = time.perf_counter()
+        value = func()
+        print(f"{name:<24}{time.perf_counter() - t:>10.4f}s  0x{value:08x}")
+        return value
+
+    print(f"数据长度: {len(bench_data)} 字节")
+    ref = _bench('V1.0.0 逐字节查表', lambda: _crc32_per_byte(bench_data))
+    res_zlib = _bench('V1.1.0 zlib镜像', lambda: Crc32Bzip2(bench_data).crc32_int)
+    # 使用与0x04C11DB7等价的非zlib路径验证slicing-by-8(直接调用内部实现)
+    res_sliced = _bench('V1.1.0 slicing-by-8',
+                        lambda: _update_sliced(0xFFFFFFFF, memoryview(bench_data),
+                                               get_crc32_tables(0x04C11DB7)) ^ 0xFFFFFFFF)
+    obj_inc = Crc32Bzip2()
+    for i in range(0, len(bench_data), 4093):
+        obj_inc.update(memoryview(bench_data)[i:i + 4093])
+    print('结果一致' if ref == res_zlib == res_sliced == obj_inc.crc32_int else '结果不一致')
+    print('check:', hex(Crc32Bzip2(b'123456789').crc32_int))